@@ -0,0 +1,14 @@
+"""
+Benchmarks for the scraper's parse, export and end-to-end paths.
+
+Run ``python -m benchmarks.run`` from the repository root; results are
+printed (or written with ``--output``) as JSON for comparison across commits.
+"""
+
+import os
+import sys
+
+# Ensure the scraper modules under src/ are importable, as the tests do.
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,112 @@
+"""
+Compares peak RSS and write time of the XLSX exporters.
+
+"inmemory" reproduces the original exporter, which built a regular openpyxl
+Workbook and saved it at the end; "streaming" is the write-only XlsxWriter.
+Each mode runs in its own process so peak RSS is measured in isolation.
+
+    python benchmarks/bench_xlsx_export.py --rows 500000
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from outputs.export_xlsx import ORGANIC_HEADER, XlsxWriter  # type: ignore
+
+ROWS_PER_RECORD = 10
+
+def synthetic_records(rows: int) -> Iterator[Dict[str, Any]]:
+    """Yields SERP-shaped records with ten organic results each."""
+    for i in range(max(1, rows // ROWS_PER_RECORD)):
+        yield {
+            "keyword": f"keyword {i // 5}",
+            "pageNumber": i % 5 + 1,
+            "organicResults": [
+                {
+                    "title": f"Result {j} for keyword {i}",
+                    "url": f"https://example.com/{i}/{j}",
+                    "description": f"Synthetic snippet number {j} describing page {i}. " * 2,
+                }
+                for j in range(ROWS_PER_RECORD)
+            ],
+            "relatedQueries": [{"text": "related", "url": "/search?q=related"}],
+            "peopleAlsoAsk": [],
+            "images": [],
+            "videos": [],
+            "news": [],
+        }
+
+def write_inmemory(rows: int, path: str) -> None:
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Organic Results"
+    ws.append(ORGANIC_HEADER)
+    for record in synthetic_records(rows):
+        for item in record["organicResults"]:
+            ws.append(
+                [
+                    record["keyword"],
+                    record["pageNumber"],
+                    item["title"],
+                    item["url"],
+                    item["description"],
+                    len(record["relatedQueries"]),
+                    0,
+                    0,
+                    0,
+                    0,
+                ]
+            )
+    wb.save(path)
+
+def write_streaming(rows: int, path: str) -> None:
+    with XlsxWriter(path) as writer:
+        for record in synthetic_records(rows):
+            writer.write(record)
+
+MODES = {"inmemory": write_inmemory, "streaming": write_streaming}
+
+def run_child(mode: str, rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        MODES[mode](rows, os.path.join(tmp, "bench.xlsx"))
+        elapsed = time.perf_counter() - started
+    # ru_maxrss is reported in kilobytes on Linux.
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode}\t{elapsed:.2f}\t{peak_mb:.1f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000, help="Organic rows to write")
+    parser.add_argument("--mode", choices=sorted(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_child(args.mode, args.rows)
+        return
+
+    print(f"{'mode':<10} {'seconds':>8} {'peak RSS MB':>12}  ({args.rows} rows)")
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--rows", str(args.rows)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        name, seconds, peak = output.strip().split("\t")
+        print(f"{name:<10} {float(seconds):>8.2f} {float(peak):>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Seeded generator for full-size, Bing-like SERP HTML.
+
+Pages contain every section the extractors target - organic results,
+related searches, People Also Ask, images, videos, news and a knowledge
+panel - wrapped in the kind of chrome, inline scripts and styles that make
+real SERPs 150-400 KB. The same seed always yields the same page.
+"""
+
+import html
+import random
+from typing import List
+
+WORDS = (
+    "best restaurants pizza coffee hotel flights weather review guide cheap "
+    "near open today menu price deals top rated local city travel tickets "
+    "recipe easy healthy family kids budget luxury downtown delivery online"
+).split()
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def _script_blob(rng: random.Random, size: int) -> str:
+    """Inline script of roughly ``size`` bytes, like Bing's bundled JS."""
+    chunks: List[str] = []
+    total = 0
+    while total < size:
+        name = f"_{rng.randrange(16 ** 6):06x}"
+        chunk = f"var {name}=function(n,t){{return n&&t?n[t]||{rng.randrange(10 ** 6)}:null}};"
+        chunks.append(chunk)
+        total += len(chunk)
+    return "<script>" + "".join(chunks) + "</script>"
+
+def _organic(rng: random.Random, index: int, keyword: str) -> str:
+    host = f"{rng.choice(WORDS)}{rng.randrange(1000)}.example.com"
+    title = html.escape(f"{keyword.title()} - {_words(rng, 6)}")
+    snippet = html.escape(_words(rng, 40))
+    deep_links = "".join(
+        f'<li><a href="https://{host}/{rng.choice(WORDS)}">{_words(rng, 2)}</a></li>' for _ in range(4)
+    )
+    return (
+        f'<li class="b_algo" data-bm="{index}">'
+        f'<div class="b_title"><h2><a href="https://{host}/{index}" h="ID=SERP,{index}">{title}</a></h2></div>'
+        f'<div class="b_caption"><div class="b_attribution"><cite>https://{host}</cite></div>'
+        f"<p>{snippet}</p></div>"
+        f'<div class="b_deep"><ul class="b_deeplinks">{deep_links}</ul></div>'
+        "</li>"
+    )
+
+def generate_serp(seed: int, keyword: str = "best restaurants", target_kb: int = 200) -> str:
+    """Returns a deterministic SERP of roughly ``target_kb`` kilobytes."""
+    rng = random.Random(seed)
+    q = html.escape(keyword)
+
+    organic = "".join(_organic(rng, i, keyword) for i in range(10))
+    related = "".join(
+        f'<li><a href="/search?q={q}+{w}">{q} {w}</a></li>' for w in rng.sample(WORDS, 8)
+    )
+    paa = "".join(
+        '<div class="b_expando">'
+        f'<div class="b_qtitle">{html.escape(_words(rng, 8))}?</div>'
+        f'<div class="b_answerText">{html.escape(_words(rng, 30))}</div>'
+        "</div>"
+        for _ in range(4)
+    )
+    images = "".join(
+        f'<div class="imgres"><a href="https://www.bing.com/images/search?q={q}&amp;id={rng.randrange(10 ** 9)}" '
+        f'title="{html.escape(_words(rng, 6))}"><img src="data:image/gif;base64,R0lGODlhAQABAAAAACw="></a></div>'
+        for _ in range(8)
+    )
+    videos = "".join(
+        '<div class="b_videoResult">'
+        f'<a href="https://www.bing.com/videos/search?q={q}&amp;docid={rng.randrange(10 ** 9)}" '
+        f'title="{html.escape(_words(rng, 5))}">{html.escape(_words(rng, 5))}</a>'
+        f'<span class="vc_count">{rng.randrange(1, 999)}K</span>'
+        f'<span class="vc_channel">{html.escape(_words(rng, 2))}</span>'
+        '<span class="vc_provider">YouTube</span>'
+        "</div>"
+        for _ in range(6)
+    )
+    news = "".join(
+        '<div class="b_newsResult">'
+        f'<a href="https://news{i}.example.com/{rng.randrange(10 ** 6)}">{html.escape(_words(rng, 9))}</a>'
+        f'<span class="source">{html.escape(_words(rng, 2)).title()} News</span>'
+        "</div>"
+        for i in range(4)
+    )
+    wiki = (
+        '<div class="b_entityTP">'
+        f"<h2>{html.escape(keyword.title())}</h2>"
+        f"<p>{html.escape(_words(rng, 50))}</p>"
+        f'<a href="https://en.wikipedia.org/wiki/{q.replace(" ", "_")}">Wikipedia</a>'
+        "</div>"
+    )
+
+    body = (
+        '<header id="b_header"><form action="/search"><input name="q" value="'
+        f'{q}"></form><nav>{"".join(f"<a href=/{w}>{w}</a>" for w in WORDS[:12])}</nav></header>'
+        '<main><ol id="b_results">'
+        f"{organic}"
+        f'<li class="b_ans">{paa}</li>'
+        f'<li class="b_ans"><div class="b_imagePair">{images}</div></li>'
+        f'<li class="b_ans">{videos}</li>'
+        f'<li class="b_ans">{news}</li>'
+        f'<li class="b_ans"><div id="b_rs"><h2>Related searches</h2><ul class="b_vList">{related}</ul></div></li>'
+        f'</ol><aside id="b_context">{wiki}</aside></main>'
+        '<footer id="b_footer"><a href="/privacy">Privacy</a></footer>'
+    )
+    head = (
+        f"<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\"><title>{q} - Search</title>"
+        "<style>" + "".join(f".c{i}{{margin:{i}px}}" for i in range(400)) + "</style>"
+    )
+
+    padding = max(0, target_kb * 1024 - len(head) - len(body))
+    scripts = _script_blob(rng, padding // 2)
+    return f"{head}{scripts}</head><body>{body}{_script_blob(rng, padding - padding // 2)}</body></html>"
+
+def generate_corpus(count: int, seed: int = 0, target_kb: int = 200) -> List[str]:
+    """Returns ``count`` distinct SERPs derived from ``seed``."""
+    return [
+        generate_serp(seed * 100_003 + i, keyword=f"{WORDS[i % len(WORDS)]} {i}", target_kb=target_kb)
+        for i in range(count)
+    ]
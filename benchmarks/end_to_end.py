@@ -0,0 +1,63 @@
+"""End-to-end benchmark: run_scraper against a local stub server."""
+
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List
+
+from main import run_scraper  # type: ignore
+
+from .harness import measure
+from .stub_server import StubSerpServer
+
+SCENARIOS: List[Dict[str, Any]] = [
+    {"name": "serial", "concurrency": 1, "parser_backend": "html.parser"},
+    {"name": "concurrent", "concurrency": 8, "parser_backend": "html.parser"},
+    {"name": "concurrent_lxml_native", "concurrency": 8, "parser_backend": "lxml-native"},
+    {"name": "concurrent_parse_pool", "concurrency": 8, "parser_backend": "html.parser", "parse_workers": 4},
+]
+
+def run_end_to_end(
+    keywords: int = 10,
+    pages: int = 3,
+    target_kb: int = 200,
+    delay: float = 0.02,
+    repeat: int = 3,
+    output_format: str = "json",
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp, StubSerpServer(target_kb, delay) as server:
+        config_path = os.path.join(tmp, "settings.json")
+        input_path = os.path.join(tmp, "input.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"bing_base_url": server.base_url, "timeout": 10, "max_retries": 1, "parse_memo_size": 0}, f)
+        with open(input_path, "w", encoding="utf-8") as f:
+            json.dump({"queries": [{"keyword": f"bench keyword {i}", "pages": pages} for i in range(keywords)]}, f)
+
+        for scenario in SCENARIOS:
+            options = {k: v for k, v in scenario.items() if k != "name"}
+
+            def run(options: Dict[str, Any] = options) -> None:
+                run_scraper(
+                    config_path=config_path,
+                    input_path=input_path,
+                    output_format=output_format,
+                    output_dir=os.path.join(tmp, "out"),
+                    **options,
+                )
+
+            result = measure(
+                f"run_scraper[{scenario['name']}]",
+                run,
+                repeat,
+                pages=keywords * pages,
+                delay_s=delay,
+                **options,
+            )
+            result["pages_per_s"] = result["pages"] / result["median_s"]
+            results.append(result)
+
+    return results
@@ -0,0 +1,30 @@
+"""Timing helpers shared by the benchmark modules."""
+
+import statistics
+import time
+from typing import Any, Callable, Dict
+
+def measure(name: str, func: Callable[[], Any], repeat: int = 5, warmup: int = 1, **extra: Any) -> Dict[str, Any]:
+    """
+    Times ``func`` ``repeat`` times after ``warmup`` untimed calls.
+
+    Returns a JSON-ready result with per-call min/median/mean seconds;
+    ``extra`` is merged in (units processed, sizes and the like).
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+
+    result: Dict[str, Any] = {
+        "name": name,
+        "repeat": len(samples),
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+    }
+    result.update(extra)
+    return result
@@ -0,0 +1,86 @@
+"""Micro-benchmarks for the parser, each section extractor and each exporter."""
+
+import os
+import tempfile
+from typing import Any, Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from extractors.bing_parser import PARSER_BACKENDS, BingSearchParser  # type: ignore
+from extractors.media_parser import parse_images, parse_news, parse_videos  # type: ignore
+from extractors.organic_handler import (  # type: ignore
+    parse_organic_results,
+    parse_people_also_ask,
+    parse_related_queries,
+    parse_wiki_results,
+)
+from outputs.export_csv import export_to_csv  # type: ignore
+from outputs.export_json import export_to_json  # type: ignore
+from outputs.export_jsonl import export_to_jsonl  # type: ignore
+from outputs.export_xlsx import export_to_xlsx  # type: ignore
+
+from .corpus import generate_corpus
+from .harness import measure
+
+EXTRACTORS: Dict[str, Callable[[BeautifulSoup], Any]] = {
+    "parse_organic_results": parse_organic_results,
+    "parse_related_queries": parse_related_queries,
+    "parse_people_also_ask": parse_people_also_ask,
+    "parse_images": parse_images,
+    "parse_videos": parse_videos,
+    "parse_news": parse_news,
+    "parse_wiki_results": parse_wiki_results,
+}
+
+EXPORTERS: Dict[str, Callable[[List[Dict[str, Any]], str], None]] = {
+    "json": export_to_json,
+    "jsonl": export_to_jsonl,
+    "csv": export_to_csv,
+    "xlsx": export_to_xlsx,
+}
+
+def run_micro(pages: int = 10, target_kb: int = 200, repeat: int = 5, export_records: int = 1000) -> List[Dict[str, Any]]:
+    corpus = generate_corpus(pages, target_kb=target_kb)
+    corpus_bytes = sum(len(page.encode("utf-8")) for page in corpus)
+    results: List[Dict[str, Any]] = []
+
+    for backend in PARSER_BACKENDS:
+        for single_pass in (True, False):
+            if backend == "lxml-native" and not single_pass:
+                continue
+            parser = BingSearchParser(single_pass=single_pass, backend=backend)
+            mode = "single_pass" if single_pass else "per_section"
+
+            def parse_all(parser: BingSearchParser = parser) -> None:
+                for i, page in enumerate(corpus):
+                    parser.parse(page, f"k{i}", 1, "https://www.bing.com/search")
+
+            results.append(
+                measure(f"parse[{backend},{mode}]", parse_all, repeat, pages=pages, bytes=corpus_bytes)
+            )
+
+    soups = [BeautifulSoup(page, "html.parser") for page in corpus]
+    results.append(
+        measure(
+            "tree[html.parser]",
+            lambda: [BeautifulSoup(page, "html.parser") for page in corpus],
+            repeat,
+            pages=pages,
+        )
+    )
+    for name, extractor in EXTRACTORS.items():
+        results.append(
+            measure(name, lambda extractor=extractor: [extractor(soup) for soup in soups], repeat, pages=pages)
+        )
+
+    parser = BingSearchParser(backend="lxml-native")
+    sample = [parser.parse(page, f"k{i}", 1, "https://www.bing.com/search") for i, page in enumerate(corpus)]
+    records = [dict(sample[i % len(sample)], keyword=f"k{i}") for i in range(export_records)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, exporter in EXPORTERS.items():
+            path = os.path.join(tmp, f"bench.{fmt}")
+            results.append(
+                measure(f"export[{fmt}]", lambda exporter=exporter, path=path: exporter(records, path), repeat, records=export_records)
+            )
+
+    return results
@@ -0,0 +1,73 @@
+"""
+Runs the benchmark suite and emits machine-readable JSON.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --quick --only micro
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from .end_to_end import run_end_to_end
+from .micro import run_micro
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv: Optional[list] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Benchmark parsing, exporting and full runs.")
+    parser.add_argument("--only", choices=["micro", "e2e"], help="Run a single group")
+    parser.add_argument("--quick", action="store_true", help="Smaller corpus and fewer repeats")
+    parser.add_argument("--target-kb", type=int, default=200, help="Approximate size of generated SERPs")
+    parser.add_argument("-o", "--output", help="Write results JSON to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    repeat = 1 if args.quick else 5
+    results = []
+    if args.only in (None, "micro"):
+        results += run_micro(
+            pages=3 if args.quick else 10,
+            target_kb=args.target_kb,
+            repeat=repeat,
+            export_records=100 if args.quick else 1000,
+        )
+    if args.only in (None, "e2e"):
+        results += run_end_to_end(
+            keywords=3 if args.quick else 10,
+            pages=2 if args.quick else 3,
+            target_kb=args.target_kb,
+            repeat=1 if args.quick else 3,
+        )
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "quick": args.quick,
+            "target_kb": args.target_kb,
+        },
+        "results": results,
+    }
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        sys.stdout.write(payload + "\n")
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Local HTTP server answering /search with generated full-size SERPs."""
+
+import functools
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from .corpus import generate_serp
+
+class StubSerpServer:
+    """
+    Serves ``generate_serp`` pages, seeded by the query and offset.
+
+    The same (q, first) pair always returns the same bytes. ``delay`` adds
+    per-request latency; rendered pages are cached so generation does not
+    dominate the measurement.
+    """
+
+    def __init__(self, target_kb: int = 200, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.request_count = 0
+        self._lock = threading.Lock()
+        render = functools.lru_cache(maxsize=1024)(
+            lambda q, first: generate_serp(zlib.crc32(f"{q}|{first}".encode("utf-8")), q, target_kb).encode("utf-8")
+        )
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                with stub._lock:
+                    stub.request_count += 1
+                if stub.delay:
+                    threading.Event().wait(stub.delay)
+                query = parse_qs(urlsplit(self.path).query)
+                body = render(query.get("q", [""])[0], int(query.get("first", ["1"])[0]))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/search"
+
+    def __enter__(self) -> "StubSerpServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
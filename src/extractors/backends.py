@@ -0,0 +1,4 @@
+# Tree builders BingSearchParser can run on. "lxml-native" skips
+# BeautifulSoup entirely and runs the XPath extractors in lxml_parser.
+# Kept free of imports so the CLI can list backends without loading a parser.
+PARSER_BACKENDS = ("html.parser", "lxml", "lxml-native")
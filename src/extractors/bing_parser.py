@@ -1,45 +1,174 @@
-thonimport logging
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, Tag
 
 from .organic_handler import (
+    ORGANIC_SELECTOR,
+    PAA_FALLBACK_SELECTOR,
+    PAA_SELECTOR,
+    RELATED_SELECTOR,
+    WIKI_SELECTOR,
+    organic_results_from,
     parse_organic_results,
-    parse_related_queries,
     parse_people_also_ask,
+    parse_related_queries,
     parse_wiki_results,
+    people_also_ask_from,
+    related_queries_from,
+    wiki_result_from,
+)
+from .backends import PARSER_BACKENDS
+from .memo import ParseMemo
+from .records import SECTION_KEYS, ParsedResult, parse_sections
+from .media_parser import (
+    IMAGES_SELECTOR,
+    NEWS_SELECTOR,
+    VIDEOS_SELECTOR,
+    images_from,
+    news_from,
+    parse_images,
+    parse_news,
+    parse_videos,
+    videos_from,
 )
-from .media_parser import parse_images, parse_videos, parse_news
 
 logger = logging.getLogger("bing_parser")
 
-@dataclass
-class ParsedResult:
-    url: str
-    keyword: str
-    page_number: int
-    organic_results: List[Dict[str, Any]]
-    related_queries: List[Dict[str, Any]]
-    people_also_ask: List[Dict[str, Any]]
-    images: List[Dict[str, Any]]
-    videos: List[Dict[str, Any]]
-    news: List[Dict[str, Any]]
-    wiki_results: Optional[Dict[str, Any]]
-
-    def as_dict(self) -> Dict[str, Any]:
-        return {
-            "url": self.url,
-            "keyword": self.keyword,
-            "pageNumber": self.page_number,
-            "organicResults": self.organic_results,
-            "relatedQueries": self.related_queries,
-            "peopleAlsoAsk": self.people_also_ask,
-            "images": self.images,
-            "videos": self.videos,
-            "news": self.news,
-            "wikiResults": self.wiki_results,
-        }
+# Bump whenever extractor output changes; memoized records from other
+# versions are then ignored.
+PARSER_VERSION = "1"
+
+# Container selectors for every section, keyed by bucket name.
+SECTION_SELECTORS: Dict[str, str] = {
+    "organic": ORGANIC_SELECTOR,
+    "related": RELATED_SELECTOR,
+    "paa": PAA_SELECTOR,
+    "paa_fallback": PAA_FALLBACK_SELECTOR,
+    "images": IMAGES_SELECTOR,
+    "videos": VIDEOS_SELECTOR,
+    "news": NEWS_SELECTOR,
+    "wiki": WIKI_SELECTOR,
+}
+
+# Index buckets each section's extractor reads.
+SECTION_BUCKETS: Dict[str, Tuple[str, ...]] = {
+    "organic": ("organic",),
+    "related": ("related",),
+    "paa": ("paa", "paa_fallback"),
+    "images": ("images",),
+    "videos": ("videos",),
+    "news": ("news",),
+    "wiki": ("wiki",),
+}
+
+# Log label used when a section's extractor fails.
+_SECTION_LABELS: Dict[str, str] = {
+    "organic": "organic results",
+    "related": "related queries",
+    "paa": "People Also Ask",
+    "images": "images",
+    "videos": "videos",
+    "news": "news",
+    "wiki": "wiki/knowledge panel",
+}
+
+# Bing page landmarks that hold each section's containers: results and
+# answers live in the main column, the knowledge panel in the sidebar.
+# Once the landmarks of every parsed section are closed, the rest of the
+# page (footer, trailing scripts) carries nothing the parser reads.
+STREAM_LANDMARKS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "organic": (("ol", "b_results"),),
+    "related": (("ol", "b_results"), ("aside", "b_context")),
+    "paa": (("ol", "b_results"),),
+    "images": (("ol", "b_results"),),
+    "videos": (("ol", "b_results"),),
+    "news": (("ol", "b_results"),),
+    "wiki": (("aside", "b_context"),),
+}
+
+def selectors_for(sections: Iterable[str]) -> Dict[str, str]:
+    """The container selectors the given sections need."""
+    return {bucket: SECTION_SELECTORS[bucket] for name in sections for bucket in SECTION_BUCKETS[name]}
+
+def _build_dispatch(
+    selectors: Dict[str, str],
+) -> Dict[str, List[Tuple[str, Any]]]:
+    """
+    Groups compiled container selectors by the tag name they start with.
+
+    Every container selector is a comma-separated list of 'tag.class'
+    patterns, so a node only has to be matched against the handful of
+    selectors that can apply to its tag name.
+    """
+    dispatch: Dict[str, List[Tuple[str, Any]]] = {}
+    for section, selector in selectors.items():
+        compiled = sv.compile(selector)
+        names = {part.strip().split(".", 1)[0] for part in selector.split(",")}
+        for name in names:
+            dispatch.setdefault(name, []).append((section, compiled))
+    return dispatch
+
+_DISPATCH = _build_dispatch(SECTION_SELECTORS)
+_dispatch_cache: Dict[Tuple[str, ...], Dict[str, List[Tuple[str, Any]]]] = {}
+
+def _dispatch_for(sections: Optional[Tuple[str, ...]]) -> Dict[str, List[Tuple[str, Any]]]:
+    if sections is None:
+        return _DISPATCH
+    dispatch = _dispatch_cache.get(sections)
+    if dispatch is None:
+        dispatch = _dispatch_cache[sections] = _build_dispatch(selectors_for(sections))
+    return dispatch
+
+class SectionIndex:
+    """
+    Buckets section containers found in a single walk over the document.
+
+    Buckets keep document order, so each extractor sees exactly the nodes
+    a ``soup.select`` call with the section's selector would return.
+    ``dispatch`` limits the walk to some sections' containers; the other
+    buckets stay empty.
+    """
+
+    def __init__(self, soup: BeautifulSoup, dispatch: Optional[Dict[str, List[Tuple[str, Any]]]] = None) -> None:
+        self.buckets: Dict[str, List[Tag]] = {section: [] for section in SECTION_SELECTORS}
+        if dispatch is None:
+            dispatch = _DISPATCH
+
+        for node in soup.descendants:
+            if not isinstance(node, Tag) or not node.get("class"):
+                continue
+            candidates = dispatch.get(node.name)
+            if not candidates:
+                continue
+            for section, compiled in candidates:
+                if compiled.match(node):
+                    self.buckets[section].append(node)
+
+    def get(self, section: str) -> List[Tag]:
+        return self.buckets[section]
+
+    def first(self, section: str) -> Optional[Tag]:
+        bucket = self.buckets[section]
+        return bucket[0] if bucket else None
+
+def _extract(
+    func: Callable[[], Any],
+    label: str,
+    default: Any,
+    timings: Dict[str, float],
+    section: str,
+) -> Any:
+    started = time.perf_counter()
+    try:
+        return func()
+    except Exception as exc:
+        logger.error("Error parsing %s: %s", label, exc)
+        return default
+    finally:
+        timings[section] = time.perf_counter() - started
 
 class BingSearchParser:
     """
@@ -47,8 +176,81 @@ class BingSearchParser:
 
     The parser is resilient: if a particular section cannot be parsed,
     it logs the error and returns an empty list for that section.
+
+    By default the document is walked once and section containers are
+    handed to the extractors from a ``SectionIndex``. Passing
+    ``single_pass=False`` runs each extractor's own full-tree select.
+
+    ``backend`` picks the tree builder, one of ``PARSER_BACKENDS``. The
+    "lxml-native" backend always uses the single-pass index.
+
+    With a ``memo`` store, pages whose HTML was parsed before are served
+    from it without building a tree; only ``url``, ``keyword`` and
+    ``pageNumber`` are taken from the current call.
+
+    After every call ``last_timings`` maps "tree" (tree and index
+    construction) and each section name to the seconds it took, or holds
+    just "memo" when the page was served from the memo store.
+
+    ``sections`` (names from ``SECTION_KEYS``, or a comma-separated
+    string) runs only those extractors: the index skips the other
+    sections' containers and the record leaves them out. None runs all.
+
+    ``stream_document`` starts an incremental tree for a page that is
+    still downloading; it reports when the landmarks of the selected
+    sections are complete, and its tree can be passed to ``parse_result``
+    as ``document`` so the "lxml-native" backend skips building one.
+
+    ``parse_result`` returns the compact ``ParsedResult``; ``parse`` returns
+    the same record as a plain dict.
     """
 
+    def __init__(
+        self,
+        single_pass: bool = True,
+        backend: str = "html.parser",
+        memo: Optional[ParseMemo] = None,
+        sections: Union[str, Iterable[str], None] = None,
+    ) -> None:
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(
+                f"Unknown parser backend {backend!r}; expected one of {', '.join(PARSER_BACKENDS)}"
+            )
+        self.single_pass = single_pass
+        self.backend = backend
+        self.memo = memo
+        self.sections = parse_sections(sections)
+        self._active = self.sections or tuple(SECTION_KEYS)
+        # Memo entries only hold the sections they were parsed with.
+        self._memo_tag = backend if self.sections is None else f"{backend}:{'+'.join(self.sections)}"
+        self.last_timings: Dict[str, float] = {}
+
+    def stream_document(self) -> Any:
+        """A fresh ``IncrementalDocument`` waiting for this parser's landmarks."""
+        from . import lxml_parser
+
+        landmarks = {landmark for name in self._active for landmark in STREAM_LANDMARKS[name]}
+        return lxml_parser.IncrementalDocument(sorted(landmarks))
+
+    def _native_extractors(self, html: str, document: Optional[Any] = None) -> Dict[str, Callable[[], Any]]:
+        # Imported here so the BeautifulSoup backends do not pay for lxml.
+        from . import lxml_parser
+
+        if document is None:
+            document = lxml_parser.parse_document(html)
+        index = lxml_parser.LxmlSectionIndex(document, selectors_for(self._active))
+        return {
+            "organic": lambda: lxml_parser.organic_results_from(index.get("organic")),
+            "related": lambda: lxml_parser.related_queries_from(index.get("related")),
+            "paa": lambda: lxml_parser.people_also_ask_from(
+                index.get("paa"), lambda: index.get("paa_fallback")
+            ),
+            "images": lambda: lxml_parser.images_from(index.get("images")),
+            "videos": lambda: lxml_parser.videos_from(index.get("videos")),
+            "news": lambda: lxml_parser.news_from(index.get("news")),
+            "wiki": lambda: lxml_parser.wiki_result_from(index.first("wiki")),
+        }
+
     def parse(
         self,
         html: str,
@@ -56,67 +258,77 @@ class BingSearchParser:
         page_number: int,
         url: str,
     ) -> Dict[str, Any]:
+        return self.parse_result(html, keyword, page_number, url).as_dict()
+
+    def parse_result(
+        self,
+        html: str,
+        keyword: str,
+        page_number: int,
+        url: str,
+        document: Optional[Any] = None,
+    ) -> ParsedResult:
         logger.debug(
             "Parsing HTML for keyword=%s, page=%d, url=%s", keyword, page_number, url
         )
 
-        soup = BeautifulSoup(html, "html.parser")
-
-        try:
-            organic_results = parse_organic_results(soup)
-        except Exception as exc:
-            logger.error("Error parsing organic results: %s", exc)
-            organic_results = []
-
-        try:
-            related_queries = parse_related_queries(soup)
-        except Exception as exc:
-            logger.error("Error parsing related queries: %s", exc)
-            related_queries = []
+        timings: Dict[str, float] = {}
+        self.last_timings = timings
+        started = time.perf_counter()
 
-        try:
-            people_also_ask = parse_people_also_ask(soup)
-        except Exception as exc:
-            logger.error("Error parsing People Also Ask: %s", exc)
-            people_also_ask = []
+        memo_key = None
+        if self.memo is not None:
+            memo_key = self.memo.key(html, self._memo_tag)
+            sections = self.memo.get(memo_key)
+            if sections is not None:
+                logger.debug("Parse memo hit for %s", url)
+                timings["memo"] = time.perf_counter() - started
+                return ParsedResult.from_sections(url, keyword, page_number, sections, self.sections)
 
-        try:
-            images = parse_images(soup)
-        except Exception as exc:
-            logger.error("Error parsing images: %s", exc)
-            images = []
+        soup: Optional[BeautifulSoup] = None
+        extract: Dict[str, Callable[[], Any]]
+        if self.backend == "lxml-native":
+            extract = self._native_extractors(html, document)
+        elif self.single_pass:
+            soup = BeautifulSoup(html, self.backend)
+            index = SectionIndex(soup, _dispatch_for(self.sections))
+            extract = {
+                "organic": lambda: organic_results_from(index.get("organic")),
+                "related": lambda: related_queries_from(index.get("related")),
+                "paa": lambda: people_also_ask_from(
+                    index.get("paa"), lambda: index.get("paa_fallback")
+                ),
+                "images": lambda: images_from(index.get("images")),
+                "videos": lambda: videos_from(index.get("videos")),
+                "news": lambda: news_from(index.get("news")),
+                "wiki": lambda: wiki_result_from(index.first("wiki")),
+            }
+        else:
+            soup = BeautifulSoup(html, self.backend)
+            extract = {
+                "organic": lambda: parse_organic_results(soup),
+                "related": lambda: parse_related_queries(soup),
+                "paa": lambda: parse_people_also_ask(soup),
+                "images": lambda: parse_images(soup),
+                "videos": lambda: parse_videos(soup),
+                "news": lambda: parse_news(soup),
+                "wiki": lambda: parse_wiki_results(soup),
+            }
 
-        try:
-            videos = parse_videos(soup)
-        except Exception as exc:
-            logger.error("Error parsing videos: %s", exc)
-            videos = []
+        timings["tree"] = time.perf_counter() - started
 
+        sections: Dict[str, Any] = {}
         try:
-            news = parse_news(soup)
-        except Exception as exc:
-            logger.error("Error parsing news: %s", exc)
-            news = []
-
-        try:
-            wiki_results = parse_wiki_results(soup)
-        except Exception as exc:
-            logger.error("Error parsing wiki/knowledge panel: %s", exc)
-            wiki_results = None
-
-        parsed = ParsedResult(
-            url=url,
-            keyword=keyword,
-            page_number=page_number,
-            organic_results=organic_results,
-            related_queries=related_queries,
-            people_also_ask=people_also_ask,
-            images=images,
-            videos=videos,
-            news=news,
-            wiki_results=wiki_results,
-        )
+            for name in self._active:
+                default = None if name == "wiki" else []
+                sections[SECTION_KEYS[name]] = _extract(extract[name], _SECTION_LABELS[name], default, timings, name)
+        finally:
+            # The tree is full of parent/sibling cycles; break them now
+            # instead of leaving it for the cyclic garbage collector.
+            if soup is not None:
+                soup.decompose()
 
-        record = parsed.as_dict()
-        logger.debug("Parsed record summary: %s", {k: len(v) if isinstance(v, list) else v for k, v in record.items()})
-        return record
\ No newline at end of file
+        if self.memo is not None and memo_key is not None:
+            self.memo.put(memo_key, sections)
+        logger.debug("Parsed record summary: %s", {k: len(v) if isinstance(v, list) else v for k, v in sections.items()})
+        return ParsedResult.from_sections(url, keyword, page_number, sections, self.sections)
\ No newline at end of file
@@ -0,0 +1,306 @@
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import lxml.html
+from lxml import etree
+
+logger = logging.getLogger("lxml_parser")
+
+# Text nodes BeautifulSoup leaves out of get_text(): script/style bodies,
+# ruby annotations and anything inside <template>. Comments are never
+# matched by text().
+_TEXT = etree.XPath(
+    "descendant-or-self::text()"
+    "[not(ancestor::script or ancestor::style or ancestor::template"
+    " or ancestor::rt or ancestor::rp)]"
+)
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# XPath equivalents of the CSS selectors used by the BeautifulSoup extractors.
+# Each "first match" expression keeps document order like select_one().
+_FIRST_LINK = etree.XPath("descendant::a[@href][1]")
+_FIRST_ANCHOR = etree.XPath("descendant::a[1]")
+
+_ORGANIC_TITLE = etree.XPath("descendant::a[ancestor::h2][1]")
+_ORGANIC_SNIPPET = etree.XPath("descendant::p[1]")
+_RELATED_ITEMS = etree.XPath("descendant::li")
+_PAA_QUESTION = etree.XPath(
+    f"descendant::*[{_has_class('b_qtitle')} or {_has_class('b_question')}"
+    " or self::h3 or self::summary][1]"
+)
+_PAA_ANSWER = etree.XPath(
+    f"descendant::*[{_has_class('b_answerText')} or {_has_class('b_paractl')}"
+    " or self::p][1]"
+)
+_PAA_FALLBACK_QUESTIONS = etree.XPath(
+    f"descendant::*[(self::div and {_has_class('question')}) or self::dt]"
+)
+_PAA_FALLBACK_ANSWER = etree.XPath("following-sibling::*[self::p or self::dd][1]")
+_WIKI_TITLE = etree.XPath(
+    f"descendant::*[self::h2 or self::h1 or {_has_class('b_entityTitle')}"
+    f" or {_has_class('title')}][1]"
+)
+_WIKI_SNIPPET = etree.XPath(
+    f"descendant::*[self::p or {_has_class('snippet')} or {_has_class('description')}][1]"
+)
+_VIDEO_VIEWS = etree.XPath(f"descendant::*[{_has_class('vc_count')} or {_has_class('views')}][1]")
+_VIDEO_CHANNEL = etree.XPath(
+    f"descendant::*[{_has_class('vc_channel')} or {_has_class('channel')}][1]"
+)
+_VIDEO_PROVIDER = etree.XPath(
+    f"descendant::*[{_has_class('vc_provider')} or {_has_class('provider')}][1]"
+)
+_NEWS_SOURCE = etree.XPath(
+    f"descendant::*[{_has_class('source')} or {_has_class('provider')}"
+    f" or {_has_class('b_attribution')}][1]"
+)
+
+def _first(xpath: etree.XPath, node: Any) -> Optional[Any]:
+    matches = xpath(node)
+    return matches[0] if matches else None
+
+def _safe_text(node: Optional[Any]) -> str:
+    if node is None:
+        return ""
+    return " ".join("".join(part.strip() for part in _TEXT(node)).split())
+
+def parse_document(html: str) -> Optional[Any]:
+    """
+    Builds an lxml.html tree, or returns None for an empty document.
+
+    Strings carrying an XML encoding declaration are re-fed as UTF-8
+    bytes, since lxml refuses to parse them as text.
+    """
+    if not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        return lxml.html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return None
+
+class IncrementalDocument:
+    """
+    Builds an lxml tree from text chunks as they arrive.
+
+    ``landmarks`` are (tag, id) pairs of the elements a parse needs;
+    ``feed`` returns True once every one of them has been closed, at which
+    point the rest of the response can be skipped. ``close`` then returns
+    (and keeps as ``root``) the tree of everything fed so far, None for an
+    empty document, and ``html`` holds the same text for parsers that
+    build their own tree. Without landmarks, or when one never shows up,
+    the whole document is read.
+
+    Should lxml reject the text incrementally (e.g. an XML encoding
+    declaration), the chunks are still collected but no tree is built,
+    and ``close`` returns None so callers fall back to ``parse_document``.
+    """
+
+    def __init__(self, landmarks: Iterable[Tuple[str, str]]) -> None:
+        self.pending = set(landmarks)
+        self.done = False
+        self.html = ""
+        self.root: Optional[Any] = None
+        self._parts: List[str] = []
+        tags = sorted({tag for tag, _ in self.pending})
+        self._parser: Optional[Any] = etree.HTMLPullParser(events=("end",), tag=tags) if tags else None
+
+    def feed(self, text: str) -> bool:
+        if not text or self.done:
+            return self.done
+        self._parts.append(text)
+        if self._parser is None:
+            return False
+        try:
+            self._parser.feed(text)
+            for _, node in self._parser.read_events():
+                self.pending.discard((node.tag, node.get("id")))
+        except (ValueError, etree.LxmlError) as exc:
+            logger.debug("Incremental parse abandoned: %s", exc)
+            self._parser = None
+            self.pending.clear()
+            return False
+        self.done = not self.pending
+        return self.done
+
+    def close(self) -> Optional[Any]:
+        self.html = "".join(self._parts)
+        parser, self._parser = self._parser, None
+        if parser is None or not self.html.strip():
+            return None
+        try:
+            self.root = parser.close()
+        except (ValueError, etree.LxmlError):
+            self.root = None
+        return self.root
+
+def _container_rules(selectors: Dict[str, str]) -> Dict[str, List[Tuple[str, str]]]:
+    """Turns 'tag.class, ...' container selectors into tag -> (section, class) rules."""
+    rules: Dict[str, List[Tuple[str, str]]] = {}
+    for section, selector in selectors.items():
+        for part in selector.split(","):
+            name, _, cls = part.strip().partition(".")
+            rules.setdefault(name, []).append((section, cls))
+    return rules
+
+class LxmlSectionIndex:
+    """
+    Buckets section containers from a single walk over an lxml tree.
+
+    Mirrors ``SectionIndex`` for the BeautifulSoup backends: buckets keep
+    document order and a node lands in every section it matches.
+    """
+
+    def __init__(self, root: Optional[Any], selectors: Dict[str, str]) -> None:
+        self.buckets: Dict[str, List[Any]] = {section: [] for section in selectors}
+        if root is None:
+            return
+
+        rules = _container_rules(selectors)
+        for node in root.iter(*rules):
+            class_attr = node.get("class")
+            if not class_attr:
+                continue
+            classes = class_attr.split()
+            for section, cls in rules[node.tag]:
+                if cls in classes and node not in self.buckets[section][-1:]:
+                    self.buckets[section].append(node)
+
+    def get(self, section: str) -> List[Any]:
+        return self.buckets[section]
+
+    def first(self, section: str) -> Optional[Any]:
+        bucket = self.buckets[section]
+        return bucket[0] if bucket else None
+
+def organic_results_from(containers: Iterable[Any]) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+
+    for li in containers:
+        title_tag = _first(_ORGANIC_TITLE, li)
+        snippet_tag = _first(_ORGANIC_SNIPPET, li)
+        url = title_tag.get("href", "") if title_tag is not None else ""
+
+        result = {
+            "title": _safe_text(title_tag),
+            "url": url,
+            "description": _safe_text(snippet_tag),
+        }
+        if result["title"] or result["url"]:
+            results.append(result)
+
+    logger.debug("Extracted %d organic results", len(results))
+    return results
+
+def related_queries_from(candidate_lists: Iterable[Any]) -> List[Dict[str, Any]]:
+    related: List[Dict[str, Any]] = []
+    seen = set()
+
+    for ul in candidate_lists:
+        for li in _RELATED_ITEMS(ul):
+            a = _first(_FIRST_ANCHOR, li)
+            if a is None:
+                continue
+            text = _safe_text(a)
+            href = a.get("href", "")
+            key = (text, href)
+            if text and key not in seen:
+                seen.add(key)
+                related.append({"text": text, "url": href})
+
+    logger.debug("Extracted %d related queries", len(related))
+    return related
+
+def people_also_ask_from(
+    containers: Iterable[Any],
+    fallback_blocks: Callable[[], Iterable[Any]],
+) -> List[Dict[str, Any]]:
+    qa_items: List[Dict[str, Any]] = []
+
+    for container in containers:
+        question = _safe_text(_first(_PAA_QUESTION, container))
+        answer = _safe_text(_first(_PAA_ANSWER, container))
+        if question:
+            qa_items.append({"question": question, "answer": answer})
+
+    if not qa_items:
+        for qa_block in fallback_blocks():
+            for q in _PAA_FALLBACK_QUESTIONS(qa_block):
+                question = _safe_text(q)
+                if not question:
+                    continue
+                answer = _safe_text(_first(_PAA_FALLBACK_ANSWER, q))
+                qa_items.append({"question": question, "answer": answer})
+
+    logger.debug("Extracted %d People Also Ask entries", len(qa_items))
+    return qa_items
+
+def wiki_result_from(panel: Optional[Any]) -> Optional[Dict[str, Any]]:
+    if panel is None:
+        return None
+
+    link_tag = _first(_FIRST_LINK, panel)
+    wiki = {
+        "title": _safe_text(_first(_WIKI_TITLE, panel)),
+        "description": _safe_text(_first(_WIKI_SNIPPET, panel)),
+        "url": link_tag.get("href") if link_tag is not None else "",
+    }
+    if not any(wiki.values()):
+        return None
+
+    logger.debug("Extracted wiki/knowledge panel result")
+    return wiki
+
+def images_from(containers: Iterable[Any]) -> List[Dict[str, Any]]:
+    images: List[Dict[str, Any]] = []
+
+    for container in containers:
+        link = _first(_FIRST_LINK, container)
+        if link is None:
+            continue
+        description = link.get("title") or _safe_text(container)
+        images.append({"url": link.get("href"), "description": description})
+
+    logger.debug("Extracted %d image entries", len(images))
+    return images
+
+def videos_from(containers: Iterable[Any]) -> List[Dict[str, Any]]:
+    videos: List[Dict[str, Any]] = []
+
+    for container in containers:
+        link = _first(_FIRST_LINK, container)
+        if link is None:
+            continue
+        videos.append(
+            {
+                "url": link.get("href"),
+                "title": link.get("title") or _safe_text(link),
+                "views": _safe_text(_first(_VIDEO_VIEWS, container)),
+                "channel": _safe_text(_first(_VIDEO_CHANNEL, container)),
+                "provider": _safe_text(_first(_VIDEO_PROVIDER, container)),
+            }
+        )
+
+    logger.debug("Extracted %d video entries", len(videos))
+    return videos
+
+def news_from(containers: Iterable[Any]) -> List[Dict[str, Any]]:
+    news_items: List[Dict[str, Any]] = []
+
+    for container in containers:
+        link = _first(_FIRST_LINK, container)
+        if link is None:
+            continue
+        news_items.append(
+            {
+                "headline": _safe_text(link),
+                "url": link.get("href"),
+                "source": _safe_text(_first(_NEWS_SOURCE, container)),
+            }
+        )
+
+    logger.debug("Extracted %d news entries", len(news_items))
+    return news_items
@@ -1,10 +1,22 @@
-thonimport logging
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, Dict, Iterable, List, Optional
 
+import soupsieve as sv
 from bs4 import BeautifulSoup, Tag
 
 logger = logging.getLogger("media_parser")
 
+# Container selectors, shared with the single-pass section index.
+IMAGES_SELECTOR = "div.imgres, div.image_result, div.b_imageContainer"
+VIDEOS_SELECTOR = "div.b_videoResult, div.video_result, li.video"
+NEWS_SELECTOR = "div.news-card, li.news, div.b_newsResult"
+
+# Selectors evaluated inside each container, compiled once at import time.
+_VIDEO_VIEWS = sv.compile(".vc_count, .views")
+_VIDEO_CHANNEL = sv.compile(".vc_channel, .channel")
+_VIDEO_PROVIDER = sv.compile(".vc_provider, .provider")
+_NEWS_SOURCE = sv.compile(".source, .provider, .b_attribution")
+
 def _safe_text(node: Optional[Tag]) -> str:
     if not node:
         return ""
@@ -17,10 +29,14 @@ def parse_images(soup: BeautifulSoup) -> List[Dict[str, Any]]:
     For real Bing pages this would involve dedicated image search results.
     Here we support simplified patterns for robustness and testing.
     """
+    # Pattern for our tests: div.imgres > a[href]
+    return images_from(soup.select(IMAGES_SELECTOR))
+
+def images_from(containers: Iterable[Tag]) -> List[Dict[str, Any]]:
+    """Builds image entries from pre-selected image containers."""
     images: List[Dict[str, Any]] = []
 
-    # Pattern for our tests: div.imgres > a[href]
-    for container in soup.select("div.imgres, div.image_result, div.b_imageContainer"):
+    for container in containers:
         link = container.find("a", href=True)
         if not link:
             continue
@@ -37,18 +53,22 @@ def parse_videos(soup: BeautifulSoup) -> List[Dict[str, Any]]:
 
     Supports a simplified structure for tests and examples.
     """
+    return videos_from(soup.select(VIDEOS_SELECTOR))
+
+def videos_from(containers: Iterable[Tag]) -> List[Dict[str, Any]]:
+    """Builds video entries from pre-selected video containers."""
     videos: List[Dict[str, Any]] = []
 
-    for container in soup.select("div.b_videoResult, div.video_result, li.video"):
+    for container in containers:
         link = container.find("a", href=True)
         if not link:
             continue
 
         url = link["href"]
         title = link.get("title") or _safe_text(link)
-        views_tag = container.select_one(".vc_count, .views")
-        channel_tag = container.select_one(".vc_channel, .channel")
-        provider_tag = container.select_one(".vc_provider, .provider")
+        views_tag = _VIDEO_VIEWS.select_one(container)
+        channel_tag = _VIDEO_CHANNEL.select_one(container)
+        provider_tag = _VIDEO_PROVIDER.select_one(container)
 
         videos.append(
             {
@@ -69,14 +89,18 @@ def parse_news(soup: BeautifulSoup) -> List[Dict[str, Any]]:
 
     Looks for simple headline + source patterns.
     """
+    return news_from(soup.select(NEWS_SELECTOR))
+
+def news_from(containers: Iterable[Tag]) -> List[Dict[str, Any]]:
+    """Builds news entries from pre-selected news containers."""
     news_items: List[Dict[str, Any]] = []
 
-    for container in soup.select("div.news-card, li.news, div.b_entityTP, div.b_newsResult"):
+    for container in containers:
         link = container.find("a", href=True)
         if not link:
             continue
         headline = _safe_text(link)
-        source_tag = container.select_one(".source, .provider, .b_attribution")
+        source_tag = _NEWS_SOURCE.select_one(container)
         source = _safe_text(source_tag)
         news_items.append(
             {
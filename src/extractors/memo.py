@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("parse_memo")
+
+class ParseMemo:
+    """
+    Memoizes parsed sections keyed by a hash of the HTML.
+
+    Keys combine a BLAKE2b digest of the page with the parser version and
+    backend, so bumping ``PARSER_VERSION`` makes every old entry a miss.
+    Entries live in an in-memory LRU tier of ``max_entries`` records and,
+    when ``directory`` is given, in a SQLite file that survives between
+    runs; stale-version rows are dropped from it on open, and once its
+    compressed total exceeds ``max_bytes`` the least recently used rows
+    are evicted.
+
+    The disk tier is an optimization shared by every parser process, so
+    its errors (a ``database is locked`` under contention, a full disk)
+    are logged and the page is parsed or kept in memory as usual. A disk
+    tier that cannot be opened within ``timeout`` seconds is skipped.
+
+    Stored values exclude ``url``, ``keyword`` and ``pageNumber``, which
+    the parser fills in per call.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        max_entries: int = 1024,
+        directory: Optional[str] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+        timeout: float = 5.0,
+    ) -> None:
+        self.version = version
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.disk_errors = 0
+        self._clock = clock
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(
+                os.path.join(directory, "parse_memo.sqlite3"), timeout=timeout, check_same_thread=False
+            )
+            try:
+                self._db.executescript(
+                    """
+                    DROP TABLE IF EXISTS records;
+                    CREATE TABLE IF NOT EXISTS entries (
+                        key TEXT PRIMARY KEY,
+                        version TEXT NOT NULL,
+                        body BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        accessed_at REAL NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+                    """
+                )
+                self._db.execute("DELETE FROM entries WHERE version != ?", (version,))
+                self._db.commit()
+            except sqlite3.Error as exc:
+                # Parser processes open the memo together; one that loses
+                # the race keeps to its memory tier.
+                self._disk_failed("open", exc)
+                self._db.close()
+                self._db = None
+
+    def key(self, html: str, backend: str) -> str:
+        digest = hashlib.blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{self.version}:{backend}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns a fresh copy of the memoized sections, or None on a miss."""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                payload = self._disk_get(key)
+                if payload is not None:
+                    self._remember(key, payload)
+
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(payload)
+
+    def put(self, key: str, sections: Dict[str, Any]) -> None:
+        payload = json.dumps(sections, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, payload)
+            if self._db is not None:
+                self._disk_put(key, payload)
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        assert self._db is not None
+        try:
+            row = self._db.execute("SELECT body FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (self._clock(), key))
+            self._db.commit()
+        except sqlite3.Error as exc:
+            self._disk_failed("read", exc)
+            return None
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def _disk_put(self, key: str, payload: str) -> None:
+        assert self._db is not None
+        body = zlib.compress(payload.encode("utf-8"))
+        if len(body) > self.max_bytes:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, version, body, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, self.version, body, len(body), self._clock()),
+            )
+            self._evict()
+            self._db.commit()
+        except sqlite3.Error as exc:
+            self._disk_failed("write", exc)
+
+    def _evict(self) -> None:
+        assert self._db is not None
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        logger.debug("Evicted %d parse memo entr(ies)", len(victims))
+
+    def _disk_failed(self, action: str, exc: sqlite3.Error) -> None:
+        assert self._db is not None
+        self.disk_errors += 1
+        log = logger.warning if self.disk_errors == 1 else logger.debug
+        log("Parse memo %s failed, continuing without it: %s", action, exc)
+        try:
+            self._db.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _remember(self, key: str, payload: str) -> None:
+        if not self.max_entries:
+            return
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        logger.debug(
+            "Parse memo: %d hit(s), %d miss(es), %d disk error(s)", self.hits, self.misses, self.disk_errors
+        )
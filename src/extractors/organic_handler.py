@@ -1,10 +1,29 @@
-thonimport logging
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+import soupsieve as sv
 from bs4 import BeautifulSoup, Tag
 
 logger = logging.getLogger("organic_handler")
 
+# Container selectors, shared with the single-pass section index.
+ORGANIC_SELECTOR = "li.b_algo"
+RELATED_SELECTOR = "ul.b_vList, ul.b_list, ul.b_rs, ul.related, ul.suggestions"
+PAA_SELECTOR = "div.b_expando"
+PAA_FALLBACK_SELECTOR = "div.paa, div.people-also-ask"
+WIKI_SELECTOR = "div.b_entityTP, div.b_entityPanel, div.wiki-panel"
+
+# Selectors evaluated inside each container, compiled once at import time.
+_ORGANIC_TITLE = sv.compile("h2 a")
+_ORGANIC_SNIPPET = sv.compile("p")
+_RELATED_ITEM = sv.compile("li")
+_PAA_QUESTION = sv.compile(".b_qtitle, .b_question, h3, summary")
+_PAA_ANSWER = sv.compile(".b_answerText, .b_paractl, p")
+_PAA_FALLBACK_QUESTION = sv.compile("div.question, dt")
+_WIKI_TITLE = sv.compile("h2, h1, .b_entityTitle, .title")
+_WIKI_SNIPPET = sv.compile("p, .snippet, .description")
+_WIKI_LINK = sv.compile("a[href*='wikipedia.org'], a[href]")
+
 def _safe_text(node: Optional[Tag]) -> str:
     if not node:
         return ""
@@ -16,11 +35,15 @@ def parse_organic_results(soup: BeautifulSoup) -> List[Dict[str, Any]]:
 
     Targets typical Bing DOM patterns such as 'li.b_algo' entries.
     """
+    return organic_results_from(soup.select(ORGANIC_SELECTOR))
+
+def organic_results_from(containers: Iterable[Tag]) -> List[Dict[str, Any]]:
+    """Builds organic results from pre-selected 'li.b_algo' containers."""
     results: List[Dict[str, Any]] = []
 
-    for li in soup.select("li.b_algo"):
-        title_tag = li.select_one("h2 a")
-        snippet_tag = li.select_one("p")
+    for li in containers:
+        title_tag = _ORGANIC_TITLE.select_one(li)
+        snippet_tag = _ORGANIC_SNIPPET.select_one(li)
         url = title_tag.get("href") if title_tag and title_tag.has_attr("href") else ""
 
         result = {
@@ -41,13 +64,15 @@ def parse_related_queries(soup: BeautifulSoup) -> List[Dict[str, Any]]:
 
     Looks for lists commonly used by Bing for related terms.
     """
-    related: List[Dict[str, Any]] = []
-
     # Common pattern: "Related searches" near 'b_rs' or generic suggestion lists
-    candidate_lists = soup.select("ul.b_vList, ul.b_list, ul.b_rs, ul.related, ul.suggestions")
+    return related_queries_from(soup.select(RELATED_SELECTOR))
+
+def related_queries_from(candidate_lists: Iterable[Tag]) -> List[Dict[str, Any]]:
+    """Builds deduplicated related queries from pre-selected list containers."""
+    related: List[Dict[str, Any]] = []
 
     for ul in candidate_lists:
-        for li in ul.select("li"):
+        for li in _RELATED_ITEM.select(ul):
             a = li.find("a")
             if not a:
                 continue
@@ -76,12 +101,26 @@ def parse_people_also_ask(soup: BeautifulSoup) -> List[Dict[str, Any]]:
     The real Bing DOM can be complex; here we support a couple of simple patterns
     and keep it resilient.
     """
+    return people_also_ask_from(
+        soup.select(PAA_SELECTOR),
+        lambda: soup.select(PAA_FALLBACK_SELECTOR),
+    )
+
+def people_also_ask_from(
+    containers: Iterable[Tag],
+    fallback_blocks: Callable[[], Iterable[Tag]],
+) -> List[Dict[str, Any]]:
+    """
+    Builds Q&A entries from pre-selected 'div.b_expando' containers.
+
+    ``fallback_blocks`` is only called when the primary pattern yields nothing.
+    """
     qa_items: List[Dict[str, Any]] = []
 
     # Pattern 1: custom markup in our tests (b_expando with b_qtitle and b_answerText)
-    for container in soup.select("div.b_expando"):
-        question_tag = container.select_one(".b_qtitle, .b_question, h3, summary")
-        answer_tag = container.select_one(".b_answerText, .b_paractl, p")
+    for container in containers:
+        question_tag = _PAA_QUESTION.select_one(container)
+        answer_tag = _PAA_ANSWER.select_one(container)
         question = _safe_text(question_tag)
         answer = _safe_text(answer_tag)
         if question:
@@ -89,8 +128,8 @@ def parse_people_also_ask(soup: BeautifulSoup) -> List[Dict[str, Any]]:
 
     # Pattern 2: more generic Q&A lists (fallback)
     if not qa_items:
-        for qa_block in soup.select("div.paa, div.people-also-ask"):
-            for q in qa_block.select("div.question, dt"):
+        for qa_block in fallback_blocks():
+            for q in _PAA_FALLBACK_QUESTION.select(qa_block):
                 question = _safe_text(q)
                 if not question:
                     continue
@@ -109,13 +148,16 @@ def parse_wiki_results(soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
     We intentionally keep this generic: look for an info panel with a header and snippet.
     """
     # Pattern for a knowledge panel style block
-    panel = soup.select_one("div.b_entityTP, div.b_entityPanel, div.wiki-panel")
+    return wiki_result_from(soup.select_one(WIKI_SELECTOR))
+
+def wiki_result_from(panel: Optional[Tag]) -> Optional[Dict[str, Any]]:
+    """Builds the wiki/knowledge-panel result from a pre-selected panel."""
     if not panel:
         return None
 
-    title_tag = panel.select_one("h2, h1, .b_entityTitle, .title")
-    snippet_tag = panel.select_one("p, .snippet, .description")
-    link_tag = panel.select_one("a[href*='wikipedia.org'], a[href]")
+    title_tag = _WIKI_TITLE.select_one(panel)
+    snippet_tag = _WIKI_SNIPPET.select_one(panel)
+    link_tag = _WIKI_LINK.select_one(panel)
 
     wiki = {
         "title": _safe_text(title_tag),
@@ -0,0 +1,188 @@
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from .bing_parser import PARSER_VERSION, BingSearchParser
+from .memo import ParseMemo
+from .records import ParsedResult
+
+logger = logging.getLogger("parse_pool")
+
+# One parser per worker process, built by the pool initializer.
+_worker_parser: Optional[BingSearchParser] = None
+
+def _build_parser(
+    backend: str, memo_options: Optional[Dict[str, Any]], sections: Optional[Tuple[str, ...]] = None
+) -> BingSearchParser:
+    memo = ParseMemo(PARSER_VERSION, **memo_options) if memo_options is not None else None
+    return BingSearchParser(backend=backend, memo=memo, sections=sections)
+
+def _init_worker(
+    backend: str, memo_options: Optional[Dict[str, Any]], sections: Optional[Tuple[str, ...]] = None
+) -> None:
+    global _worker_parser
+    _worker_parser = _build_parser(backend, memo_options, sections)
+
+def _parse_in_worker(
+    html: str, keyword: str, page_number: int, url: str
+) -> Tuple[ParsedResult, Dict[str, float]]:
+    assert _worker_parser is not None
+    record = _worker_parser.parse_result(html, keyword, page_number, url)
+    return record, _worker_parser.last_timings
+
+def _worker_context() -> Any:
+    """
+    Start method for parser processes.
+
+    The parent runs fetch threads and holds sessions and SQLite handles
+    when the pool starts, and forking a multithreaded process can leave a
+    child stuck on a lock some other thread held. Workers are therefore
+    started from a clean forkserver (or spawned where that is missing).
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+class ParseStage:
+    """
+    Parses fetched pages, optionally on a process pool.
+
+    With ``workers`` <= 0 pages are parsed inline, exactly like the serial
+    loop. Otherwise raw HTML is handed to a ``ProcessPoolExecutor`` and
+    records are yielded in input order. At most ``max_pending`` pages are
+    queued for parsing at a time (default ``workers * 2``); the outcomes
+    iterable is only pulled when there is room, so the fetcher upstream is
+    throttled instead of piling HTML up in memory.
+
+    Records are compact ``ParsedResult`` objects, which are also what
+    worker processes send back. Outcomes that carry a fetch error are
+    passed through with a ``None`` record, keeping their place in the
+    output order. A tree built while streaming the page (the outcome's
+    ``document``) is reused by the inline parser; worker processes are
+    sent the HTML only.
+
+    ``memo_options`` are ``ParseMemo`` keyword arguments; when given, every
+    parser (inline or one per worker process) gets its own memo store.
+    An on-disk tier is shared between processes through SQLite.
+    ``sections`` restricts every parser to those extractors, as in
+    ``BingSearchParser``.
+
+    With ``metrics`` (a ``RunMetrics``), per-page parse time and the
+    parser's per-section timings are recorded in the consuming process,
+    including timings measured inside worker processes.
+
+    ``map`` may be called from several threads at once. With
+    ``persistent`` the process pool is started on first use and kept
+    (warm) across ``map`` calls until ``close``; otherwise every call
+    starts and stops its own.
+    """
+
+    def __init__(
+        self,
+        backend: str = "html.parser",
+        workers: int = 0,
+        max_pending: Optional[int] = None,
+        memo_options: Optional[Dict[str, Any]] = None,
+        metrics: Optional[Any] = None,
+        persistent: bool = False,
+        sections: Optional[Iterable[str]] = None,
+    ) -> None:
+        # Built eagerly so an unknown backend or section fails here, not in a worker.
+        self.parser = _build_parser(backend, memo_options, sections)
+        self.backend = backend
+        self.memo_options = memo_options
+        self.metrics = metrics
+        self.workers = max(0, int(workers))
+        if max_pending is None:
+            max_pending = self.workers * 2
+        self.max_pending = max(1, int(max_pending))
+        self.persistent = persistent
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Guards the inline parser, whose memo and timings are per call.
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=_worker_context(),
+            initializer=_init_worker,
+            initargs=(self.backend, self.memo_options, self.parser.sections),
+        )
+
+    @contextmanager
+    def _pool(self) -> Iterator[ProcessPoolExecutor]:
+        if not self.persistent:
+            with self._new_executor() as executor:
+                yield executor
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+        yield self._executor
+
+    def map(self, outcomes: Iterable[Any]) -> Iterator[Tuple[Any, Optional[ParsedResult]]]:
+        if self.workers <= 0:
+            for outcome in outcomes:
+                if outcome.error is not None:
+                    yield outcome, None
+                    continue
+                task = outcome.task
+                with self._lock:
+                    record = self.parser.parse_result(
+                        outcome.html, task.keyword, task.page_number, task.url, document=outcome.document
+                    )
+                    timings = self.parser.last_timings
+                self._observe(timings)
+                yield outcome, record
+            return
+
+        logger.debug(
+            "Parsing with %d process(es), up to %d page(s) queued",
+            self.workers,
+            self.max_pending,
+        )
+
+        pending: Deque[Tuple[Any, Optional[Future]]] = deque()
+        with self._pool() as executor:
+            try:
+                for outcome in outcomes:
+                    future = None
+                    if outcome.error is None:
+                        task = outcome.task
+                        future = executor.submit(
+                            _parse_in_worker, outcome.html, task.keyword, task.page_number, task.url
+                        )
+                    pending.append((outcome, future))
+                    if len(pending) >= self.max_pending:
+                        yield self._resolve(*pending.popleft())
+                while pending:
+                    yield self._resolve(*pending.popleft())
+            finally:
+                for _, future in pending:
+                    if future is not None:
+                        future.cancel()
+
+    def _resolve(self, outcome: Any, future: Optional[Future]) -> Tuple[Any, Optional[ParsedResult]]:
+        if future is None:
+            return outcome, None
+        record, timings = future.result()
+        self._observe(timings)
+        return outcome, record
+
+    def _observe(self, timings: Dict[str, float]) -> None:
+        if self.metrics is None:
+            return
+        self.metrics.inc("pages_parsed_total")
+        self.metrics.observe("stage_seconds", sum(timings.values()), stage="parse")
+        for section, seconds in timings.items():
+            self.metrics.observe("section_seconds", seconds, section=section)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.parser.memo is not None:
+            self.parser.memo.close()
@@ -0,0 +1,186 @@
+import sys
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, Type, Union
+
+class OrganicResult(NamedTuple):
+    title: str
+    url: str
+    description: str
+
+class RelatedQuery(NamedTuple):
+    text: str
+    url: str
+
+class PeopleAlsoAsk(NamedTuple):
+    question: str
+    answer: str
+
+class ImageResult(NamedTuple):
+    url: str
+    description: str
+
+class VideoResult(NamedTuple):
+    url: str
+    title: str
+    views: str
+    channel: str
+    provider: str
+
+class NewsResult(NamedTuple):
+    headline: str
+    url: str
+    source: str
+
+class WikiResult(NamedTuple):
+    title: str
+    description: str
+    url: str
+
+# Record key -> (ParsedResult attribute, item type) for every list section.
+LIST_SECTIONS: Dict[str, Tuple[str, Type[Any]]] = {
+    "organicResults": ("organic_results", OrganicResult),
+    "relatedQueries": ("related_queries", RelatedQuery),
+    "peopleAlsoAsk": ("people_also_ask", PeopleAlsoAsk),
+    "images": ("images", ImageResult),
+    "videos": ("videos", VideoResult),
+    "news": ("news", NewsResult),
+}
+
+# Section name (as used by --sections and parser timings) -> record key.
+SECTION_KEYS: Dict[str, str] = {
+    "organic": "organicResults",
+    "related": "relatedQueries",
+    "paa": "peopleAlsoAsk",
+    "images": "images",
+    "videos": "videos",
+    "news": "news",
+    "wiki": "wikiResults",
+}
+
+def parse_sections(value: Union[str, Iterable[str], None]) -> Optional[Tuple[str, ...]]:
+    """
+    Validates a section selection ("organic,news" or a list of names).
+
+    Returns the names in canonical order, or None (every section) for an
+    empty selection.
+    """
+    if value is None:
+        return None
+    names = value.split(",") if isinstance(value, str) else list(value)
+    requested = {name.strip() for name in names if name.strip()}
+    unknown = requested - set(SECTION_KEYS)
+    if unknown:
+        raise ValueError(
+            f"Unknown section(s) {', '.join(sorted(unknown))}; expected some of {', '.join(SECTION_KEYS)}"
+        )
+    if not requested or requested == set(SECTION_KEYS):
+        return None
+    return tuple(name for name in SECTION_KEYS if name in requested)
+
+class ParsedResult:
+    """
+    Compact in-memory form of one parsed page.
+
+    Sections are tuples of ``NamedTuple`` items, so a record carries no
+    per-item dicts or repeated key strings, and the keyword is interned
+    because every page of a job shares it. Records stay in this form
+    through parsing, worker hand-off and pagination checks; ``as_dict()``
+    builds the plain record the exporters expect.
+
+    ``parsed_sections`` names the sections that were extracted when the
+    parser ran on a subset (None means all); the others are left out of
+    ``sections()`` and ``as_dict()`` rather than reported as empty.
+    """
+
+    __slots__ = (
+        "url",
+        "keyword",
+        "page_number",
+        "organic_results",
+        "related_queries",
+        "people_also_ask",
+        "images",
+        "videos",
+        "news",
+        "wiki_results",
+        "parsed_sections",
+    )
+
+    def __init__(
+        self,
+        url: str,
+        keyword: str,
+        page_number: int,
+        organic_results: Tuple[OrganicResult, ...] = (),
+        related_queries: Tuple[RelatedQuery, ...] = (),
+        people_also_ask: Tuple[PeopleAlsoAsk, ...] = (),
+        images: Tuple[ImageResult, ...] = (),
+        videos: Tuple[VideoResult, ...] = (),
+        news: Tuple[NewsResult, ...] = (),
+        wiki_results: Optional[WikiResult] = None,
+        parsed_sections: Optional[Tuple[str, ...]] = None,
+    ) -> None:
+        self.url = url
+        self.keyword = sys.intern(keyword)
+        self.page_number = page_number
+        self.organic_results = organic_results
+        self.related_queries = related_queries
+        self.people_also_ask = people_also_ask
+        self.images = images
+        self.videos = videos
+        self.news = news
+        self.wiki_results = wiki_results
+        self.parsed_sections = parsed_sections
+
+    @classmethod
+    def from_sections(
+        cls,
+        url: str,
+        keyword: str,
+        page_number: int,
+        sections: Dict[str, Any],
+        parsed_sections: Optional[Tuple[str, ...]] = None,
+    ) -> "ParsedResult":
+        """Builds a result from extractor output or a memoized sections dict."""
+        items = {
+            attr: tuple(item_type(**item) for item in sections.get(key) or ())
+            for key, (attr, item_type) in LIST_SECTIONS.items()
+        }
+        wiki = sections.get("wikiResults")
+        return cls(
+            url,
+            keyword,
+            page_number,
+            wiki_results=WikiResult(**wiki) if wiki else None,
+            parsed_sections=parsed_sections,
+            **items,
+        )
+
+    def sections(self) -> Dict[str, Any]:
+        """Plain-dict sections, without the per-page url/keyword/pageNumber."""
+        record = {
+            key: [item._asdict() for item in getattr(self, attr)] for key, (attr, _) in LIST_SECTIONS.items()
+        }
+        record["wikiResults"] = self.wiki_results._asdict() if self.wiki_results else None
+        if self.parsed_sections is not None:
+            kept = {SECTION_KEYS[name] for name in self.parsed_sections}
+            record = {key: value for key, value in record.items() if key in kept}
+        return record
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"url": self.url, "keyword": self.keyword, "pageNumber": self.page_number, **self.sections()}
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+        self.keyword = sys.intern(self.keyword)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ParsedResult):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    def __repr__(self) -> str:
+        return f"ParsedResult(keyword={self.keyword!r}, page_number={self.page_number}, url={self.url!r})"
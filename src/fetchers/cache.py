@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger("response_cache")
+
+# read-write: serve hits and store misses; read-only: serve hits, never store;
+# refresh: always refetch and overwrite; off: bypass the cache entirely.
+CACHE_MODES = ("read-write", "read-only", "refresh", "off")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+def normalize_url(url: str) -> str:
+    """
+    Canonicalizes a URL for use as a cache key.
+
+    Scheme and host are lower-cased, default ports and fragments are
+    dropped, and query parameters are sorted so equivalent URLs built in a
+    different order share an entry.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+def cache_key(url: str, user_agent: str) -> str:
+    return hashlib.sha256(f"{user_agent}\n{normalize_url(url)}".encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    On-disk cache of fetched HTML, keyed by normalized URL plus user agent.
+
+    Bodies are zlib-compressed and kept in a SQLite file under
+    ``directory``. Entries older than ``ttl`` seconds are treated as misses,
+    and once the compressed total exceeds ``max_bytes`` the least recently
+    used entries are evicted. Safe to share between fetch threads.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = 86400,
+        max_bytes: int = 512 * 1024 * 1024,
+        mode: str = "read-write",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}; expected one of {', '.join(CACHE_MODES)}")
+        self.ttl = float(ttl)
+        self.max_bytes = int(max_bytes)
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "responses.sqlite3")
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+            """
+        )
+
+    def get(self, url: str, user_agent: str) -> Optional[str]:
+        """Returns the cached HTML for ``url``, or None on a miss."""
+        if self.mode in ("refresh", "off"):
+            return None
+
+        key = cache_key(url, user_agent)
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None and self.mode == "read-write":
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            if self.mode == "read-write":
+                self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                self._db.commit()
+            self.hits += 1
+
+        logger.debug("Cache hit for %s", url)
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, url: str, user_agent: str, html: str) -> None:
+        """Stores ``html`` for ``url`` and evicts LRU entries over ``max_bytes``."""
+        if self.mode in ("read-only", "off"):
+            return
+
+        body = zlib.compress(html.encode("utf-8"))
+        if len(body) > self.max_bytes:
+            logger.debug("Not caching %s: %d bytes exceeds cache size", url, len(body))
+            return
+
+        key = cache_key(url, user_agent)
+        now = self._clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, body, len(body), now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        logger.debug("Evicted %d cache entr(ies)", len(victims))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+        logger.info("Response cache: %d hit(s), %d miss(es)", self.hits, self.misses)
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,81 @@
+import logging
+from typing import Dict, Iterable, Set
+
+from .pool import PageTask
+
+logger = logging.getLogger("pagination")
+
+class PaginationPolicy:
+    """
+    Stops paginating a job once Bing runs out of results.
+
+    A job stops after a page with no organic results, or whose result URLs
+    overlap the previous page's by at least ``overlap_threshold`` - Bing
+    repeats its last page for long-tail keywords instead of returning
+    nothing. The page that triggers the stop is still kept; later pages
+    are not requested, and any that were already in flight are dropped.
+    ``skipped_pages`` counts the cut pages that were never requested, and
+    ``dropped_pages`` those fetched ahead of the stop and thrown away.
+
+    Jobs are announced with ``start_job`` as they are scheduled, and their
+    outcomes must be observed in page order, which is how
+    ``ConcurrentFetcher`` yields them. A job's previous-page URLs are
+    dropped once its last page is seen; stopped jobs keep only the range
+    of pages they cut.
+    """
+
+    def __init__(self, overlap_threshold: float = 0.8) -> None:
+        self.overlap_threshold = float(overlap_threshold)
+        self.skipped_pages = 0
+        self.dropped_pages = 0
+        self.stopped_at: Dict[int, range] = {}
+        self._pages: Dict[int, int] = {}
+        self._previous: Dict[int, Set[str]] = {}
+
+    def start_job(self, job_index: int, pages: int) -> None:
+        self._pages[job_index] = pages
+
+    def is_stopped(self, job_index: int) -> bool:
+        return job_index in self.stopped_at
+
+    def cut_pages(self, job_index: int) -> range:
+        """Pages of a stopped job that are skipped."""
+        return self.stopped_at.get(job_index, range(0))
+
+    def discard(self, task: PageTask) -> None:
+        """Accounts for a page whose fetch failed; past a stop it was requested all the same."""
+        if task.job_index in self.stopped_at:
+            self._drop()
+
+    def _drop(self) -> None:
+        self.skipped_pages -= 1
+        self.dropped_pages += 1
+
+    def observe(self, task: PageTask, result_urls: Iterable[str]) -> bool:
+        """Feeds a page's organic result URLs in; returns False when it should be dropped."""
+        if task.job_index in self.stopped_at:
+            self._drop()
+            return False
+
+        pages = self._pages.get(task.job_index, task.page_number)
+        urls = {url for url in result_urls if url}
+        previous = self._previous.pop(task.job_index, None)
+
+        if not urls:
+            reason = "no organic results"
+        elif previous and len(urls & previous) / len(urls) >= self.overlap_threshold:
+            reason = "results repeat the previous page"
+        elif task.page_number < pages:
+            self._previous[task.job_index] = urls
+            return True
+        else:
+            reason = None
+
+        self._pages.pop(task.job_index, None)
+        if reason is not None and task.page_number < pages:
+            self.stopped_at[task.job_index] = range(task.page_number + 1, pages + 1)
+            self.skipped_pages += pages - task.page_number
+            logger.info(
+                "Stopping '%s' after page %d of %d: %s", task.keyword, task.page_number, pages, reason
+            )
+        return True
@@ -0,0 +1,171 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, TypeVar, Union
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("fetch_pool")
+
+T = TypeVar("T")
+
+@dataclass
+class PageTask:
+    job_index: int
+    keyword: str
+    page_number: int
+    url: str
+
+@dataclass
+class FetchedPage:
+    """A streamed page: its (possibly truncated) HTML and the tree built while reading it."""
+
+    html: str
+    document: Any = None
+
+@dataclass
+class FetchOutcome:
+    task: PageTask
+    html: Optional[str] = None
+    error: Optional[Exception] = None
+    document: Any = None
+
+class HostLimiter:
+    """
+    Caps the number of in-flight requests per host.
+
+    One bounded semaphore is created lazily for every host seen.
+    """
+
+    def __init__(self, per_host_limit: int) -> None:
+        self.per_host_limit = max(1, int(per_host_limit))
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    def _semaphore_for(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        semaphore = self._semaphore_for(url)
+        semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+class InFlightRequests:
+    """
+    Shares one call between identical keys requested at the same time.
+
+    The first caller for a key runs the call; callers arriving while it is
+    still running wait for and receive the same result (or exception).
+    Nothing is kept once the call finishes.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def run(self, key: str, call: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            logger.debug("Joining in-flight request for %s", key)
+            return future.result()
+
+        try:
+            result = call()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+class ConcurrentFetcher:
+    """
+    Runs a fetch function over page tasks on a thread pool.
+
+    Outcomes are yielded in the same order as the tasks were given, so
+    callers see exactly the sequence the serial loop would produce. At most
+    ``concurrency * 2`` tasks are scheduled ahead of the consumer, and the
+    tasks iterable is consumed lazily.
+
+    Tasks for a URL that is already being fetched wait for that fetch
+    instead of issuing their own, and each gets its own outcome carrying
+    the shared HTML.
+
+    ``fetch`` returns either the HTML or a ``FetchedPage``, whose tree is
+    passed on as the outcome's ``document``.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Union[str, FetchedPage]],
+        concurrency: int = 1,
+        per_host_limit: int = 4,
+    ) -> None:
+        self.fetch = fetch
+        self.concurrency = max(1, int(concurrency))
+        self.host_limiter = HostLimiter(per_host_limit)
+        self.in_flight = InFlightRequests()
+
+    def _fetch(self, url: str) -> Union[str, FetchedPage]:
+        with self.host_limiter.slot(url):
+            return self.fetch(url)
+
+    def _run(self, task: PageTask) -> FetchOutcome:
+        try:
+            page = self.in_flight.run(task.url, lambda: self._fetch(task.url))
+        except Exception as exc:
+            return FetchOutcome(task=task, error=exc)
+        if isinstance(page, FetchedPage):
+            return FetchOutcome(task=task, html=page.html, document=page.document)
+        return FetchOutcome(task=task, html=page)
+
+    def map(self, tasks: Iterable[PageTask]) -> Iterator[FetchOutcome]:
+        if self.concurrency <= 1:
+            for task in tasks:
+                yield self._run(task)
+            return
+
+        window = self.concurrency * 2
+        logger.debug(
+            "Fetching with %d worker(s), %d per host",
+            self.concurrency,
+            self.host_limiter.per_host_limit,
+        )
+
+        pending: Deque[Future] = deque()
+        task_iter = iter(tasks)
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="fetch"
+        ) as executor:
+            try:
+                for task in task_iter:
+                    pending.append(executor.submit(self._run, task))
+                    if len(pending) >= window:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
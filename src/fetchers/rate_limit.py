@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger("rate_limit")
+
+# Statuses that mean "slow down".
+THROTTLE_STATUSES = frozenset({429, 503})
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket in front of every request, with an AIMD-adjusted rate.
+
+    ``acquire()`` reserves the next send slot (the GCRA form of a token
+    bucket holding up to ``burst`` tokens) and sleeps until it arrives, so
+    concurrent fetch threads share one request rate.
+
+    The rate starts at ``rate`` requests per second and adapts:
+    - every successful response adds ``additive_increase / rate``, which is
+      roughly ``additive_increase`` req/s per second of clean traffic;
+    - a 429/503 multiplies it by ``decrease_factor``, and a Retry-After
+      pauses all requests until it expires;
+    - when the smoothed latency exceeds ``latency_ratio`` times the fastest
+      response seen, the rate is multiplied by ``latency_decrease_factor``.
+    Decreases are applied at most once per ``cooldown`` seconds so a burst of
+    throttled responses counts as one signal. The rate stays within
+    [``min_rate``, ``max_rate``].
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = 0.2,
+        max_rate: float = 50.0,
+        burst: int = 1,
+        additive_increase: float = 0.5,
+        decrease_factor: float = 0.5,
+        latency_ratio: float = 3.0,
+        latency_decrease_factor: float = 0.9,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        on_rate_change: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.min_rate = float(min_rate)
+        self.max_rate = max(float(max_rate), self.min_rate)
+        self.rate = min(max(float(rate), self.min_rate), self.max_rate)
+        self.burst = max(1, int(burst))
+        self.additive_increase = float(additive_increase)
+        self.decrease_factor = float(decrease_factor)
+        self.latency_ratio = float(latency_ratio)
+        self.latency_decrease_factor = float(latency_decrease_factor)
+        self.cooldown = float(cooldown)
+        self._clock = clock
+        self._sleep = sleep
+        self._on_rate_change = on_rate_change
+        self._lock = threading.Lock()
+
+        self._next_slot = clock()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._latency_ewma: Optional[float] = None
+        self._latency_floor: Optional[float] = None
+        self._latency_samples = 0
+
+    def acquire(self) -> float:
+        """Blocks until a request may be sent; returns the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            interval = 1.0 / self.rate
+            # Idle time refills the bucket, but never beyond ``burst`` tokens.
+            earliest = max(self._next_slot, now - (self.burst - 1) * interval, self._paused_until)
+            self._next_slot = earliest + interval
+            wait = max(0.0, earliest - now)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def on_response(self, status: int, latency: float, retry_after: Optional[float] = None) -> None:
+        """Feeds one response back into the rate."""
+        if status in THROTTLE_STATUSES:
+            self.on_throttle(retry_after, reason=f"HTTP {status}")
+            return
+
+        with self._lock:
+            self._latency_samples += 1
+            self._latency_floor = latency if self._latency_floor is None else min(self._latency_floor, latency)
+            self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+            congested = (
+                self._latency_samples >= 5
+                and self._latency_floor > 0
+                and self._latency_ewma > self.latency_ratio * self._latency_floor
+            )
+        if congested:
+            self._decrease(self.latency_decrease_factor, "latency")
+        else:
+            self._set_rate(self.rate + self.additive_increase / self.rate, "success")
+
+    def on_throttle(self, retry_after: Optional[float] = None, reason: str = "throttled") -> None:
+        if retry_after:
+            with self._lock:
+                self._paused_until = max(self._paused_until, self._clock() + retry_after)
+            logger.info("Pausing requests for %.1fs (Retry-After)", retry_after)
+        self._decrease(self.decrease_factor, reason)
+
+    def _decrease(self, factor: float, reason: str) -> None:
+        with self._lock:
+            now = self._clock()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+        self._set_rate(self.rate * factor, reason)
+
+    def _set_rate(self, rate: float, reason: str) -> None:
+        with self._lock:
+            old = self.rate
+            self.rate = min(max(rate, self.min_rate), self.max_rate)
+            new = self.rate
+        if new == old:
+            return
+        if new < old:
+            logger.info("Request rate lowered to %.2f/s (%s)", new, reason)
+        else:
+            logger.debug("Request rate raised to %.2f/s", new)
+        if self._on_rate_change is not None:
+            self._on_rate_change(new)
@@ -0,0 +1,264 @@
+import codecs
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .rate_limit import AdaptiveRateLimiter
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from telemetry.metrics import RunMetrics
+
+logger = logging.getLogger("transport")
+
+T = TypeVar("T")
+
+# Statuses worth another attempt; anything else in the 4xx range fails fast.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Statuses whose Retry-After header we honour when present.
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+class RetryableHTTPError(requests.HTTPError):
+    """Raised for responses that should be retried after a delay."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, **kwargs) -> None:
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Parses a Retry-After header into a number of seconds.
+
+    Both the delta-seconds and the HTTP-date forms are supported. Returns
+    None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+def _text_decoder(encoding: Optional[str]) -> Any:
+    """Incremental decoder matching ``Response.text``: undecodable bytes become U+FFFD."""
+    try:
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+class HttpTransport:
+    """
+    Pooled, keep-alive HTTP transport shared by every fetch in a run.
+
+    Wraps a single ``requests.Session`` so TCP/TLS connections are reused,
+    negotiates gzip (and brotli when a decoder is installed), and retries
+    with exponential backoff plus full jitter. ``Retry-After`` on 429/503
+    responses takes precedence over the computed backoff and is honoured
+    in full, even beyond ``backoff_max``; a response asking for more than
+    ``retry_after_max`` seconds is not retried at all.
+
+    With ``metrics``, every attempt's latency, status and body size and
+    every retry are recorded.
+
+    With ``rate_limiter``, every attempt (retries included) first waits for
+    a send slot, and its status and latency are fed back so the limiter can
+    adapt the shared request rate; the current rate is exported as the
+    ``request_rate`` gauge.
+
+    ``fetch_stream`` reads the body in chunks and hands the decoded text
+    to a document as it arrives; once the document has what it needs the
+    connection is dropped without reading the rest, which is counted in
+    ``fetch_aborted_total``.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        pool_size: int = 10,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_after_max: float = 300.0,
+        sleep: Callable[[float], None] = time.sleep,
+        metrics: Optional["RunMetrics"] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    ) -> None:
+        self.pool_size = max(1, int(pool_size))
+        self.backoff_base = float(backoff_base)
+        self.backoff_max = float(backoff_max)
+        self.retry_after_max = float(retry_after_max)
+        self._sleep = sleep
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self._report_rate()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=0,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {
+                "User-Agent": user_agent,
+                # urllib3 only advertises "br" when a brotli decoder is importable.
+                "Accept-Encoding": ACCEPT_ENCODING,
+            }
+        )
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Returns how long to wait before retry number ``attempt`` (1-based)."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def _report_rate(self) -> None:
+        if self.metrics is not None and self.rate_limiter is not None:
+            self.metrics.set_gauge("request_rate", self.rate_limiter.rate)
+
+    def get(self, url: str, timeout: float, stream: bool = False) -> requests.Response:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        started = time.perf_counter()
+        try:
+            resp = self.session.get(url, timeout=timeout, stream=stream)
+        except requests.RequestException:
+            if self.metrics is not None:
+                self.metrics.inc("http_requests_total", status="error")
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle(reason="request error")
+                self._report_rate()
+            raise
+        latency = time.perf_counter() - started
+        if self.metrics is not None:
+            self.metrics.observe("http_request_seconds", latency)
+            self.metrics.inc("http_requests_total", status=resp.status_code)
+            if not stream:
+                # Streamed bodies are counted as they are read.
+                self.metrics.inc("fetch_bytes_total", len(resp.content))
+        retry_after = None
+        if resp.status_code in RETRY_AFTER_STATUSES:
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_response(resp.status_code, latency, retry_after)
+            self._report_rate()
+        if stream and resp.status_code >= 400:
+            # Nobody reads an error body; hand the connection back now.
+            resp.close()
+        if resp.status_code in RETRYABLE_STATUSES:
+            raise RetryableHTTPError(
+                f"{resp.status_code} response for {url}",
+                retry_after=retry_after,
+                response=resp,
+            )
+        resp.raise_for_status()
+        return resp
+
+    def fetch_text(self, url: str, timeout: float, max_retries: int) -> str:
+        return self._with_retries(url, max_retries, lambda: self.get(url, timeout).text)
+
+    def fetch_stream(
+        self,
+        url: str,
+        timeout: float,
+        max_retries: int,
+        open_document: Callable[[], Any],
+        chunk_size: int = 16384,
+    ) -> Any:
+        """
+        Streams ``url`` into a document from ``open_document``.
+
+        The document gets decoded text through ``feed``, which returns True
+        to stop reading; ``close`` is called once reading ends. Every retry
+        starts over with a fresh document, which is returned.
+        """
+
+        def read() -> Any:
+            resp = self.get(url, timeout, stream=True)
+            document = open_document()
+            decoder = _text_decoder(resp.encoding)
+            received = 0
+            aborted = False
+            try:
+                for chunk in resp.iter_content(chunk_size):
+                    received += len(chunk)
+                    if document.feed(decoder.decode(chunk)):
+                        aborted = True
+                        break
+                else:
+                    document.feed(decoder.decode(b"", final=True))
+            finally:
+                resp.close()
+                if self.metrics is not None:
+                    self.metrics.inc("fetch_bytes_total", received)
+            if aborted:
+                logger.debug("Stopped reading %s after %d bytes", url, received)
+                if self.metrics is not None:
+                    self.metrics.inc("fetch_aborted_total")
+            document.close()
+            return document
+
+        return self._with_retries(url, max_retries, read)
+
+    def _with_retries(self, url: str, max_retries: int, attempt_fetch: Callable[[], T]) -> T:
+        max_retries = max(1, int(max_retries))
+        last_exc: Exception | None = None
+
+        for attempt in range(1, max_retries + 1):
+            try:
+                logger.debug("Requesting URL (attempt %d/%d): %s", attempt, max_retries, url)
+                return attempt_fetch()
+            except RetryableHTTPError as exc:
+                last_exc = exc
+                retry_after = exc.retry_after
+                if retry_after is not None and retry_after > self.retry_after_max:
+                    logger.warning(
+                        "Giving up on %s: server asked to wait %.0fs (retry_after_max is %.0fs)",
+                        url,
+                        retry_after,
+                        self.retry_after_max,
+                    )
+                    raise
+            except requests.HTTPError as exc:
+                # Non-retryable status (404, 403, ...): retrying would not help.
+                logger.warning("Request attempt %d failed: %s", attempt, exc)
+                raise
+            except requests.RequestException as exc:
+                last_exc = exc
+                retry_after = None
+
+            logger.warning("Request attempt %d failed: %s", attempt, last_exc)
+            if attempt < max_retries:
+                if self.metrics is not None:
+                    self.metrics.inc("fetch_retries_total")
+                delay = self.backoff_delay(attempt, retry_after)
+                logger.debug("Backing off %.2fs before retrying %s", delay, url)
+                self._sleep(delay)
+
+        assert last_exc is not None
+        raise last_exc
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,129 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("input")
+
+# File suffixes read one job per line/row instead of as a single document.
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+CSV_SUFFIXES = (".csv",)
+
+def keyword_key(keyword: str) -> str:
+    """Case- and whitespace-insensitive identity of a keyword."""
+    return " ".join(keyword.split()).casefold()
+
+def shard_of(keyword: str, shard_count: int) -> int:
+    """Stable shard number in [0, shard_count) for a keyword, the same on every machine."""
+    digest = hashlib.blake2b(keyword_key(keyword).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parses an 'i/N' shard spec (0 <= i < N) into (i, N)."""
+    try:
+        index_text, count_text = value.split("/")
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise ValueError(f"Shard must look like 'i/N', got {value!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in [0, {count}), got {value!r}")
+    return index, count
+
+def select_shard(jobs: Iterable[Dict[str, Any]], index: int, count: int) -> Iterator[Dict[str, Any]]:
+    """Yields the jobs that belong to shard ``index`` of ``count``."""
+    for job in jobs:
+        if shard_of(job["keyword"], count) == index:
+            yield job
+
+def normalize_job(job: Any, where: str) -> Optional[Dict[str, Any]]:
+    """Validates one raw job; returns None (after a warning) when it is unusable."""
+    if not isinstance(job, dict):
+        logger.warning("Skipping non-object job entry at %s: %r", where, job)
+        return None
+    keyword = job.get("keyword")
+    if not keyword or not str(keyword).strip():
+        logger.warning("Skipping job without 'keyword' at %s: %r", where, job)
+        return None
+    pages = job.get("pages")
+    try:
+        pages = int(pages) if pages not in (None, "") else 1
+    except (TypeError, ValueError):
+        logger.warning("Skipping job with invalid 'pages' at %s: %r", where, job)
+        return None
+    return {"keyword": str(keyword), "pages": max(1, pages)}
+
+def document_jobs(payload: Any) -> List[Any]:
+    """Raw jobs of a JSON document: a list of jobs, ``{"queries": [...]}`` or a single job object."""
+    if isinstance(payload, list):
+        # Assume already a list of job dicts
+        return payload
+    if isinstance(payload, dict):
+        if "queries" in payload and isinstance(payload["queries"], list):
+            return payload["queries"]
+        # Single job dict
+        return [payload]
+    raise ValueError("Input JSON must be an object or a list of objects.")
+
+class JobReader:
+    """
+    Lazily reads and validates jobs from an input file.
+
+    ``.jsonl``/``.ndjson`` files hold one job object per line and ``.csv``
+    files need a header with a ``keyword`` column (``pages`` is optional);
+    both are read a row at a time, so memory stays flat and the first job
+    is available immediately whatever the file size. Anything else is
+    parsed as a JSON document: a list of jobs, ``{"queries": [...]}`` or a
+    single job object.
+
+    Invalid rows are skipped with a warning naming their line. ``count`` is
+    the number of jobs yielded so far.
+    """
+
+    def __init__(self, path: str) -> None:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Input file {path} not found.")
+        self.path = path
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        suffix = os.path.splitext(self.path)[1].lower()
+        if suffix in JSON_LINES_SUFFIXES:
+            rows = self._json_lines()
+        elif suffix in CSV_SUFFIXES:
+            rows = self._csv_rows()
+        else:
+            rows = self._json_document()
+
+        for where, raw in rows:
+            job = normalize_job(raw, where)
+            if job is not None:
+                self.count += 1
+                yield job
+
+    def _json_lines(self) -> Iterator[Any]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                where = f"{self.path}:{line_number}"
+                try:
+                    yield where, json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping unreadable line at %s", where)
+
+    def _csv_rows(self) -> Iterator[Any]:
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            if "keyword" not in (reader.fieldnames or []):
+                raise ValueError(f"CSV input {self.path} needs a 'keyword' column.")
+            for row in reader:
+                yield f"{self.path}:{reader.line_num}", row
+
+    def _json_document(self) -> Iterator[Any]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+
+        for index, job in enumerate(document_jobs(payload)):
+            yield f"{self.path}[{index}]", job
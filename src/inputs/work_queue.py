@@ -0,0 +1,229 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger("work_queue")
+
+# Units inserted per transaction while loading, so claimers are never locked out for long.
+LOAD_BATCH = 500
+
+class WorkUnit(NamedTuple):
+    job_index: int
+    keyword: str
+    page_number: int
+
+class WorkQueue:
+    """
+    SQLite-backed queue of (keyword, page) units shared by worker processes.
+
+    The jobs are loaded once (``load`` is a no-op for every later caller),
+    then each worker ``claim``s pending units under a lease of
+    ``lease_seconds`` and marks them ``complete`` after writing their
+    records. A unit whose lease runs out - its worker died or hung - is
+    handed to the next claimer, and a unit whose fetch failed goes back to
+    pending until it has failed ``max_attempts`` times.
+
+    All state lives in one SQLite file, so workers can come and go at any
+    point; workers on several machines can share it over a filesystem with
+    working POSIX locks. Lease times use the wall clock of the claimer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        worker_id: str,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if lease_seconds <= 0:
+            raise ValueError(f"Lease must be positive, got {lease_seconds}")
+        self.path = path
+        self.worker_id = worker_id
+        self.lease_seconds = float(lease_seconds)
+        self.max_attempts = max(1, int(max_attempts))
+        self.claimed = 0
+        self.reclaimed = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Autocommit mode: every write below opens its own BEGIN IMMEDIATE.
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS units (
+                job_index INTEGER NOT NULL,
+                page_number INTEGER NOT NULL,
+                keyword TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (job_index, page_number)
+            );
+            CREATE INDEX IF NOT EXISTS units_state ON units (state, lease_expires);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._db, self._lock)
+
+    def load(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """
+        Adds a unit per page of every job unless the queue was loaded before; returns units added.
+
+        Units go in ``LOAD_BATCH`` at a time, each batch in its own short
+        transaction. Workers that start together may all load: units that
+        already exist are ignored, so the queue ends up complete even when
+        a loader dies halfway, and every ``load`` returns only once it is.
+        """
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM meta WHERE key = 'loaded'").fetchone():
+                return 0
+        added = 0
+        batch: List[Any] = []
+        for job_index, job in enumerate(jobs):
+            batch.extend((job_index, page, job["keyword"]) for page in range(1, job.get("pages", 1) + 1))
+            if len(batch) >= LOAD_BATCH:
+                added += self._insert_units(batch)
+                batch = []
+        added += self._insert_units(batch)
+        with self._transaction() as db:
+            db.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('loaded', ?)", (self.worker_id,))
+        logger.info("Loaded %d unit(s) into %s", added, self.path)
+        return added
+
+    def _insert_units(self, units: List[Any]) -> int:
+        if not units:
+            return 0
+        with self._transaction() as db:
+            return db.executemany(
+                "INSERT OR IGNORE INTO units (job_index, page_number, keyword) VALUES (?, ?, ?)", units
+            ).rowcount
+
+    def claim(self, limit: int) -> List[WorkUnit]:
+        """Leases up to ``limit`` pending or expired units, in input order."""
+        now = self._clock()
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT job_index, page_number, keyword, state FROM units "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires <= ?) "
+                "ORDER BY job_index, page_number LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            db.executemany(
+                "UPDATE units SET state = 'leased', worker = ?, lease_expires = ? "
+                "WHERE job_index = ? AND page_number = ?",
+                [(self.worker_id, now + self.lease_seconds, job, page) for job, page, _, _ in rows],
+            )
+        expired = sum(1 for row in rows if row[3] == "leased")
+        if expired:
+            logger.warning("Reclaimed %d unit(s) whose lease expired", expired)
+        self.claimed += len(rows)
+        self.reclaimed += expired
+        return [WorkUnit(job, keyword, page) for job, page, keyword, _ in rows]
+
+    def complete(self, job_index: int, page_number: int) -> bool:
+        """
+        Marks a unit this worker holds as done; returns False if it no longer holds it.
+
+        Once a lease has expired and another worker claimed the unit, that
+        worker owns it; the late completion is logged and changes nothing.
+        """
+        with self._transaction() as db:
+            updated = db.execute(
+                "UPDATE units SET state = 'done', lease_expires = NULL "
+                "WHERE job_index = ? AND page_number = ? AND state = 'leased' AND worker = ?",
+                (job_index, page_number, self.worker_id),
+            ).rowcount
+        if not updated:
+            logger.warning(
+                "Unit %d/%d was completed after its lease passed to another worker; its records may be duplicated",
+                job_index,
+                page_number,
+            )
+        return bool(updated)
+
+    def fail(self, job_index: int, page_number: int) -> None:
+        """Returns a unit whose fetch failed to the queue, or gives up on it after ``max_attempts``."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE units SET attempts = attempts + 1, lease_expires = NULL, "
+                "state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+                "WHERE job_index = ? AND page_number = ? AND worker = ?",
+                (self.max_attempts, job_index, page_number, self.worker_id),
+            )
+
+    def held(self) -> int:
+        """Number of units this worker has leased and not yet finished."""
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM units WHERE state = 'leased' AND worker = ?", (self.worker_id,)
+            ).fetchone()
+        return count
+
+    def has_open_units(self) -> bool:
+        """True while any unit is pending or leased by some worker."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM units WHERE state IN ('pending', 'leased') LIMIT 1"
+            ).fetchone()
+        return row is not None
+
+    def next_expiry(self) -> Optional[float]:
+        """Seconds until the earliest lease held elsewhere expires, or None when no other worker holds any."""
+        with self._lock:
+            (expires,) = self._db.execute(
+                "SELECT MIN(lease_expires) FROM units WHERE state = 'leased' AND worker != ?",
+                (self.worker_id,),
+            ).fetchone()
+        if expires is None:
+            return None
+        return max(0.0, expires - self._clock())
+
+    def counts(self) -> Dict[str, int]:
+        """Number of units in each state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall()
+        return dict(rows)
+
+    def job_count(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(DISTINCT job_index) FROM units").fetchone()
+        return count
+
+class _Transaction:
+    """Holds the write lock of the database file for a block of statements."""
+
+    def __init__(self, db: sqlite3.Connection, lock: threading.Lock) -> None:
+        self._db = db
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._db
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
@@ -1,27 +1,48 @@
-thonimport argparse
+from __future__ import annotations
+
+import argparse
 import json
 import logging
 import os
+import socket
 import sys
-from typing import Any, Dict, List
+import time
+from contextlib import ExitStack
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Tuple
 
 # Ensure local imports work when running as a script
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 if CURRENT_DIR not in sys.path:
     sys.path.insert(0, CURRENT_DIR)
 
-from extractors.bing_parser import BingSearchParser  # type: ignore
-from outputs.export_json import export_to_json  # type: ignore
-from outputs.export_csv import export_to_csv  # type: ignore
-from outputs.export_xlsx import export_to_xlsx  # type: ignore
+from extractors.backends import PARSER_BACKENDS  # type: ignore
+from extractors.records import SECTION_KEYS, parse_sections  # type: ignore
+from fetchers.cache import CACHE_MODES  # type: ignore
+from fetchers.pagination import PaginationPolicy  # type: ignore
+from fetchers.pool import FetchedPage, PageTask  # type: ignore
+from inputs.jobs import (  # type: ignore
+    JobReader,
+    document_jobs,
+    keyword_key,
+    normalize_job,
+    parse_shard,
+    select_shard,
+    shard_of,
+)
+from outputs.checkpoint import CheckpointJournal  # type: ignore
+from outputs.registry import OUTPUT_FORMATS, WRITERS, formats_for, load_writer  # type: ignore
 
-try:
-    import requests
-except ImportError as exc:  # pragma: no cover - import-time safety
-    raise SystemExit(
-        "The 'requests' package is required. Install dependencies with:\n"
-        "pip install -r requirements.txt"
-    ) from exc
+# Everything below pulls in requests, BeautifulSoup, openpyxl or http.server
+# and is imported where it is used, so --help and short runs start fast.
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from fetchers.cache import ResponseCache  # type: ignore
+    from fetchers.pool import ConcurrentFetcher  # type: ignore
+    from fetchers.rate_limit import AdaptiveRateLimiter  # type: ignore
+    from fetchers.transport import HttpTransport  # type: ignore
+    from inputs.work_queue import WorkQueue  # type: ignore
+    from service.api import ScrapeServer  # type: ignore
+    from telemetry.metrics import RunMetrics  # type: ignore
 
 DEFAULT_CONFIG_PATH = os.path.join(CURRENT_DIR, "config", "settings.example.json")
 DEFAULT_INPUT_PATH = os.path.join(os.path.dirname(CURRENT_DIR), "data", "input.sample.json")
@@ -46,6 +67,40 @@ def load_config(path: str) -> Dict[str, Any]:
         "max_retries": 2,
         "default_output_dir": DEFAULT_OUTPUT_DIR,
         "bing_base_url": "https://www.bing.com/search",
+        "concurrency": 1,
+        "per_host_limit": 4,
+        "pool_size": 10,
+        "backoff_base": 0.5,
+        "backoff_max": 30,
+        "retry_after_max": 300,
+        "rate_limit": None,
+        "rate_limit_min": 0.2,
+        "rate_limit_max": 20,
+        "early_stop": False,
+        "early_stop_overlap": 0.8,
+        "dedupe_jobs": False,
+        "shard": None,
+        "queue_path": None,
+        "queue_lease": 300,
+        "queue_max_attempts": 3,
+        "queue_poll": 1.0,
+        "worker_id": None,
+        "serve_host": "127.0.0.1",
+        "delta_index": None,
+        "parser_backend": "html.parser",
+        "parse_workers": 0,
+        "sections": None,
+        "stream_fetch": False,
+        "stream_chunk_size": 16384,
+        "parse_memo_size": 0,
+        "parse_memo_dir": None,
+        "parse_memo_max_bytes": 256 * 1024 * 1024,
+        "metrics_port": None,
+        "xlsx_section_sheets": False,
+        "cache_dir": None,
+        "cache_mode": "read-write",
+        "cache_ttl": 86400,
+        "cache_max_bytes": 512 * 1024 * 1024,
     }
 
     if not os.path.exists(path):
@@ -65,44 +120,45 @@ def load_config(path: str) -> Dict[str, Any]:
     return config
 
 def load_jobs(path: str) -> List[Dict[str, Any]]:
-    logger = logging.getLogger("input")
-
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Input file {path} not found.")
-
-    with open(path, "r", encoding="utf-8") as f:
-        payload = json.load(f)
+    """Reads every job from ``path``; see ``JobReader`` for the formats."""
+    jobs = list(JobReader(path))
+    if not jobs:
+        raise ValueError("No valid jobs found in input JSON.")
+    return jobs
 
-    jobs: List[Dict[str, Any]] = []
+def dedupe_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapses jobs whose keywords differ only in case or whitespace.
 
-    if isinstance(payload, list):
-        # Assume already a list of job dicts
-        jobs = payload
-    elif isinstance(payload, dict):
-        if "queries" in payload and isinstance(payload["queries"], list):
-            jobs = payload["queries"]
-        else:
-            # Single job dict
-            jobs = [payload]
-    else:
-        raise ValueError("Input JSON must be an object or a list of objects.")
+    "NYC pizza", "nyc  pizza" and "NYC Pizza " become one job, keeping the
+    first spelling (with whitespace collapsed), its position, and the
+    largest ``pages`` of the group.
+    """
+    logger = logging.getLogger("input")
 
-    normalized_jobs: List[Dict[str, Any]] = []
+    merged: Dict[str, Dict[str, Any]] = {}
     for job in jobs:
-        if not isinstance(job, dict):
-            logger.warning("Skipping non-object job entry: %r", job)
-            continue
-        keyword = job.get("keyword")
-        if not keyword:
-            logger.warning("Skipping job without 'keyword': %r", job)
-            continue
-        pages = int(job.get("pages", 1))
-        normalized_jobs.append({"keyword": str(keyword), "pages": max(1, pages)})
+        keyword = " ".join(job["keyword"].split())
+        key = keyword_key(keyword)
+        if key in merged:
+            merged[key]["pages"] = max(merged[key]["pages"], job["pages"])
+        else:
+            merged[key] = {**job, "keyword": keyword}
 
-    if not normalized_jobs:
-        raise ValueError("No valid jobs found in input JSON.")
+    if len(merged) < len(jobs):
+        logger.info("Collapsed %d duplicate job(s) into %d", len(jobs) - len(merged), len(merged))
+    return list(merged.values())
 
-    return normalized_jobs
+def output_base_name(
+    shard_spec: Tuple[int, int] | None = None, worker_id: str | None = None, delta: bool = False
+) -> str:
+    """File name stem of a run's outputs; shard runs, queue workers and delta runs get their own."""
+    name = "bing_results.delta" if delta else "bing_results"
+    if shard_spec is not None:
+        name += ".shard-{}-of-{}".format(*shard_spec)
+    if worker_id is not None:
+        name += f".worker-{worker_id}"
+    return name
 
 def build_bing_url(base_url: str, keyword: str, page_number: int) -> str:
     from urllib.parse import urlencode
@@ -114,92 +170,685 @@ def build_bing_url(base_url: str, keyword: str, page_number: int) -> str:
 
     return f"{base_url}?{urlencode(params)}"
 
+def iter_page_tasks(
+    jobs: Iterable[Dict[str, Any]],
+    base_url: str,
+    journal: CheckpointJournal | None = None,
+    pagination: PaginationPolicy | None = None,
+) -> Iterator[PageTask]:
+    logger = logging.getLogger("scraper")
+
+    for job_index, job in enumerate(jobs):
+        keyword: str = job["keyword"]
+        pages: int = job.get("pages", 1)
+
+        logger.info("Processing keyword '%s' (%d page(s))", keyword, pages)
+        if pagination is not None:
+            pagination.start_job(job_index, pages)
+
+        for page_number in range(1, pages + 1):
+            if pagination is not None and pagination.is_stopped(job_index):
+                break
+            if journal is not None and journal.is_done(keyword, page_number):
+                logger.debug("Skipping completed page %d of '%s'", page_number, keyword)
+                continue
+            url = build_bing_url(base_url, keyword, page_number)
+            yield PageTask(
+                job_index=job_index,
+                keyword=keyword,
+                page_number=page_number,
+                url=url,
+            )
+
+def iter_queue_tasks(work_queue: WorkQueue, base_url: str, batch: int, poll: float) -> Iterator[PageTask]:
+    """
+    Claims units from ``work_queue`` and yields them as page tasks.
+
+    Stops once nothing is claimable and this worker holds no unfinished
+    units; the caller then drains its pipeline and calls again while
+    ``work_queue.has_open_units()``. With nothing of its own in flight it
+    waits for leases held by other workers to finish or expire instead.
+    """
+    logger = logging.getLogger("scraper")
+    while True:
+        units = work_queue.claim(batch)
+        for unit in units:
+            yield PageTask(
+                job_index=unit.job_index,
+                keyword=unit.keyword,
+                page_number=unit.page_number,
+                url=build_bing_url(base_url, unit.keyword, unit.page_number),
+            )
+        if units:
+            continue
+        if work_queue.held():
+            return
+        wait = work_queue.next_expiry()
+        if wait is None:
+            return
+        logger.debug("Waiting for units leased by other workers (next lease ends in %.1fs)", wait)
+        time.sleep(min(wait, poll))
+
+def _http_transport_class() -> Any:
+    try:
+        from fetchers.transport import HttpTransport  # type: ignore
+    except ImportError as exc:  # pragma: no cover - import-time safety
+        raise SystemExit(
+            "The 'requests' package is required. Install dependencies with:\n"
+            "pip install -r requirements.txt"
+        ) from exc
+    return HttpTransport
+
 def fetch_bing_html(
-    url: str, user_agent: str, timeout: int, max_retries: int
-) -> str:
+    url: str,
+    user_agent: str,
+    timeout: int,
+    max_retries: int,
+    transport: HttpTransport | None = None,
+    cache: ResponseCache | None = None,
+    stream: Callable[[], Any] | None = None,
+    chunk_size: int = 16384,
+) -> str | FetchedPage:
+    """
+    Fetches a results page, from ``cache`` when it holds one.
+
+    With ``stream`` (a factory of incremental documents, see
+    ``BingSearchParser.stream_document``) the body is parsed while it
+    downloads and reading stops once the document has every section it
+    needs; the result is then a ``FetchedPage`` carrying the tree. Pages
+    cut short that way are not cached.
+    """
     logger = logging.getLogger("fetch")
-    headers = {"User-Agent": user_agent}
-
-    last_exc: Exception | None = None
-    for attempt in range(1, max_retries + 1):
-        try:
-            logger.debug("Requesting URL (attempt %d/%d): %s", attempt, max_retries, url)
-            resp = requests.get(url, headers=headers, timeout=timeout)
-            resp.raise_for_status()
-            return resp.text
-        except Exception as exc:  # pragma: no cover - network dependent
-            last_exc = exc
-            logger.warning("Request attempt %d failed: %s", attempt, exc)
-
-    error_message = f"Failed to fetch {url} after {max_retries} attempts"
-    logger.error("%s. Last error: %s", error_message, last_exc)
-    raise RuntimeError(error_message) from last_exc
+
+    if cache is not None:
+        cached = cache.get(url, user_agent)
+        if cached is not None:
+            return cached
+
+    if transport is None:
+        with _http_transport_class()(user_agent) as one_off:
+            return fetch_bing_html(url, user_agent, timeout, max_retries, one_off, cache, stream, chunk_size)
+
+    try:
+        if stream is not None:
+            document = transport.fetch_stream(url, timeout, max_retries, stream, chunk_size)
+        else:
+            html = transport.fetch_text(url, timeout, max_retries)
+    except Exception as exc:  # pragma: no cover - network dependent
+        error_message = f"Failed to fetch {url} after {max_retries} attempts"
+        logger.error("%s. Last error: %s", error_message, exc)
+        raise RuntimeError(error_message) from exc
+
+    if stream is not None:
+        if cache is not None and not document.done:
+            cache.put(url, user_agent, document.html)
+        return FetchedPage(document.html, document.root)
+    if cache is not None:
+        cache.put(url, user_agent, html)
+    return html
+
+def open_fetcher(
+    stack: ExitStack,
+    config: Dict[str, Any],
+    metrics: RunMetrics,
+    concurrency: int,
+    per_host_limit: int,
+    rate_limit: float | None = None,
+    cache_dir: str | None = None,
+    cache_mode: str = "read-write",
+    stream_document: Callable[[], Any] | None = None,
+) -> Tuple[ConcurrentFetcher, ResponseCache | None, AdaptiveRateLimiter | None]:
+    """
+    Builds the fetch side of the pipeline on ``stack``.
+
+    With ``stream_document`` pages are streamed into documents from that
+    factory (see ``fetch_bing_html``).
+
+    Returns the ``ConcurrentFetcher`` along with the response cache and rate
+    limiter it uses (None when disabled), whose counters callers report.
+    """
+    from fetchers.cache import ResponseCache  # type: ignore
+    from fetchers.pool import ConcurrentFetcher  # type: ignore
+    from fetchers.rate_limit import AdaptiveRateLimiter  # type: ignore
+
+    HttpTransport = _http_transport_class()
+    logger = logging.getLogger("scraper")
+    user_agent: str = config.get("user_agent")
+    timeout: int = int(config.get("timeout", 10))
+    max_retries: int = int(config.get("max_retries", 2))
+    pool_size: int = max(int(config.get("pool_size", 10)), concurrency)
+    chunk_size: int = int(config.get("stream_chunk_size", 16384))
+
+    rate_limiter = None
+    if rate_limit:
+        rate_limiter = AdaptiveRateLimiter(
+            rate_limit,
+            min_rate=float(config.get("rate_limit_min", 0.2)),
+            max_rate=float(config.get("rate_limit_max", 20)),
+        )
+        logger.info("Rate limiting requests, starting at %.2f/s", rate_limiter.rate)
+    transport = stack.enter_context(
+        HttpTransport(
+            user_agent,
+            pool_size=pool_size,
+            backoff_base=float(config.get("backoff_base", 0.5)),
+            backoff_max=float(config.get("backoff_max", 30)),
+            retry_after_max=float(config.get("retry_after_max", 300)),
+            metrics=metrics,
+            rate_limiter=rate_limiter,
+        )
+    )
+    cache = None
+    if cache_dir and cache_mode != "off":
+        cache = stack.enter_context(
+            ResponseCache(
+                cache_dir,
+                ttl=float(config.get("cache_ttl", 86400)),
+                max_bytes=int(config.get("cache_max_bytes", 512 * 1024 * 1024)),
+                mode=cache_mode,
+            )
+        )
+
+    def fetch_page(url: str) -> str | FetchedPage:
+        with metrics.time("stage_seconds", stage="fetch"):
+            page = fetch_bing_html(
+                url, user_agent, timeout, max_retries, transport, cache, stream_document, chunk_size
+            )
+        metrics.inc("pages_fetched_total")
+        return page
+
+    fetcher = ConcurrentFetcher(
+        fetch_page,
+        concurrency=concurrency,
+        per_host_limit=per_host_limit,
+    )
+    return fetcher, cache, rate_limiter
+
+def open_sinks(
+    stack: ExitStack,
+    output_format: str,
+    base_output_path: str,
+    xlsx_section_sheets: bool = False,
+    positions: Dict[str, Any] | None = None,
+    metrics: RunMetrics | None = None,
+) -> List[Any]:
+    """
+    Opens the streaming writers for the requested format on ``stack``.
+
+    ``positions`` maps output file names to the positions journaled by a
+    previous run; when given, each writer resumes from its entry. With
+    ``metrics``, the time each writer spends closing (XLSX saves the whole
+    workbook then) is recorded as an export stage.
+    """
+    writers: List[Any] = []
+    for name in formats_for(output_format):
+        writer_cls, suffix = load_writer(name)
+        options: Dict[str, Any] = {}
+        if name == "xlsx":
+            options["section_sheets"] = xlsx_section_sheets
+        writers.append((writer_cls, suffix, options))
+
+    sinks: List[Any] = []
+    for writer_cls, suffix, options in writers:
+        path = f"{base_output_path}{suffix}"
+        if positions is not None:
+            options["resume_from"] = positions.get(os.path.basename(path))
+        sink = writer_cls(path, **options)
+        stack.callback(_close_sink, sink, suffix[1:], metrics)
+        sinks.append(sink)
+    return sinks
+
+def _close_sink(sink: Any, output_format: str, metrics: RunMetrics | None) -> None:
+    if metrics is None:
+        sink.close()
+        return
+    with metrics.time("stage_seconds", stage="export_close", format=output_format):
+        sink.close()
 
 def run_scraper(
     config_path: str,
     input_path: str,
     output_format: str,
     output_dir: str | None = None,
+    concurrency: int | None = None,
+    per_host_limit: int | None = None,
+    parser_backend: str | None = None,
+    parse_workers: int | None = None,
+    sections: str | List[str] | None = None,
+    xlsx_section_sheets: bool | None = None,
+    cache_dir: str | None = None,
+    cache_mode: str | None = None,
+    resume: bool = False,
+    parse_memo_dir: str | None = None,
+    metrics_port: int | None = None,
+    rate_limit: float | None = None,
+    early_stop: bool | None = None,
+    dedupe: bool | None = None,
+    shard: str | None = None,
+    queue_path: str | None = None,
+    worker_id: str | None = None,
+    delta_index: str | None = None,
+    stream_fetch: bool | None = None,
 ) -> Dict[str, Any]:
     config = load_config(config_path)
-    jobs = load_jobs(input_path)
+    jobs: Iterator[Dict[str, Any]] = iter(JobReader(input_path))
+    first_job = next(jobs, None)
+    if first_job is None:
+        raise ValueError("No valid jobs found in input JSON.")
+    jobs = chain([first_job], jobs)
+    if dedupe is None:
+        dedupe = bool(config.get("dedupe_jobs", False))
+    if dedupe:
+        # Keeping the largest page count means seeing every job first.
+        jobs = iter(dedupe_jobs(list(jobs)))
+    if shard is None:
+        shard = config.get("shard")
+    shard_spec = parse_shard(shard) if shard else None
+    if shard_spec is not None:
+        jobs = select_shard(jobs, *shard_spec)
+
+    job_count = 0
+
+    def scheduled(source: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal job_count
+        for job in source:
+            job_count += 1
+            yield job
 
     if output_dir is None:
         output_dir = config.get("default_output_dir", DEFAULT_OUTPUT_DIR)
+    if concurrency is None:
+        concurrency = int(config.get("concurrency", 1))
+    if per_host_limit is None:
+        per_host_limit = int(config.get("per_host_limit", 4))
+    if parser_backend is None:
+        parser_backend = str(config.get("parser_backend", "html.parser"))
+    if parse_workers is None:
+        parse_workers = int(config.get("parse_workers", 0))
+    if sections is None:
+        sections = config.get("sections")
+    section_names = parse_sections(sections)
+    if xlsx_section_sheets is None:
+        xlsx_section_sheets = bool(config.get("xlsx_section_sheets", False))
+    if cache_dir is None:
+        cache_dir = config.get("cache_dir")
+    if cache_mode is None:
+        cache_mode = str(config.get("cache_mode", "read-write"))
+    if parse_memo_dir is None:
+        parse_memo_dir = config.get("parse_memo_dir")
+    parse_memo_size = int(config.get("parse_memo_size", 0))
+    if metrics_port is None and config.get("metrics_port") is not None:
+        metrics_port = int(config["metrics_port"])
+    if rate_limit is None and config.get("rate_limit") is not None:
+        rate_limit = float(config["rate_limit"])
+    if early_stop is None:
+        early_stop = bool(config.get("early_stop", False))
+    if early_stop and section_names is not None and "organic" not in section_names:
+        # Early stop compares organic results between pages.
+        logging.getLogger("scraper").warning("Early stop needs the organic section; fetching every page")
+        early_stop = False
+    if queue_path is None:
+        queue_path = config.get("queue_path")
+    if queue_path:
+        if worker_id is None:
+            worker_id = config.get("worker_id") or f"{socket.gethostname()}-{os.getpid()}"
+        if early_stop:
+            # The pages of one keyword are spread over several workers.
+            logging.getLogger("scraper").warning("Early stop is not supported in queue mode; fetching every page")
+            early_stop = False
+    else:
+        worker_id = None
+    if delta_index is None:
+        delta_index = config.get("delta_index")
+    if stream_fetch is None:
+        stream_fetch = bool(config.get("stream_fetch", False))
+    if delta_index:
+        from outputs.delta import DELTA_FORMATS  # type: ignore
+
+        unsupported = [fmt for fmt in formats_for(output_format) if fmt not in DELTA_FORMATS]
+        if unsupported:
+            raise ValueError(
+                f"Delta runs cannot write {', '.join(unsupported)}: the change annotations are per page; "
+                "use json or jsonl"
+            )
+
+    from extractors.parse_pool import ParseStage  # type: ignore
+    from telemetry.metrics import MetricsServer, RunMetrics, write_metrics_file  # type: ignore
 
     os.makedirs(output_dir, exist_ok=True)
 
-    parser = BingSearchParser()
+    memo_options = None
+    if parse_memo_size > 0 or parse_memo_dir:
+        memo_options = {
+            "max_entries": parse_memo_size,
+            "directory": parse_memo_dir,
+            "max_bytes": int(config.get("parse_memo_max_bytes", 256 * 1024 * 1024)),
+        }
+    metrics = RunMetrics()
+    parse_stage = ParseStage(
+        parser_backend, workers=parse_workers, memo_options=memo_options, metrics=metrics, sections=section_names
+    )
     bing_base_url: str = config.get("bing_base_url", "https://www.bing.com/search")
-    user_agent: str = config.get("user_agent")
-    timeout: int = int(config.get("timeout", 10))
-    max_retries: int = int(config.get("max_retries", 2))
 
-    all_results: List[Dict[str, Any]] = []
+    pagination = None
+    if early_stop:
+        pagination = PaginationPolicy(overlap_threshold=float(config.get("early_stop_overlap", 0.8)))
+
+    base_output_path = os.path.join(output_dir, output_base_name(shard_spec, worker_id, delta=bool(delta_index)))
+    record_count = 0
     logger = logging.getLogger("scraper")
 
-    for job in jobs:
-        keyword: str = job["keyword"]
-        pages: int = job.get("pages", 1)
+    with ExitStack() as stack:
+        if metrics_port is not None:
+            stack.enter_context(MetricsServer(metrics, metrics_port))
+        stack.callback(parse_stage.close)
+        journal = stack.enter_context(
+            CheckpointJournal(f"{base_output_path}.checkpoint.jsonl", resume=resume)
+        )
+        resumed_pages = len(journal.completed)
+        sinks = open_sinks(
+            stack,
+            output_format,
+            base_output_path,
+            xlsx_section_sheets=xlsx_section_sheets,
+            positions=journal.positions if resume else None,
+            metrics=metrics,
+        )
+        for sink in sinks:
+            if resumed_pages and os.path.basename(sink.path) not in journal.positions:
+                logger.warning(
+                    "%s was not part of the resumed run; it will lack %d earlier page(s)",
+                    sink.path,
+                    resumed_pages,
+                )
+        fetcher, cache, rate_limiter = open_fetcher(
+            stack,
+            config,
+            metrics,
+            concurrency=concurrency,
+            per_host_limit=per_host_limit,
+            rate_limit=rate_limit,
+            cache_dir=cache_dir,
+            cache_mode=cache_mode,
+            stream_document=parse_stage.parser.stream_document if stream_fetch else None,
+        )
 
-        logger.info("Processing keyword '%s' (%d page(s))", keyword, pages)
+        work_queue: WorkQueue | None = None
+        delta = None
+        if delta_index:
+            from outputs.delta import DeltaIndex  # type: ignore
 
-        for page_number in range(1, pages + 1):
-            url = build_bing_url(bing_base_url, keyword, page_number)
-            try:
-                html = fetch_bing_html(url, user_agent, timeout, max_retries)
-            except Exception as exc:  # pragma: no cover - network dependent
-                logger.error("Skipping page due to fetch error: %s", exc)
-                continue
+            delta = stack.enter_context(DeltaIndex(delta_index))
 
-            record = parser.parse(html, keyword, page_number, url)
-            all_results.append(record)
+        def process(tasks: Iterable[PageTask]) -> None:
+            nonlocal record_count
+            for outcome, record in parse_stage.map(fetcher.map(tasks)):
+                if outcome.error is not None:  # pragma: no cover - network dependent
+                    logger.error("Skipping page due to fetch error: %s", outcome.error)
+                    metrics.inc("fetch_failures_total")
+                    if pagination is not None:
+                        pagination.discard(outcome.task)
+                    if work_queue is not None:
+                        work_queue.fail(outcome.task.job_index, outcome.task.page_number)
+                    continue
+                if pagination is not None and not pagination.observe(
+                    outcome.task, [item.url for item in record.organic_results]
+                ):
+                    # Fetched ahead of the page that ended its job.
+                    continue
 
-    if not all_results:
-        raise RuntimeError("No results were collected. Check connectivity or input keywords.")
+                row: Dict[str, Any] | None = record.as_dict()
+                if delta is not None:
+                    # Unchanged pages are journaled but not written.
+                    row = delta.observe(row)
+                if row is not None:
+                    for sink in sinks:
+                        with metrics.time("stage_seconds", stage="export", format=os.path.splitext(sink.path)[1][1:]):
+                            sink.write(row)
+                journal.record(
+                    outcome.task.keyword,
+                    outcome.task.page_number,
+                    {os.path.basename(sink.path): sink.position() for sink in sinks},
+                )
+                if delta is not None:
+                    delta.commit(record.keyword, record.page_number)
+                if work_queue is not None:
+                    work_queue.complete(outcome.task.job_index, outcome.task.page_number)
+                record_count += 1
+
+                if pagination is not None and pagination.is_stopped(outcome.task.job_index):
+                    # Journal the cut pages so a resumed run does not fetch them either.
+                    for page_number in pagination.cut_pages(outcome.task.job_index):
+                        if not journal.is_done(outcome.task.keyword, page_number):
+                            journal.record(outcome.task.keyword, page_number, journal.positions)
 
-    base_output_path = os.path.join(output_dir, "bing_results")
+        if queue_path:
+            from inputs.work_queue import WorkQueue  # type: ignore
+
+            work_queue = stack.enter_context(
+                WorkQueue(
+                    queue_path,
+                    worker_id,
+                    lease_seconds=float(config.get("queue_lease", 300)),
+                    max_attempts=int(config.get("queue_max_attempts", 3)),
+                )
+            )
+            work_queue.load(jobs)
+            job_count = work_queue.job_count()
+            logger.info("Worker %s processing queue %s", worker_id, queue_path)
+            poll = float(config.get("queue_poll", 1.0))
+            while True:
+                process(iter_queue_tasks(work_queue, bing_base_url, max(1, concurrency), poll))
+                if not work_queue.has_open_units():
+                    break
+            queue_counts = work_queue.counts()
+            metrics.inc("queue_units_claimed_total", work_queue.claimed)
+            metrics.inc("queue_units_reclaimed_total", work_queue.reclaimed)
+        else:
+            process(iter_page_tasks(scheduled(jobs), bing_base_url, journal, pagination))
 
-    if output_format in ("json", "all"):
-        json_path = f"{base_output_path}.json"
-        export_to_json(all_results, json_path)
+        metrics.inc("fetch_coalesced_total", fetcher.in_flight.coalesced)
+        if cache is not None:
+            metrics.inc("cache_hits_total", cache.hits)
+            metrics.inc("cache_misses_total", cache.misses)
 
-    if output_format in ("csv", "all"):
-        csv_path = f"{base_output_path}.csv"
-        export_to_csv(all_results, csv_path)
+    metrics.finish()
+    write_metrics_file(metrics, f"{base_output_path}.metrics.json")
 
-    if output_format in ("xlsx", "all"):
-        xlsx_path = f"{base_output_path}.xlsx"
-        export_to_xlsx(all_results, xlsx_path)
+    if not job_count:
+        logging.getLogger("scraper").warning("Shard %s has no jobs; its outputs are empty", shard)
+    elif not record_count and not resumed_pages and not queue_path:
+        raise RuntimeError("No results were collected. Check connectivity or input keywords.")
 
     summary = {
-        "jobs": len(jobs),
-        "records": len(all_results),
+        "jobs": job_count,
+        "records": record_count,
+        "resumed_pages": resumed_pages,
         "output_base_path": base_output_path,
+        "pages_per_second": metrics.pages_per_second(),
     }
+    if pagination is not None:
+        summary["skipped_pages"] = pagination.skipped_pages
+        summary["dropped_pages"] = pagination.dropped_pages
+    if rate_limiter is not None:
+        summary["request_rate"] = round(rate_limiter.rate, 3)
+    if delta is not None:
+        summary["delta"] = dict(delta.counts)
+    if queue_path:
+        summary["worker_id"] = worker_id
+        summary["queue"] = queue_counts
     logging.getLogger("summary").info("Scraping completed: %s", summary)
+    summary["metrics"] = metrics.snapshot()
+    return summary
+
+def merge_shard_outputs(
+    config_path: str,
+    input_path: str,
+    output_format: str,
+    shard_count: int,
+    output_dir: str | None = None,
+    dedupe: bool | None = None,
+) -> Dict[str, Any]:
+    """
+    Combines the outputs of ``--shard i/N`` runs into ``bing_results.*``.
+
+    The shard files are looked up in ``output_dir`` and the merged file is
+    what a single-process run over the same input would have written. The
+    input (and ``dedupe``) must match what the shard runs used, since the
+    job order is what puts the pages back in sequence.
+    """
+    from outputs.merge import MERGE_FORMATS, merge_shards  # type: ignore
+
+    config = load_config(config_path)
+    if output_dir is None:
+        output_dir = config.get("default_output_dir", DEFAULT_OUTPUT_DIR)
+    if dedupe is None:
+        dedupe = bool(config.get("dedupe_jobs", False))
+    if shard_count < 1:
+        raise ValueError(f"Shard count must be at least 1, got {shard_count}")
+
+    summary: Dict[str, Any] = {"shards": shard_count, "pages": 0, "outputs": []}
+    for fmt in formats_for(output_format):
+        suffix = WRITERS[fmt][2]
+        if suffix not in MERGE_FORMATS:
+            raise ValueError(f"Shard outputs in {fmt} format cannot be merged; use json, jsonl or csv")
+        shard_paths = [
+            os.path.join(output_dir, output_base_name((index, shard_count)) + suffix)
+            for index in range(shard_count)
+        ]
+        missing = [path for path in shard_paths if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"Missing shard output(s): {', '.join(missing)}")
+
+        jobs: Iterable[Dict[str, Any]] = JobReader(input_path)
+        if dedupe:
+            jobs = dedupe_jobs(list(jobs))
+        output_path = os.path.join(output_dir, output_base_name() + suffix)
+        summary["pages"] = merge_shards(
+            ((job["keyword"], shard_of(job["keyword"], shard_count)) for job in jobs),
+            shard_paths,
+            output_path,
+        )
+        summary["outputs"].append(output_path)
+    logging.getLogger("summary").info("Merge completed: %s", summary)
     return summary
 
+def open_service(
+    stack: ExitStack,
+    config_path: str,
+    port: int,
+    host: str | None = None,
+    concurrency: int | None = None,
+    per_host_limit: int | None = None,
+    parser_backend: str | None = None,
+    parse_workers: int | None = None,
+    sections: str | List[str] | None = None,
+    cache_dir: str | None = None,
+    cache_mode: str | None = None,
+    parse_memo_dir: str | None = None,
+    rate_limit: float | None = None,
+    stream_fetch: bool | None = None,
+) -> ScrapeServer:
+    """
+    Starts the scrape API on ``stack`` and returns the running server.
+
+    The transport's connection pool, the response cache, the parse memo
+    and (with ``parse_workers``) the parser processes are built once and
+    shared by every request, so a one-keyword lookup only pays for its own
+    fetch and parse. Port 0 picks a free port.
+    """
+    from extractors.parse_pool import ParseStage  # type: ignore
+    from service.api import ScrapeServer  # type: ignore
+    from telemetry.metrics import RunMetrics  # type: ignore
+
+    config = load_config(config_path)
+    if host is None:
+        host = str(config.get("serve_host", "127.0.0.1"))
+    if concurrency is None:
+        concurrency = int(config.get("concurrency", 1))
+    if per_host_limit is None:
+        per_host_limit = int(config.get("per_host_limit", 4))
+    if parser_backend is None:
+        parser_backend = str(config.get("parser_backend", "html.parser"))
+    if parse_workers is None:
+        parse_workers = int(config.get("parse_workers", 0))
+    if sections is None:
+        sections = config.get("sections")
+    section_names = parse_sections(sections)
+    if cache_dir is None:
+        cache_dir = config.get("cache_dir")
+    if cache_mode is None:
+        cache_mode = str(config.get("cache_mode", "read-write"))
+    if parse_memo_dir is None:
+        parse_memo_dir = config.get("parse_memo_dir")
+    parse_memo_size = int(config.get("parse_memo_size", 0))
+    if rate_limit is None and config.get("rate_limit") is not None:
+        rate_limit = float(config["rate_limit"])
+    if stream_fetch is None:
+        stream_fetch = bool(config.get("stream_fetch", False))
+    bing_base_url: str = config.get("bing_base_url", "https://www.bing.com/search")
+
+    memo_options = None
+    if parse_memo_size > 0 or parse_memo_dir:
+        memo_options = {
+            "max_entries": parse_memo_size,
+            "directory": parse_memo_dir,
+            "max_bytes": int(config.get("parse_memo_max_bytes", 256 * 1024 * 1024)),
+        }
+    metrics = RunMetrics()
+    parse_stage = ParseStage(
+        parser_backend,
+        workers=parse_workers,
+        memo_options=memo_options,
+        metrics=metrics,
+        persistent=True,
+        sections=section_names,
+    )
+    stack.callback(parse_stage.close)
+    fetcher, _, _ = open_fetcher(
+        stack,
+        config,
+        metrics,
+        concurrency=concurrency,
+        per_host_limit=per_host_limit,
+        rate_limit=rate_limit,
+        cache_dir=cache_dir,
+        cache_mode=cache_mode,
+        stream_document=parse_stage.parser.stream_document if stream_fetch else None,
+    )
+
+    def records(jobs: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        tasks = iter_page_tasks(jobs, bing_base_url)
+        for outcome, record in parse_stage.map(fetcher.map(tasks)):
+            if outcome.error is not None:
+                metrics.inc("fetch_failures_total")
+                yield {
+                    "keyword": outcome.task.keyword,
+                    "pageNumber": outcome.task.page_number,
+                    "error": str(outcome.error),
+                }
+                continue
+            yield record.as_dict()
+
+    def lookup(payload: Any) -> Iterator[Dict[str, Any]]:
+        raw_jobs = document_jobs(payload)
+        jobs = [
+            job
+            for job in (normalize_job(raw, f"request[{index}]") for index, raw in enumerate(raw_jobs))
+            if job is not None
+        ]
+        if not jobs:
+            raise ValueError("No valid jobs in request.")
+        metrics.inc("lookups_total")
+        return records(jobs)
+
+    return stack.enter_context(ScrapeServer(lookup, metrics, port, host))
+
+def serve(config_path: str, port: int, **options: Any) -> None:
+    """Runs the scrape API until interrupted; ``options`` are ``open_service`` arguments."""
+    with ExitStack() as stack:
+        open_service(stack, config_path, port, **options).wait()
+
 def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Advanced Bing Scraper - collects structured Bing search data."
@@ -225,9 +874,145 @@ def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     parser.add_argument(
         "-f",
         "--format",
-        choices=["json", "csv", "xlsx", "all"],
+        choices=list(OUTPUT_FORMATS),
         default="json",
-        help="Output format (default: json)",
+        help="Output format; parquet needs pyarrow installed (default: json)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of pages fetched in parallel (default: configured concurrency or 1)",
+    )
+    parser.add_argument(
+        "--per-host-limit",
+        type=int,
+        default=None,
+        help="Maximum in-flight requests per host (default: configured per_host_limit or 4)",
+    )
+    parser.add_argument(
+        "--parser-backend",
+        choices=list(PARSER_BACKENDS),
+        default=None,
+        help="HTML tree builder used for parsing (default: configured parser_backend or html.parser)",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Worker processes for HTML parsing; 0 parses inline (default: configured parse_workers or 0)",
+    )
+    parser.add_argument(
+        "--sections",
+        default=None,
+        help=f"Comma-separated sections to extract, out of {','.join(SECTION_KEYS)}; the others are neither "
+        "parsed nor exported (default: configured sections or all)",
+    )
+    parser.add_argument(
+        "--stream-fetch",
+        action="store_true",
+        default=None,
+        help="Parse pages while they download and stop reading once the selected sections are complete "
+        "(default: configured stream_fetch)",
+    )
+    parser.add_argument(
+        "--xlsx-section-sheets",
+        action="store_true",
+        default=None,
+        help="Add News, Videos and People Also Ask sheets to the XLSX export",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the on-disk response cache (default: configured cache_dir; disabled when unset)",
+    )
+    parser.add_argument(
+        "--cache-mode",
+        choices=list(CACHE_MODES),
+        default=None,
+        help="How the response cache is used (default: configured cache_mode or read-write)",
+    )
+    parser.add_argument(
+        "--parse-memo-dir",
+        default=None,
+        help="Directory for the on-disk parse memo (default: configured parse_memo_dir; the memo is off "
+        "unless this or parse_memo_size is set)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port while the run is in progress",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Starting request rate per second, adapted to 429/503 responses and latency "
+        "(default: configured rate_limit; unlimited when unset)",
+    )
+    parser.add_argument(
+        "--early-stop",
+        action="store_true",
+        default=None,
+        help="Stop paginating a keyword once a page has no results or repeats the previous one",
+    )
+    parser.add_argument(
+        "--dedupe-jobs",
+        action="store_true",
+        default=None,
+        help="Merge jobs whose keywords differ only in case or spacing, keeping the most pages",
+    )
+    parser.add_argument(
+        "--shard",
+        default=None,
+        help="Process only shard i of N ('i/N', 0-based); outputs are named bing_results.shard-i-of-N.* "
+        "(default: configured shard; all jobs when unset)",
+    )
+    parser.add_argument(
+        "--queue",
+        dest="queue_path",
+        default=None,
+        help="Share the input with other workers through this SQLite work queue; the first worker loads it "
+        "and every worker writes bing_results.worker-<id>.* (default: configured queue_path)",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Name of this queue worker (default: configured worker_id or <hostname>-<pid>)",
+    )
+    parser.add_argument(
+        "--delta-index",
+        default=None,
+        help="Compare every page with this index of earlier runs, write only new or changed pages "
+        "(with organic rank changes) to bing_results.delta.* and update the index; json and jsonl "
+        "formats only (default: configured delta_index; full output when unset)",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Instead of scraping the input, serve POST /search lookups on this port with warm "
+        "connections, caches and parsers",
+    )
+    parser.add_argument(
+        "--host",
+        default=None,
+        help="Interface --serve listens on (default: configured serve_host or 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--merge-shards",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Instead of scraping, merge the N shard outputs in the output directory into bing_results.* "
+        "(json, jsonl or csv; use the same input and --dedupe-jobs as the shard runs)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip pages recorded in the checkpoint journal and append to existing outputs",
     )
     parser.add_argument(
         "-v",
@@ -240,11 +1025,57 @@ def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
 def main(argv: List[str] | None = None) -> None:
     args = parse_args(argv)
     configure_logging(args.verbose)
+    if args.serve is not None:
+        serve(
+            args.config,
+            args.serve,
+            host=args.host,
+            concurrency=args.concurrency,
+            per_host_limit=args.per_host_limit,
+            parser_backend=args.parser_backend,
+            parse_workers=args.parse_workers,
+            sections=args.sections,
+            cache_dir=args.cache_dir,
+            cache_mode=args.cache_mode,
+            parse_memo_dir=args.parse_memo_dir,
+            rate_limit=args.rate_limit,
+            stream_fetch=args.stream_fetch,
+        )
+        return
+    if args.merge_shards is not None:
+        merge_shard_outputs(
+            config_path=args.config,
+            input_path=args.input,
+            output_format=args.format,
+            shard_count=args.merge_shards,
+            output_dir=args.output_dir,
+            dedupe=args.dedupe_jobs,
+        )
+        return
     run_scraper(
         config_path=args.config,
         input_path=args.input,
         output_format=args.format,
         output_dir=args.output_dir,
+        concurrency=args.concurrency,
+        per_host_limit=args.per_host_limit,
+        parser_backend=args.parser_backend,
+        parse_workers=args.parse_workers,
+        sections=args.sections,
+        xlsx_section_sheets=args.xlsx_section_sheets,
+        cache_dir=args.cache_dir,
+        cache_mode=args.cache_mode,
+        resume=args.resume,
+        parse_memo_dir=args.parse_memo_dir,
+        metrics_port=args.metrics_port,
+        rate_limit=args.rate_limit,
+        early_stop=args.early_stop,
+        dedupe=args.dedupe_jobs,
+        shard=args.shard,
+        queue_path=args.queue_path,
+        worker_id=args.worker_id,
+        delta_index=args.delta_index,
+        stream_fetch=args.stream_fetch,
     )
 
 if __name__ == "__main__":
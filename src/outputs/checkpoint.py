@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+from typing import Any, Dict, IO, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger("checkpoint")
+
+def open_output(path: str, resume_from: Optional[int] = None, newline: Optional[str] = None) -> IO[str]:
+    """
+    Opens a text output file for writing.
+
+    Without ``resume_from`` the file is created or truncated. With it, the
+    existing file is cut back to ``resume_from`` bytes - the position
+    journaled after the last completed page - which drops any partially
+    written record, and the returned file is positioned there for appending.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if resume_from is None or not os.path.exists(path):
+        if resume_from:
+            logger.warning("%s is missing; results from earlier runs will not be in it", path)
+        return open(path, "w", encoding="utf-8", newline=newline)
+
+    f = open(path, "r+", encoding="utf-8", newline=newline)
+    f.seek(resume_from)
+    f.truncate()
+    return f
+
+class RowLog:
+    """
+    Append-only sidecar holding the rows of an output that is only saved on close.
+
+    XLSX and Parquet files cannot be appended to or read before they are
+    complete, so their writers also log every row here as a JSON line.
+    ``position()`` flushes the log and returns its size, which is what
+    gets journaled: a resumed run rebuilds the output from the rows up to
+    that offset instead of trusting whatever file happens to be at the
+    output path. ``discard`` removes the log once the output is saved.
+    """
+
+    def __init__(self, path: str, resume_from: Optional[int] = None) -> None:
+        self.path = path
+        self._file: Optional[IO[str]] = open_output(path, resume_from)
+
+    @staticmethod
+    def read(path: str, end: int) -> Iterator[List[Any]]:
+        """Rows logged in ``path`` before byte offset ``end``."""
+        with open(path, "r", encoding="utf-8") as f:
+            while f.tell() < end:
+                line = f.readline()
+                if not line.endswith("\n"):
+                    break
+                yield json.loads(line)
+
+    def append(self, row: List[Any]) -> None:
+        assert self._file is not None
+        self._file.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+
+    def position(self) -> int:
+        assert self._file is not None
+        self._file.flush()
+        return self._file.tell()
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class CheckpointJournal:
+    """
+    Append-only journal of completed pages for resumable runs.
+
+    Every line records one (keyword, pageNumber) together with the position
+    each output file reached once that page's record was written. A resumed
+    run skips the journaled pages and reopens the outputs at the positions
+    from the last line.
+    """
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        self.path = path
+        self.completed: Set[Tuple[str, int]] = set()
+        self.positions: Dict[str, Any] = {}
+
+        torn = False
+        if resume and os.path.exists(path):
+            torn = self._load()
+            logger.info("Resuming: %d page(s) already completed", len(self.completed))
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file: Optional[IO[str]] = open(path, "a" if resume else "w", encoding="utf-8")
+        if torn:
+            # Terminate the torn line so the next entry starts on its own.
+            self._file.write("\n")
+
+    def _load(self) -> bool:
+        """Reads completed pages; returns True if the file ends mid-line."""
+        line = ""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash; everything before it is intact.
+                    logger.warning("Ignoring unreadable checkpoint line in %s", self.path)
+                    continue
+                self.completed.add((entry["keyword"], int(entry["pageNumber"])))
+                self.positions = entry.get("outputs", {})
+        return bool(line) and not line.endswith("\n")
+
+    def is_done(self, keyword: str, page_number: int) -> bool:
+        return (keyword, page_number) in self.completed
+
+    def record(self, keyword: str, page_number: int, outputs: Dict[str, Any]) -> None:
+        """Journals a completed page; call only after its record reached every output."""
+        assert self._file is not None
+        entry = {"keyword": keyword, "pageNumber": page_number, "outputs": outputs}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.completed.add((keyword, page_number))
+        self.positions = outputs
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from extractors.records import SECTION_KEYS  # type: ignore
+
+logger = logging.getLogger("delta")
+
+# The annotations are per page, which only the record-per-page formats can carry.
+DELTA_FORMATS = ("json", "jsonl")
+
+# Record keys that are fingerprinted; url/keyword/pageNumber identify the page.
+FINGERPRINTED_KEYS = tuple(SECTION_KEYS.values())
+
+def section_fingerprints(record: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Short content hash of every section present in a record.
+
+    Sections left out by a ``--sections`` run are not hashed, so they
+    neither count as changed nor replace what an earlier run stored.
+    """
+    fingerprints = {}
+    for key in FINGERPRINTED_KEYS:
+        if key not in record:
+            continue
+        encoded = json.dumps(record[key], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        fingerprints[key] = hashlib.blake2b(encoded.encode("utf-8"), digest_size=8).hexdigest()
+    return fingerprints
+
+# Bing pages hold ten organic results; the "first" parameter advances by ten.
+PAGE_SIZE = 10
+
+def organic_ranks(page_number: int, urls: List[str]) -> Dict[str, int]:
+    """1-based rank of each URL within its keyword, counted across pages."""
+    ranks: Dict[str, int] = {}
+    for offset, url in enumerate(urls, start=1):
+        ranks.setdefault(url, (page_number - 1) * PAGE_SIZE + offset)
+    return ranks
+
+def rank_changes(
+    previous: Dict[str, int], current: Dict[str, int], dropped: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Organic results whose keyword-wide rank differs from the previous run.
+
+    ``previous`` and ``current`` map URLs to ranks (see ``organic_ranks``).
+    New URLs have ``previousRank`` None; the ``dropped`` URLs follow with
+    ``rank`` None.
+    """
+    changes = [
+        {"url": url, "previousRank": previous.get(url), "rank": rank}
+        for url, rank in current.items()
+        if previous.get(url) != rank
+    ]
+    changes += [{"url": url, "previousRank": previous.get(url), "rank": None} for url in dropped]
+    return changes
+
+class DeltaIndex:
+    """
+    Per-page section fingerprints from earlier runs, kept in a SQLite file.
+
+    ``observe`` compares a freshly scraped record with the entry for its
+    (keyword, pageNumber) and returns what a delta export should write:
+    None for an unchanged page, otherwise the record annotated with
+    ``changeType`` ("new" or "changed"), ``changedSections`` and
+    ``rankChanges`` of its organic results. Ranks count
+    across the keyword's pages, so a result pushed from the bottom of page
+    1 to the top of page 2 moves from 10 to 11 on page 2. Results gone
+    from the keyword are listed by whichever page completes the set of
+    pages it had before, which is then written even if that page itself
+    is unchanged (with empty ``changedSections``). Only the
+    sections a record carries are compared; the stored fingerprints of
+    the others are kept. Only hashes and organic URLs are stored, so the
+    index stays a small fraction of the full output.
+
+    The new entry is held back until ``commit`` is called for the page,
+    which a resumable run does once the page is written and journaled: a
+    run killed in between then reports the page again instead of losing
+    the change.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, int], Tuple[str, str, str]] = {}
+        # Entries stored by this run keep the organic URLs they replaced,
+        # so later pages of a keyword still compare with the previous run.
+        self._run = uuid.uuid4().hex
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                keyword TEXT NOT NULL,
+                page_number INTEGER NOT NULL,
+                sections TEXT NOT NULL,
+                organic_urls TEXT NOT NULL,
+                previous_urls TEXT NOT NULL DEFAULT '[]',
+                run TEXT NOT NULL DEFAULT '',
+                seen_at REAL NOT NULL,
+                PRIMARY KEY (keyword, page_number)
+            );
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(pages)")}
+        for column in ("previous_urls TEXT NOT NULL DEFAULT '[]'", "run TEXT NOT NULL DEFAULT ''"):
+            if column.split()[0] not in columns:
+                # Indexes written before rank moves spanned pages.
+                self._db.execute(f"ALTER TABLE pages ADD COLUMN {column}")
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+        logger.info("Delta against %s: %s", self.path, self.counts)
+
+    def __enter__(self) -> "DeltaIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def observe(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        keyword = record.get("keyword", "")
+        page_number = int(record.get("pageNumber", 0))
+        fingerprints = section_fingerprints(record)
+        has_organic = "organicResults" in record
+        urls = [item.get("url", "") for item in record.get("organicResults") or []]
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT page_number, sections, organic_urls, previous_urls, run FROM pages WHERE keyword = ?",
+                (keyword,),
+            ).fetchall()
+            # Pages of this keyword observed by this run but not committed yet.
+            observed = {
+                number: json.loads(pending[1]) for (word, number), pending in self._pending.items() if word == keyword
+            }
+
+            row = None
+            previous_ranks: Dict[str, int] = {}
+            for number, sections, stored_urls, replaced_urls, run in rows:
+                this_run = run == self._run
+                old_urls = json.loads(replaced_urls if this_run else stored_urls)
+                for url, rank in organic_ranks(number, old_urls).items():
+                    previous_ranks[url] = min(rank, previous_ranks.get(url, rank))
+                if number == page_number:
+                    row = (json.loads(sections), json.loads(stored_urls), old_urls)
+                elif this_run:
+                    observed.setdefault(number, json.loads(stored_urls))
+
+            previous, stored_urls, previous_urls = row if row is not None else ({}, [], [])
+            observed[page_number] = urls if has_organic else stored_urls
+            self._pending[(keyword, page_number)] = (
+                json.dumps({**previous, **fingerprints}),
+                json.dumps(observed[page_number]),
+                json.dumps(previous_urls),
+            )
+
+        dropped: List[str] = []
+        if has_organic and rows and {number for number, *_ in rows} <= set(observed):
+            # Every page the keyword had before has now been seen.
+            found = {url for page_urls in observed.values() for url in page_urls}
+            dropped = sorted((url for url in previous_ranks if url not in found), key=previous_ranks.__getitem__)
+
+        if row is None:
+            self.counts["new"] += 1
+            # Pages added to a known keyword report moves onto them too.
+            movements = rank_changes(previous_ranks, organic_ranks(page_number, urls), dropped) if rows else []
+            return {**record, "changeType": "new", "changedSections": list(fingerprints), "rankChanges": movements}
+
+        changed = [key for key, fingerprint in fingerprints.items() if previous.get(key) != fingerprint]
+        if not changed and not dropped:
+            self.counts["unchanged"] += 1
+            return None
+        self.counts["changed"] += 1
+        moved = organic_ranks(page_number, urls) if "organicResults" in changed else {}
+        movements = rank_changes(previous_ranks, moved, dropped)
+        return {**record, "changeType": "changed", "changedSections": changed, "rankChanges": movements}
+
+    def commit(self, keyword: str, page_number: int) -> None:
+        """Stores the entry ``observe`` computed for a page."""
+        with self._lock:
+            pending = self._pending.pop((keyword, page_number), None)
+            if pending is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(keyword, page_number, sections, organic_urls, previous_urls, run, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (keyword, page_number, *pending, self._run, self._clock()),
+            )
+            self._db.commit()
@@ -1,7 +1,8 @@
-thonimport csv
+import csv
 import logging
-import os
-from typing import Any, Dict, List
+from typing import Any, Dict, IO, Iterable, List, Optional
+
+from .checkpoint import open_output
 
 logger = logging.getLogger("export_csv")
 
@@ -103,25 +104,57 @@ def _flatten_record(record: Dict[str, Any]) -> List[Dict[str, Any]]:
 
     return rows
 
-def export_to_csv(records: List[Dict[str, Any]], path: str) -> None:
+class CsvWriter:
     """
-    Writes a flattened CSV view of the scraping results.
+    Streams flattened rows to a CSV file, one record at a time.
 
-    Each nested result (organic result, related query, etc.) becomes one row.
+    The header is written on open and rows are flushed after every record.
+    ``resume_from`` appends to an existing file from a position returned by
+    ``position()`` without repeating the header.
     """
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    all_rows: List[Dict[str, Any]] = []
 
-    for record in records:
-        all_rows.extend(_flatten_record(record))
+    def __init__(self, path: str, resume_from: Optional[int] = None) -> None:
+        self.path = path
+        self.row_count = 0
+        self._file: Optional[IO[str]] = open_output(path, resume_from, newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+
+    def position(self) -> int:
+        assert self._file is not None
+        return self._file.tell()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        assert self._file is not None
+        rows = _flatten_record(record)
+        self._writer.writerows(rows)
+        self._file.flush()
+        self.row_count += len(rows)
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        logger.info("CSV export completed: %s (%d rows)", self.path, self.row_count)
+
+    def __enter__(self) -> "CsvWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def export_to_csv(records: Iterable[Dict[str, Any]], path: str) -> None:
+    """
+    Writes a flattened CSV view of the scraping results.
 
+    Each nested result (organic result, related query, etc.) becomes one row.
+    """
     try:
-        with open(path, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
-            writer.writeheader()
-            for row in all_rows:
-                writer.writerow(row)
-        logger.info("CSV export completed: %s (%d rows)", path, len(all_rows))
+        with CsvWriter(path) as writer:
+            for record in records:
+                writer.write(record)
     except Exception as exc:
         logger.error("Failed to export CSV to %s: %s", path, exc)
-        raise
\ No newline at end of file
+        raise
@@ -1,21 +1,68 @@
-thonimport json
+import json
 import logging
-import os
-from typing import Any, Dict, List
+from typing import Any, Dict, IO, Iterable, Optional
+
+from .checkpoint import open_output
 
 logger = logging.getLogger("export_json")
 
-def export_to_json(records: List[Dict[str, Any]], path: str) -> None:
+class JsonArrayWriter:
+    """
+    Streams records into a pretty-printed JSON array.
+
+    The opening bracket, separators and closing bracket are written
+    incrementally, and the file is flushed after every record, so only
+    one record is held in memory at a time. The finished file is identical
+    to ``json.dump(records, f, indent=2, ensure_ascii=False)``.
+
+    ``resume_from`` reopens an array left by an earlier run at a position
+    returned by ``position()`` and keeps appending to it.
+    """
+
+    def __init__(self, path: str, resume_from: Optional[int] = None) -> None:
+        self.path = path
+        self.count = 0
+        self._file: Optional[IO[str]] = open_output(path, resume_from)
+        if self._file.tell() == 0:
+            self._file.write("[")
+        self._empty = self._file.tell() <= 1
+
+    def position(self) -> int:
+        assert self._file is not None
+        return self._file.tell()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        assert self._file is not None
+        body = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        self._file.write(("\n  " if self._empty else ",\n  ") + body)
+        self._file.flush()
+        self._empty = False
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.write("]" if self._empty else "\n]")
+        self._file.close()
+        self._file = None
+        logger.info("JSON export completed: %s (%d records)", self.path, self.count)
+
+    def __enter__(self) -> "JsonArrayWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def export_to_json(records: Iterable[Dict[str, Any]], path: str) -> None:
     """
     Writes the full list of scraping records to a JSON file.
 
     The file is written with UTF-8 encoding and pretty-printed for readability.
     """
-    os.makedirs(os.path.dirname(path), exist_ok=True)
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(records, f, indent=2, ensure_ascii=False)
-        logger.info("JSON export completed: %s (%d records)", path, len(records))
+        with JsonArrayWriter(path) as writer:
+            for record in records:
+                writer.write(record)
     except Exception as exc:
         logger.error("Failed to export JSON to %s: %s", path, exc)
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,54 @@
+import json
+import logging
+from typing import Any, Dict, IO, Iterable, Optional
+
+from .checkpoint import open_output
+
+logger = logging.getLogger("export_jsonl")
+
+class JsonLinesWriter:
+    """
+    Streams records to a JSON Lines file, one compact object per line.
+
+    Each record is flushed as soon as it is written, so a crashed run
+    keeps every page parsed before the failure. ``resume_from`` appends
+    to an existing file from a position returned by ``position()``.
+    """
+
+    def __init__(self, path: str, resume_from: Optional[int] = None) -> None:
+        self.path = path
+        self.count = 0
+        self._file: Optional[IO[str]] = open_output(path, resume_from)
+
+    def position(self) -> int:
+        assert self._file is not None
+        return self._file.tell()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        assert self._file is not None
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        logger.info("JSON Lines export completed: %s (%d records)", self.path, self.count)
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def export_to_jsonl(records: Iterable[Dict[str, Any]], path: str) -> None:
+    """Writes scraping records to a JSON Lines file."""
+    try:
+        with JsonLinesWriter(path) as writer:
+            for record in records:
+                writer.write(record)
+    except Exception as exc:
+        logger.error("Failed to export JSON Lines to %s: %s", path, exc)
+        raise
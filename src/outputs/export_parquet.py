@@ -0,0 +1,190 @@
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .checkpoint import RowLog
+from .export_csv import CSV_FIELDS, _flatten_record
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+logger = logging.getLogger("export_parquet")
+
+# The CSV schema plus each row's 1-based position within its result type on the page.
+PARQUET_FIELDS = CSV_FIELDS[:3] + ["rank"] + CSV_FIELDS[3:]
+
+DICTIONARY_COLUMNS = ["keyword", "resultType"]
+
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+
+def _schema() -> Any:
+    return pa.schema(
+        [
+            ("keyword", pa.string()),
+            ("pageNumber", pa.int32()),
+            ("resultType", pa.string()),
+            ("rank", pa.int32()),
+            ("title", pa.string()),
+            ("url", pa.string()),
+            ("description", pa.string()),
+            ("extra", pa.string()),
+        ]
+    )
+
+class ParquetWriter:
+    """
+    Streams flattened rows into a Parquet file in row groups.
+
+    Rows use the CSV export's schema plus a ``rank`` column, with
+    ``pageNumber`` and ``rank`` stored as integers and ``keyword`` and
+    ``resultType`` dictionary-encoded. Rows are buffered until
+    ``row_group_size`` of them are pending, then written as one row group.
+
+    The file is built as ``{path}.partial`` and moved into place on close,
+    since a Parquet file is unreadable until its footer is written; a
+    ``.partial`` left by a killed run is removed on open. Like the XLSX
+    writer, rows are also logged to ``{path}.rows.jsonl`` until the file is
+    in place, and ``resume_from`` (a value returned by ``position()``)
+    rebuilds the rows from that log, or from the finished file of an
+    earlier run when the log is gone, refusing a file with fewer rows than
+    the journal expects.
+
+    Needs the optional ``pyarrow`` package.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        resume_from: Union[Dict[str, int], int, None] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ) -> None:
+        if pa is None:
+            raise RuntimeError("Parquet export needs pyarrow; install it with: pip install pyarrow")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.row_group_size = max(1, int(row_group_size))
+        self.row_count = 0
+        self._schema = _schema()
+        self._buffer: Dict[str, List[Any]] = {name: [] for name in PARQUET_FIELDS}
+        self._partial_path = f"{path}.partial"
+        self.log_path = f"{path}.rows.jsonl"
+        if os.path.exists(self._partial_path):
+            logger.warning("Removing %s left by an unfinished run", self._partial_path)
+            os.remove(self._partial_path)
+        self._writer: Optional[Any] = pq.ParquetWriter(
+            self._partial_path,
+            self._schema,
+            compression="zstd",
+            use_dictionary=DICTIONARY_COLUMNS,
+        )
+        self._log: Optional[RowLog] = None
+
+        if isinstance(resume_from, int):
+            # Journaled before positions carried a row log offset.
+            resume_from = {"rows": resume_from}
+        keep = (resume_from or {}).get("rows", 0)
+        log_offset = (resume_from or {}).get("log") if keep else None
+        if log_offset is not None and os.path.exists(self.log_path):
+            for values in RowLog.read(self.log_path, log_offset):
+                self._buffer_rows([values], logged=True)
+            self._log = RowLog(self.log_path, log_offset)
+        else:
+            self._log = RowLog(self.log_path)
+            if keep:
+                self._copy_previous_rows(keep)
+
+    def _copy_previous_rows(self, keep: int) -> None:
+        if not os.path.exists(self.path):
+            logger.warning("%s is missing; results from earlier runs will not be in it", self.path)
+            return
+        previous = pq.ParquetFile(self.path)
+        if previous.metadata.num_rows < keep:
+            self._abandon()
+            raise RuntimeError(
+                f"{self.path} holds {previous.metadata.num_rows} row(s) but the checkpoint journal expects "
+                f"{keep}; it is not the output of the run being resumed"
+            )
+        remaining = keep
+        for batch in previous.iter_batches(batch_size=self.row_group_size):
+            if remaining <= 0:
+                break
+            rows = batch.slice(0, remaining).to_pylist()
+            self._buffer_rows([[row[name] for name in PARQUET_FIELDS] for row in rows])
+            remaining -= len(rows)
+
+    def _abandon(self) -> None:
+        if self._log is not None:
+            self._log.discard()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        os.remove(self._partial_path)
+
+    def position(self) -> Dict[str, int]:
+        assert self._log is not None
+        return {"log": self._log.position(), "rows": self.row_count}
+
+    def _buffer_rows(self, rows: List[List[Any]], logged: bool = False) -> None:
+        """Buffers rows (logging them unless ``logged``), then writes a full row group."""
+        for values in rows:
+            if not logged:
+                assert self._log is not None
+                self._log.append(values)
+            for name, value in zip(PARQUET_FIELDS, values):
+                self._buffer[name].append(value)
+            self.row_count += 1
+        if len(self._buffer["keyword"]) >= self.row_group_size:
+            self._flush()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        ranks: Dict[str, int] = {}
+        rows = []
+        for row in _flatten_record(record):
+            result_type = row["resultType"]
+            ranks[result_type] = ranks.get(result_type, 0) + 1
+            row["rank"] = ranks[result_type]
+            row["pageNumber"] = int(row["pageNumber"]) if row["pageNumber"] != "" else None
+            rows.append([row[name] for name in PARQUET_FIELDS])
+        self._buffer_rows(rows)
+
+    def _flush(self) -> None:
+        if not self._buffer["keyword"] or self._writer is None:
+            return
+        self._writer.write_table(pa.table(self._buffer, schema=self._schema))
+        self._buffer = {name: [] for name in PARQUET_FIELDS}
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._flush()
+        writer, self._writer = self._writer, None
+        writer.close()
+        os.replace(self._partial_path, self.path)
+        if self._log is not None:
+            self._log.discard()
+            self._log = None
+        logger.info("Parquet export completed: %s (%d rows)", self.path, self.row_count)
+
+    def __enter__(self) -> "ParquetWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def export_to_parquet(records: Iterable[Dict[str, Any]], path: str) -> None:
+    """
+    Writes the flattened CSV view of the results as a Parquet file.
+
+    Each nested result becomes one row, with typed page and rank columns.
+    """
+    try:
+        with ParquetWriter(path) as writer:
+            for record in records:
+                writer.write(record)
+    except Exception as exc:
+        logger.error("Failed to export Parquet to %s: %s", path, exc)
+        raise
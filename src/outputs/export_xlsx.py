@@ -1,49 +1,177 @@
-thonimport logging
+import logging
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
+
+from .checkpoint import RowLog
 
 logger = logging.getLogger("export_xlsx")
 
-def export_to_xlsx(records: List[Dict[str, Any]], path: str) -> None:
+ORGANIC_HEADER = [
+    "Keyword",
+    "Page",
+    "Title",
+    "URL",
+    "Description",
+    "RelatedQueriesCount",
+    "PeopleAlsoAskCount",
+    "ImagesCount",
+    "VideosCount",
+    "NewsCount",
+]
+
+# Optional per-section sheets: title -> (record key, header, item fields).
+SECTION_SHEETS = {
+    "News": ("news", ["Keyword", "Page", "Headline", "URL", "Source"], ["headline", "url", "source"]),
+    "Videos": (
+        "videos",
+        ["Keyword", "Page", "Title", "URL", "Views", "Channel", "Provider"],
+        ["title", "url", "views", "channel", "provider"],
+    ),
+    "People Also Ask": ("peopleAlsoAsk", ["Keyword", "Page", "Question", "Answer"], ["question", "answer"]),
+}
+
+class XlsxWriter:
     """
-    Writes a simplified XLSX workbook containing a summary sheet
-    of organic results plus counts of other sections.
+    Streams records into an XLSX workbook using openpyxl's write-only mode.
+
+    Rows are serialized as they are appended instead of being kept as cell
+    objects, so memory stays flat however many records are written. The
+    workbook is saved to ``path`` on close.
+
+    The "Organic Results" sheet is always written. With ``section_sheets``
+    enabled, one extra sheet per entry in ``SECTION_SHEETS`` is added with a
+    row per news item, video or People Also Ask entry. Sections a record
+    leaves out (see ``--sections``) get empty count cells, and a record
+    without organic results gets no placeholder organic row.
+
+    An XLSX file cannot be appended to, and nothing reaches ``path`` before
+    close, so every row is also logged to ``{path}.rows.jsonl`` (see
+    ``RowLog``), which is removed once the workbook is saved. ``position()``
+    covers only logged rows. ``resume_from`` (a value returned by it)
+    rebuilds the sheets from that log when an interrupted run left one;
+    otherwise the earlier run finished and its saved workbook must hold at
+    least the journaled rows, which are copied over. A workbook that does
+    not is refused rather than mixed into the new one.
     """
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Organic Results"
-
-    ws.append(
-        [
-            "Keyword",
-            "Page",
-            "Title",
-            "URL",
-            "Description",
-            "RelatedQueriesCount",
-            "PeopleAlsoAskCount",
-            "ImagesCount",
-            "VideosCount",
-            "NewsCount",
-        ]
-    )
-
-    for record in records:
+
+    def __init__(
+        self,
+        path: str,
+        section_sheets: bool = False,
+        resume_from: Optional[Dict[str, int]] = None,
+    ) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.log_path = f"{path}.rows.jsonl"
+        self.count = 0
+        self.rows: Dict[str, int] = {}
+        self._log: Optional[RowLog] = None
+        self._wb: Optional[Workbook] = Workbook(write_only=True)
+        self._organic = self._create_sheet("Organic Results", ORGANIC_HEADER)
+
+        self._sections: List[Any] = []
+        if section_sheets:
+            for title, (key, header, fields) in SECTION_SHEETS.items():
+                self._sections.append((self._create_sheet(title, header), key, fields))
+
+        log_offset: Optional[int] = None
+        copied: List[Tuple[str, List[Any]]] = []
+        if resume_from is not None and any(resume_from.values()):
+            try:
+                log_offset, copied = self._restore_rows(resume_from)
+            except Exception:
+                # Finish the half-written sheet streams instead of leaving them to the GC.
+                for ws in self._sheets().values():
+                    ws.close()
+                self._wb = None
+                raise
+        self._log = RowLog(self.log_path, log_offset)
+        # Rows copied from a saved workbook go into the fresh log too.
+        for title, row in copied:
+            self._log.append([title, row])
+
+    def _create_sheet(self, title: str, header: List[str]) -> Any:
+        assert self._wb is not None
+        ws = self._wb.create_sheet(title)
+        ws.append(header)
+        self.rows[title] = 0
+        return ws
+
+    def _sheets(self) -> Dict[str, Any]:
+        return {ws.title: ws for ws in [self._organic] + [section[0] for section in self._sections]}
+
+    def _restore_rows(self, resume_from: Dict[str, int]) -> Tuple[Optional[int], List[Tuple[str, List[Any]]]]:
+        """
+        Refills the sheets with the journaled rows.
+
+        Returns the log offset to continue from, or None along with the
+        rows copied from a saved workbook when the log is gone.
+        """
+        sheets = self._sheets()
+        log_offset = resume_from.get("log")
+        if log_offset is not None and os.path.exists(self.log_path):
+            for title, row in RowLog.read(self.log_path, log_offset):
+                if title in sheets:
+                    sheets[title].append(row)
+                    self.rows[title] += 1
+            return log_offset, []
+
+        if not os.path.exists(self.path):
+            logger.warning("%s is missing; results from earlier runs will not be in it", self.path)
+            return None, []
+        copied: List[Tuple[str, List[Any]]] = []
+        previous = load_workbook(self.path, read_only=True)
+        try:
+            for title, ws in sheets.items():
+                keep = resume_from.get(title, 0)
+                if not keep:
+                    continue
+                rows = []
+                if title in previous.sheetnames:
+                    rows = [
+                        list(row)
+                        for row in previous[title].iter_rows(min_row=2, max_row=keep + 1, values_only=True)
+                    ]
+                if len(rows) < keep:
+                    raise RuntimeError(
+                        f"{self.path} holds {len(rows)} row(s) in sheet {title!r} but the checkpoint journal "
+                        f"expects {keep}; it is not the output of the run being resumed"
+                    )
+                for row in rows:
+                    ws.append(row)
+                    copied.append((title, row))
+                self.rows[title] = keep
+        finally:
+            previous.close()
+        return None, copied
+
+    def position(self) -> Dict[str, int]:
+        assert self._log is not None
+        return {"log": self._log.position(), **self.rows}
+
+    def _append(self, ws: Any, row: List[Any]) -> None:
+        assert self._log is not None
+        ws.append(row)
+        self._log.append([ws.title, row])
+
+    def write(self, record: Dict[str, Any]) -> None:
         keyword = record.get("keyword", "")
         page = record.get("pageNumber", "")
-        related_count = len(record.get("relatedQueries", []))
-        paa_count = len(record.get("peopleAlsoAsk", []))
-        images_count = len(record.get("images", []))
-        videos_count = len(record.get("videos", []))
-        news_count = len(record.get("news", []))
+        # Sections a --sections run left out get empty cells, not zero counts.
+        related_count, paa_count, images_count, videos_count, news_count = (
+            len(record[key]) if key in record else None
+            for key in ("relatedQueries", "peopleAlsoAsk", "images", "videos", "news")
+        )
 
-        organic_results = record.get("organicResults", []) or [{}]
+        organic_results = record.get("organicResults", [])
+        if "organicResults" in record and not organic_results:
+            organic_results = [{}]
+        self.rows[self._organic.title] += len(organic_results)
         for item in organic_results:
-            ws.append(
+            self._append(
+                self._organic,
                 [
                     keyword,
                     page,
@@ -58,9 +186,42 @@ def export_to_xlsx(records: List[Dict[str, Any]], path: str) -> None:
                 ]
             )
 
+        for ws, key, fields in self._sections:
+            for item in record.get(key, []):
+                self._append(ws, [keyword, page] + [item.get(field, "") for field in fields])
+                self.rows[ws.title] += 1
+
+        self.count += 1
+
+    def close(self) -> None:
+        if self._wb is None:
+            return
+        wb, self._wb = self._wb, None
+        wb.save(self.path)
+        if self._log is not None:
+            self._log.discard()
+            self._log = None
+        logger.info("XLSX export completed: %s", self.path)
+
+    def __enter__(self) -> "XlsxWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def export_to_xlsx(
+    records: Iterable[Dict[str, Any]],
+    path: str,
+    section_sheets: bool = False,
+) -> None:
+    """
+    Writes a simplified XLSX workbook containing a summary sheet
+    of organic results plus counts of other sections.
+    """
     try:
-        wb.save(path)
-        logger.info("XLSX export completed: %s", path)
+        with XlsxWriter(path, section_sheets=section_sheets) as writer:
+            for record in records:
+                writer.write(record)
     except Exception as exc:
         logger.error("Failed to export XLSX to %s: %s", path, exc)
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,177 @@
+import csv
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .export_csv import CSV_FIELDS
+from .export_json import JsonArrayWriter
+from .export_jsonl import JsonLinesWriter
+
+logger = logging.getLogger("merge")
+
+MERGE_FORMATS = (".json", ".jsonl", ".csv")
+
+# One page's worth of output: its (keyword, pageNumber) and the record or CSV rows.
+Unit = Tuple[Tuple[str, int], Any]
+
+_CHUNK_SIZE = 1 << 20
+
+def iter_json_array(path: str) -> Iterator[Any]:
+    """Yields the elements of a JSON array file without loading it whole."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        started = False
+        eof = False
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"{path} ends before its closing ']'")
+                buffer, pos = f.read(_CHUNK_SIZE), 0
+                eof = not buffer
+                continue
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"{path} is not a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A number running into the end of the buffer may go on.
+                complete = end < len(buffer) or eof
+            except json.JSONDecodeError:
+                complete = False
+            if not complete:
+                # The element most likely continues past the buffered text.
+                more = f.read(_CHUNK_SIZE)
+                if not more:
+                    if eof:
+                        raise ValueError(f"{path} has an unreadable element")
+                    eof = True
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            yield value
+            pos = end
+
+def _record_units(records: Iterable[Dict[str, Any]]) -> Iterator[Unit]:
+    for record in records:
+        yield (record.get("keyword", ""), int(record.get("pageNumber", 0))), record
+
+def _json_lines(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def _csv_units(path: str) -> Iterator[Unit]:
+    """Groups consecutive CSV rows of the same page into one unit."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header != CSV_FIELDS:
+            raise ValueError(f"{path} does not have the scraper's CSV header")
+        key: Optional[Tuple[str, int]] = None
+        rows: List[List[str]] = []
+        for row in reader:
+            row_key = (row[0], int(row[1]) if row[1] else 0)
+            if rows and row_key != key:
+                yield key, rows
+                rows = []
+            key = row_key
+            rows.append(row)
+        if rows:
+            yield key, rows
+
+def read_units(path: str) -> Iterator[Unit]:
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".json":
+        return _record_units(iter_json_array(path))
+    if suffix == ".jsonl":
+        return _record_units(_json_lines(path))
+    if suffix == ".csv":
+        return _csv_units(path)
+    raise ValueError(f"Cannot merge {path}; supported formats: {', '.join(MERGE_FORMATS)}")
+
+class _ShardStream:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._units = read_units(path)
+        self.head: Optional[Unit] = next(self._units, None)
+
+    def take_job(self, keyword: str) -> Iterator[Unit]:
+        """Yields the leading units that belong to one job for ``keyword``."""
+        last_page = 0
+        while self.head is not None:
+            (unit_keyword, page), _ = self.head
+            # A repeated keyword starts a new job, whose pages restart.
+            if unit_keyword != keyword or page <= last_page:
+                return
+            last_page = page
+            yield self.head
+            self.head = next(self._units, None)
+
+class _Sink:
+    def __init__(self, path: str) -> None:
+        suffix = os.path.splitext(path)[1].lower()
+        self.suffix = suffix
+        if suffix == ".json":
+            self._writer: Any = JsonArrayWriter(path)
+        elif suffix == ".jsonl":
+            self._writer = JsonLinesWriter(path)
+        elif suffix == ".csv":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(CSV_FIELDS)
+        else:
+            raise ValueError(f"Cannot merge into {path}; supported formats: {', '.join(MERGE_FORMATS)}")
+
+    def write(self, payload: Any) -> None:
+        if self.suffix == ".csv":
+            self._writer.writerows(payload)
+        else:
+            self._writer.write(payload)
+
+    def close(self) -> None:
+        if self.suffix == ".csv":
+            self._file.close()
+        else:
+            self._writer.close()
+
+def merge_shards(jobs: Iterable[Tuple[str, int]], shard_paths: List[str], output_path: str) -> int:
+    """
+    Merges per-shard outputs into the file a single-process run would write.
+
+    ``jobs`` yields ``(keyword, shard index)`` for every job of the original
+    input in order, and ``shard_paths[i]`` is the output of shard i. Each
+    shard output is a subsequence of the single-run order, so walking the
+    jobs and taking each job's pages from its shard restores that order
+    while reading every shard once. Returns the number of pages written.
+    """
+    formats = {os.path.splitext(path)[1].lower() for path in shard_paths + [output_path]}
+    if len(formats) != 1:
+        raise ValueError("Shard outputs and the merged output must share one format")
+
+    streams = [_ShardStream(path) for path in shard_paths]
+    sink = _Sink(output_path)
+    pages = 0
+    try:
+        for keyword, shard_index in jobs:
+            for _, payload in streams[shard_index].take_job(keyword):
+                sink.write(payload)
+                pages += 1
+    finally:
+        sink.close()
+
+    for stream in streams:
+        if stream.head is not None:
+            logger.warning("%s has pages for jobs not in the input; they were left out", stream.path)
+    logger.info("Merged %d page(s) from %d shard(s) into %s", pages, len(streams), output_path)
+    return pages
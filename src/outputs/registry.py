@@ -0,0 +1,34 @@
+import importlib
+from typing import Any, Dict, Tuple
+
+# Output format -> (exporter module, writer class, file suffix). A module is
+# only imported once its format is selected, so a JSON run never loads
+# openpyxl or pyarrow.
+WRITERS: Dict[str, Tuple[str, str, str]] = {
+    "json": ("export_json", "JsonArrayWriter", ".json"),
+    "jsonl": ("export_jsonl", "JsonLinesWriter", ".jsonl"),
+    "csv": ("export_csv", "CsvWriter", ".csv"),
+    "xlsx": ("export_xlsx", "XlsxWriter", ".xlsx"),
+    "parquet": ("export_parquet", "ParquetWriter", ".parquet"),
+}
+
+# Names that select several formats at once.
+FORMAT_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "all": ("json", "csv", "xlsx"),
+}
+
+OUTPUT_FORMATS = tuple(WRITERS) + tuple(FORMAT_GROUPS)
+
+def formats_for(output_format: str) -> Tuple[str, ...]:
+    """Expands a --format value into the formats it writes, in output order."""
+    if output_format in FORMAT_GROUPS:
+        return FORMAT_GROUPS[output_format]
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format {output_format!r}; expected one of {', '.join(OUTPUT_FORMATS)}")
+    return (output_format,)
+
+def load_writer(output_format: str) -> Tuple[Any, str]:
+    """Imports the writer class for one format; returns it with its file suffix."""
+    module_name, class_name, suffix = WRITERS[output_format]
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, class_name), suffix
@@ -0,0 +1,125 @@
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator
+
+logger = logging.getLogger("service")
+
+# Largest accepted request body; lookups are a handful of jobs.
+MAX_BODY_BYTES = 1 << 20
+
+Lookup = Callable[[Any], Iterator[Dict[str, Any]]]
+
+class ScrapeServer:
+    """
+    Local HTTP API in front of a long-lived scrape pipeline.
+
+    ``POST /search`` takes the same JSON as an input file (a job, a list of
+    jobs or ``{"queries": [...]}``) and streams one record per line
+    (``application/x-ndjson``) as pages complete, in request order.
+    ``lookup`` turns the decoded body into those records; it must raise
+    ``ValueError`` before yielding anything when the body holds no usable
+    job, which is answered with a 400. Should it fail once records are
+    streaming, the response ends with an ``{"error": ...}`` line. ``GET /healthz`` reports liveness and
+    ``GET /metrics`` serves ``metrics`` in Prometheus text format.
+
+    Responses use chunked encoding on keep-alive connections, so a client
+    can send many lookups over one socket.
+    """
+
+    def __init__(self, lookup: Lookup, metrics: Any, port: int, host: str = "127.0.0.1") -> None:
+        started = time.monotonic()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                path = self.path.split("?", 1)[0]
+                if path == "/healthz":
+                    body = json.dumps({"status": "ok", "uptime_s": round(time.monotonic() - started, 3)})
+                    self._send(200, "application/json", body.encode("utf-8"))
+                elif path == "/metrics":
+                    body = metrics.to_prometheus()
+                    self._send(200, "text/plain; version=0.0.4; charset=utf-8", body.encode("utf-8"))
+                else:
+                    self.send_error(404)
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?", 1)[0] != "/search":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    self.send_error(413)
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"null")
+                    records = lookup(payload)
+                except ValueError as exc:
+                    self._send(400, "application/json", json.dumps({"error": str(exc)}).encode("utf-8"))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for record in records:
+                        self._chunk((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                    self._chunk(b"")
+                except (BrokenPipeError, ConnectionResetError):
+                    logger.debug("Client went away before its records were sent")
+                    self.close_connection = True
+                except Exception as exc:
+                    logger.exception("Lookup failed while streaming its records")
+                    try:
+                        self._chunk((json.dumps({"error": str(exc)}) + "\n").encode("utf-8"))
+                        self._chunk(b"")
+                    except OSError:
+                        self.close_connection = True
+                finally:
+                    close = getattr(records, "close", None)
+                    if close is not None:
+                        close()
+
+            def _send(self, status: int, content_type: str, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _chunk(self, data: bytes) -> None:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def __enter__(self) -> "ScrapeServer":
+        self._thread.start()
+        logger.info("Serving the scrape API on port %d", self.port)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
+
+    def wait(self) -> None:
+        """Blocks until the server is stopped, e.g. by Ctrl+C."""
+        try:
+            while self._thread.is_alive():
+                self._thread.join(0.5)
+        except KeyboardInterrupt:
+            logger.info("Shutting down")
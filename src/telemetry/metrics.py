@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("metrics")
+
+# Latency bucket upper bounds in seconds, shared by every histogram.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PROMETHEUS_PREFIX = "bing_scraper_"
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+class Histogram:
+    """Fixed-bucket latency histogram with count, sum, min and max."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Returns (le, cumulative count) pairs ending with +Inf."""
+        running = 0
+        pairs: List[Tuple[str, int]] = []
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            running += count
+            pairs.append((repr(bound), running))
+        pairs.append(("+Inf", self.count))
+        return pairs
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_s": self.sum,
+            "mean_s": self.sum / self.count if self.count else 0.0,
+            "min_s": self.min,
+            "max_s": self.max,
+            "buckets": dict(self.cumulative()),
+        }
+
+class RunMetrics:
+    """
+    Thread-safe counters, gauges and latency histograms for one scraper run.
+
+    Metric names are plain identifiers such as ``stage_seconds``; keyword
+    labels (``stage="fetch"``) split a metric into series. ``snapshot()``
+    returns a JSON-ready dict and ``to_prometheus()`` renders the text
+    exposition format.
+    """
+
+    def __init__(self, clock: Any = time.perf_counter) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started_at = clock()
+        self.finished_at: Optional[float] = None
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self.gauges.setdefault(name, {})[key] = value
+
+    def gauge_value(self, name: str, **labels: Any) -> Optional[float]:
+        with self._lock:
+            return self.gauges.get(name, {}).get(_label_key(labels))
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str, **labels: Any) -> Iterator[None]:
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self._clock() - started, **labels)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        with self._lock:
+            return self.counters.get(name, {}).get(_label_key(labels), 0)
+
+    def finish(self) -> None:
+        self.finished_at = self._clock()
+
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else self._clock()
+        return max(end - self.started_at, 1e-9)
+
+    def pages_per_second(self) -> float:
+        return self.counter_value("pages_parsed_total") / self.elapsed()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in sorted(self.counters.items())
+            }
+            gauges = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in sorted(self.gauges.items())
+            }
+            histograms = {
+                name: [{"labels": dict(key), **histogram.as_dict()} for key, histogram in series.items()]
+                for name, series in sorted(self.histograms.items())
+            }
+        return {
+            "elapsed_s": self.elapsed(),
+            "pages_per_second": self.pages_per_second(),
+            "counters": counters,
+            "gauges": gauges,
+            "histograms": histograms,
+        }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+
+        def labels_text(key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = key + extra
+            if not pairs:
+                return ""
+            body = ",".join(f'{name}="{value}"' for name, value in pairs)
+            return "{" + body + "}"
+
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                metric = PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in series.items():
+                    lines.append(f"{metric}{labels_text(key)} {value}")
+            for name, series in sorted(self.gauges.items()):
+                metric = PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} gauge")
+                for key, value in series.items():
+                    lines.append(f"{metric}{labels_text(key)} {value}")
+            for name, series in sorted(self.histograms.items()):
+                metric = PROMETHEUS_PREFIX + name
+                lines.append(f"# TYPE {metric} histogram")
+                for key, histogram in series.items():
+                    for le, count in histogram.cumulative():
+                        lines.append(f"{metric}_bucket{labels_text(key, (('le', le),))} {count}")
+                    lines.append(f"{metric}_sum{labels_text(key)} {histogram.sum}")
+                    lines.append(f"{metric}_count{labels_text(key)} {histogram.count}")
+
+        metric = PROMETHEUS_PREFIX + "pages_per_second"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {self.pages_per_second()}")
+        return "\n".join(lines) + "\n"
+
+def write_metrics_file(metrics: RunMetrics, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metrics.snapshot(), f, indent=2)
+    logger.info("Metrics written to %s", path)
+
+class MetricsServer:
+    """Serves ``RunMetrics`` in Prometheus text format on ``/metrics``."""
+
+    def __init__(self, metrics: RunMetrics, port: int, host: str = "127.0.0.1") -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def __enter__(self) -> "MetricsServer":
+        self._thread.start()
+        logger.info("Serving Prometheus metrics on port %d", self.port)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
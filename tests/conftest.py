@@ -0,0 +1,168 @@
+import html
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+# Ensure we can import from src
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(PROJECT_ROOT, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+def render_serp(keyword: str, first: int) -> str:
+    """Renders a small, deterministic Bing-like SERP for a keyword and offset."""
+    safe = html.escape(keyword)
+    items = "".join(
+        f'<li class="b_algo"><h2><a href="https://example.com/{first + i}?q={safe}">'
+        f"{safe} result {first + i}</a></h2><p>Snippet {first + i} for {safe}</p></li>"
+        for i in range(10)
+    )
+    return (
+        "<html><body>"
+        f'<ol id="b_results">{items}</ol>'
+        f'<ul class="b_vList"><li><a href="/search?q={safe}+near+me">{safe} near me</a></li></ul>'
+        "</body></html>"
+    )
+
+class StubBingServer:
+    """
+    Local HTTP server that answers /search requests with rendered SERPs.
+
+    Every response is delayed by ``delay`` seconds to simulate network
+    latency, and the peak number of concurrent requests is recorded.
+    Responses queued in ``scripted`` as (status, headers) are served
+    before normal SERPs, which lets tests simulate throttling.
+
+    Setting ``max_rate`` makes the server throttle like Bing does: a request
+    arriving less than ``1 / max_rate`` seconds after the last accepted one
+    gets a 429, counted in ``throttled``.
+
+    ``page_limits`` maps a keyword to (real pages, overflow): requests past
+    the last real page get either an empty SERP (``"empty"``) or a repeat
+    of the last real page (``"repeat"``), like long-tail keywords on Bing.
+
+    ``trailer`` is appended to every SERP, standing in for the scripts Bing
+    sends after the results.
+    """
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.requests: List[str] = []
+        self.request_headers: List[Dict[str, str]] = []
+        self.client_ports: Set[int] = set()
+        self.scripted: List[Tuple[int, Dict[str, str]]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.max_rate: Optional[float] = None
+        self.throttled = 0
+        self.page_limits: Dict[str, Tuple[int, str]] = {}
+        self.trailer = ""
+        self._last_accepted = float("-inf")
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                with stub._lock:
+                    stub.requests.append(self.path)
+                    stub.request_headers.append(dict(self.headers))
+                    stub.client_ports.add(self.client_address[1])
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    scripted = stub.scripted.pop(0) if stub.scripted else None
+                    if scripted is None and stub.max_rate:
+                        now = time.monotonic()
+                        if now - stub._last_accepted < 1.0 / stub.max_rate:
+                            stub.throttled += 1
+                            scripted = (429, {})
+                        else:
+                            stub._last_accepted = now
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    if scripted is not None:
+                        status, headers = scripted
+                        self.send_response(status)
+                        for name, value in headers.items():
+                            self.send_header(name, value)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    query = parse_qs(urlsplit(self.path).query)
+                    keyword = query.get("q", [""])[0]
+                    first = int(query.get("first", ["1"])[0])
+                    body = render_serp(keyword, first).encode("utf-8")
+                    if keyword in stub.page_limits:
+                        last_page, overflow = stub.page_limits[keyword]
+                        if first > last_page * 10:
+                            if overflow == "empty":
+                                body = b"<html><body><ol id='b_results'></ol></body></html>"
+                            else:
+                                body = render_serp(keyword, (last_page - 1) * 10 + 1).encode("utf-8")
+                    body += stub.trailer.encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/search"
+
+    def start(self) -> "StubBingServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub_server() -> Iterator[StubBingServer]:
+    server = StubBingServer().start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+@pytest.fixture
+def write_run_files(tmp_path: Any, stub_server: StubBingServer):
+    """Writes a config pointing at the stub server plus an input file."""
+
+    def _write(jobs: List[Dict[str, Any]], **config_overrides: Any) -> Dict[str, str]:
+        config = {
+            "bing_base_url": stub_server.base_url,
+            "timeout": 5,
+            "max_retries": 1,
+            "default_output_dir": str(tmp_path / "out"),
+        }
+        config.update(config_overrides)
+        config_path = tmp_path / "settings.json"
+        input_path = tmp_path / "input.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
+        input_path.write_text(json.dumps({"queries": jobs}), encoding="utf-8")
+        return {"config_path": str(config_path), "input_path": str(input_path)}
+
+    return _write
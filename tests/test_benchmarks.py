@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+
+# The benchmark package lives at the project root, next to src/.
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks import run as bench_run  # noqa: E402
+from benchmarks.corpus import generate_serp  # noqa: E402
+from extractors.bing_parser import PARSER_BACKENDS, BingSearchParser  # type: ignore  # noqa: E402
+
+def test_generated_serp_is_deterministic_full_size_and_covers_every_section() -> None:
+    page = generate_serp(42, "pizza", target_kb=150)
+
+    assert page == generate_serp(42, "pizza", target_kb=150)
+    assert page != generate_serp(43, "pizza", target_kb=150)
+    assert len(page) >= 150 * 1024
+
+    record = BingSearchParser().parse(page, "pizza", 1, "https://www.bing.com/search?q=pizza")
+    for section in ("organicResults", "relatedQueries", "peopleAlsoAsk", "images", "videos", "news"):
+        assert record[section], section
+    assert record["wikiResults"]["url"].startswith("https://en.wikipedia.org/")
+
+def test_backends_agree_on_generated_serps() -> None:
+    for seed in range(3):
+        page = generate_serp(seed, target_kb=40)
+        records = [BingSearchParser(backend=b).parse(page, "k", 1, "u") for b in PARSER_BACKENDS]
+        assert all(record == records[0] for record in records)
+
+def test_quick_run_emits_json_report(tmp_path) -> None:
+    output = tmp_path / "bench.json"
+    bench_run.main(["--quick", "--target-kb", "20", "-o", str(output)])
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    names = {result["name"] for result in report["results"]}
+    assert "parse[html.parser,single_pass]" in names
+    assert "parse_wiki_results" in names
+    assert "export[xlsx]" in names
+    assert "run_scraper[serial]" in names
+    assert all(result["median_s"] > 0 for result in report["results"])
@@ -1,4 +1,4 @@
-thonimport json
+import json
 import os
 import sys
 from typing import Any, Dict
@@ -125,4 +125,32 @@ def test_parser_handles_empty_html() -> None:
     assert record["peopleAlsoAsk"] == []
     assert record["images"] == []
     assert record["videos"] == []
-    assert record["news"] == []
\ No newline at end of file
+    assert record["news"] == []
+
+EDGE_CASE_HTML = """
+<html>
+  <body>
+    <li class="b_algo"><h2><a>No link</a></h2></li>
+    <li class="b_algo other"><h2><a href="https://a.example">A</a></h2><p>First</p><p>Second</p></li>
+    <ul class="b_rs related">
+      <li><a href="/search?q=one">one</a></li>
+      <li><a href="/search?q=one">one</a></li>
+      <li>no anchor</li>
+    </ul>
+    <div class="paa"><dl><dt>Fallback question?</dt><dd>Fallback answer.</dd></dl></div>
+    <div class="image_result"><div class="imgres"><a href="https://img.example/1">nested</a></div></div>
+    <li class="video"><a href="https://vid.example/1">Clip</a><span class="views">5</span></li>
+    <div class="news-card"><span class="provider">Wire</span></div>
+    <div class="wiki-panel"><h1>Second</h1></div>
+    <div class="b_entityPanel"><h2>Ignored</h2><a href="https://example.com/x">x</a></div>
+  </body>
+</html>
+"""
+
+@pytest.mark.parametrize("html", [SAMPLE_HTML, EDGE_CASE_HTML, ""])
+def test_single_pass_matches_per_section_selects(html: str) -> None:
+    url = "https://www.bing.com/search?q=test"
+    single_pass = BingSearchParser(single_pass=True).parse(html, "test", 1, url)
+    per_section = BingSearchParser(single_pass=False).parse(html, "test", 1, url)
+
+    assert single_pass == per_section
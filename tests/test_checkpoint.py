@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+import pytest
+from openpyxl import load_workbook
+
+from conftest import SRC_DIR
+from main import run_scraper  # type: ignore
+from outputs.checkpoint import CheckpointJournal  # type: ignore
+from outputs.export_xlsx import XlsxWriter  # type: ignore
+
+JOBS_A = [{"keyword": "dumplings", "pages": 2}]
+JOBS_AB = JOBS_A + [{"keyword": "noodles", "pages": 2}]
+
+def _write_input(tmp_path: Any, name: str, jobs: List[Dict[str, Any]]) -> str:
+    path = tmp_path / name
+    path.write_text(json.dumps({"queries": jobs}), encoding="utf-8")
+    return str(path)
+
+def _page(keyword: str, page: int) -> Dict[str, Any]:
+    results = [{"title": f"{keyword} {page}.{i}", "url": f"https://e.example/{i}", "description": ""} for i in range(3)]
+    return {"keyword": keyword, "pageNumber": page, "organicResults": results}
+
+def _organic_rows(path: Any) -> List[tuple]:
+    wb = load_workbook(path, read_only=True)
+    try:
+        return [row[:3] for row in wb["Organic Results"].iter_rows(min_row=2, values_only=True)]
+    finally:
+        wb.close()
+
+def _run(files: Dict[str, str], input_path: str, output_dir: Any, output_format: str, resume: bool) -> Dict[str, Any]:
+    return run_scraper(
+        config_path=files["config_path"],
+        input_path=input_path,
+        output_format=output_format,
+        output_dir=str(output_dir),
+        resume=resume,
+    )
+
+@pytest.mark.parametrize("output_format", ["all", "jsonl"])
+def test_resume_skips_completed_pages_and_appends(tmp_path, stub_server, write_run_files, output_format: str) -> None:
+    files = write_run_files(JOBS_AB)
+    partial_input = _write_input(tmp_path, "partial.json", JOBS_A)
+    resumed, fresh = tmp_path / "resumed", tmp_path / "fresh"
+
+    _run(files, partial_input, resumed, output_format, resume=False)
+    # Simulate a crash mid-write: partial bytes after the last journaled record.
+    for suffix in (".jsonl", ".csv", ".json"):
+        path = resumed / f"bing_results{suffix}"
+        if path.exists():
+            with path.open("a", encoding="utf-8") as f:
+                f.write('{"keyword": "torn')
+    requests_before = len(stub_server.requests)
+
+    summary = _run(files, files["input_path"], resumed, output_format, resume=True)
+    assert summary["resumed_pages"] == 2
+    assert summary["records"] == 2
+    assert len(stub_server.requests) - requests_before == 2
+
+    _run(files, files["input_path"], fresh, output_format, resume=False)
+    for suffix in (".json", ".jsonl", ".csv"):
+        if (fresh / f"bing_results{suffix}").exists():
+            assert (resumed / f"bing_results{suffix}").read_text(encoding="utf-8") == (
+                fresh / f"bing_results{suffix}"
+            ).read_text(encoding="utf-8")
+    if output_format == "all":
+        resumed_rows = list(load_workbook(resumed / "bing_results.xlsx", read_only=True).active.values)
+        fresh_rows = list(load_workbook(fresh / "bing_results.xlsx", read_only=True).active.values)
+        assert resumed_rows == fresh_rows
+
+def test_resume_with_everything_done_fetches_nothing(tmp_path, stub_server, write_run_files) -> None:
+    files = write_run_files(JOBS_A)
+    _run(files, files["input_path"], tmp_path / "out", "json", resume=False)
+    requests_before = len(stub_server.requests)
+
+    summary = _run(files, files["input_path"], tmp_path / "out", "json", resume=True)
+
+    assert summary["records"] == 0
+    assert len(stub_server.requests) == requests_before
+    data = json.loads((tmp_path / "out" / "bing_results.json").read_text(encoding="utf-8"))
+    assert [(r["keyword"], r["pageNumber"]) for r in data] == [("dumplings", 1), ("dumplings", 2)]
+
+def test_journal_ignores_torn_last_line(tmp_path) -> None:
+    path = tmp_path / "run.checkpoint.jsonl"
+    with CheckpointJournal(str(path)) as journal:
+        journal.record("a", 1, {"out.jsonl": 10})
+        journal.record("a", 2, {"out.jsonl": 20})
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"keyword": "a", "pageN')
+
+    with CheckpointJournal(str(path), resume=True) as journal:
+        assert journal.is_done("a", 2)
+        assert not journal.is_done("a", 3)
+        assert journal.positions == {"out.jsonl": 20}
+        journal.record("a", 3, {"out.jsonl": 30})
+
+    with CheckpointJournal(str(path), resume=True) as journal:
+        assert journal.is_done("a", 3)
+        assert journal.positions == {"out.jsonl": 30}
+
+def test_xlsx_resume_ignores_a_workbook_left_by_an_earlier_run(tmp_path) -> None:
+    path = str(tmp_path / "out" / "bing_results.xlsx")
+    with XlsxWriter(path) as writer:
+        for page in (1, 2, 3):
+            writer.write(_page("old", page))
+
+    # A fresh run is killed after journaling two pages; its workbook is never saved.
+    script = (
+        "import json, os, sys\n"
+        "from test_checkpoint import _page\n"
+        "from outputs.export_xlsx import XlsxWriter\n"
+        "writer = XlsxWriter(sys.argv[1])\n"
+        "writer.write(_page('kw', 1))\n"
+        "writer.write(_page('kw', 2))\n"
+        "print(json.dumps(writer.position()), flush=True)\n"
+        "writer.write(_page('kw', 3))\n"
+        "os.kill(os.getpid(), 9)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([SRC_DIR, os.path.dirname(__file__)])}
+    crashed = subprocess.run([sys.executable, "-c", script, path], capture_output=True, text=True, env=env)
+    assert crashed.returncode == -9
+    journaled = json.loads(crashed.stdout)
+
+    with XlsxWriter(path, resume_from=journaled) as writer:
+        writer.write(_page("kw", 3))
+
+    assert [row[0] for row in _organic_rows(path)] == ["kw"] * 9
+    assert [row[1] for row in _organic_rows(path)] == [1, 1, 1, 2, 2, 2, 3, 3, 3]
+    assert not (tmp_path / "out" / "bing_results.xlsx.rows.jsonl").exists()
+
+def test_xlsx_resume_refuses_a_workbook_that_does_not_match_the_journal(tmp_path) -> None:
+    path = str(tmp_path / "out" / "bing_results.xlsx")
+    with XlsxWriter(path) as writer:
+        writer.write(_page("kw", 1))
+        short = writer.position()
+
+    with pytest.raises(RuntimeError):
+        XlsxWriter(path, resume_from={**short, "Organic Results": 10})
+
+    # After a clean finish the saved workbook is what the journal describes.
+    with XlsxWriter(path, resume_from=short) as writer:
+        writer.write(_page("kw", 2))
+    assert len(_organic_rows(path)) == 6
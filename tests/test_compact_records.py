@@ -0,0 +1,52 @@
+import gc
+import json
+import os
+import pickle
+import sys
+import tracemalloc
+from typing import Any, Callable, List
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from extractors.bing_parser import BingSearchParser  # type: ignore  # noqa: E402
+from extractors.records import OrganicResult, ParsedResult  # type: ignore  # noqa: E402
+
+PAGES = generate_corpus(20, seed=7, target_kb=20)
+
+def _retained_bytes_per_record(build: Callable[[str, int], Any]) -> float:
+    """Bytes still allocated per record once every page is parsed and kept."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        kept: List[Any] = [build(page, i) for i, page in enumerate(PAGES)]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    assert len(kept) == len(PAGES)
+    return retained / len(kept)
+
+def test_compact_records_use_less_memory_than_dicts() -> None:
+    parser = BingSearchParser()
+    as_dicts = _retained_bytes_per_record(lambda page, i: parser.parse(page, "k", i, f"u{i}"))
+    compact = _retained_bytes_per_record(lambda page, i: parser.parse_result(page, "k", i, f"u{i}"))
+
+    assert compact / as_dicts < 0.85, f"bytes per record: dict {as_dicts:.0f}, compact {compact:.0f}"
+
+def test_compact_record_round_trips_to_the_same_output() -> None:
+    parser = BingSearchParser()
+    record = parser.parse(PAGES[0], "pizza", 1, "https://www.bing.com/search?q=pizza")
+    result = parser.parse_result(PAGES[0], "pizza", 1, "https://www.bing.com/search?q=pizza")
+
+    assert json.dumps(result.as_dict()) == json.dumps(record)
+    assert isinstance(result.organic_results[0], OrganicResult)
+    assert not hasattr(result, "__dict__")
+
+    restored = pickle.loads(pickle.dumps(result))
+    assert restored == result
+    assert restored.keyword is sys.intern("pizza")
+    assert ParsedResult.from_sections(result.url, "pizza", 1, result.sections()) == result
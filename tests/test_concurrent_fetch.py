@@ -0,0 +1,93 @@
+import json
+from typing import Any
+
+import requests
+
+from fetchers.pool import ConcurrentFetcher, PageTask  # type: ignore
+from main import run_scraper  # type: ignore
+
+JOBS = [{"keyword": f"pizza place {i}", "pages": 2} for i in range(6)]
+
+def _run(files: dict, output_dir: Any, concurrency: int) -> None:
+    run_scraper(
+        config_path=files["config_path"],
+        input_path=files["input_path"],
+        output_format="json",
+        output_dir=str(output_dir),
+        concurrency=concurrency,
+        per_host_limit=concurrency,
+    )
+
+def test_concurrent_run_matches_serial_and_overlaps_requests(tmp_path, stub_server, write_run_files) -> None:
+    stub_server.delay = 0.1
+    files = write_run_files(JOBS)
+
+    _run(files, tmp_path / "serial", concurrency=1)
+    assert stub_server.max_in_flight == 1
+    _run(files, tmp_path / "concurrent", concurrency=6)
+
+    serial = json.loads((tmp_path / "serial" / "bing_results.json").read_text(encoding="utf-8"))
+    concurrent = json.loads((tmp_path / "concurrent" / "bing_results.json").read_text(encoding="utf-8"))
+
+    assert len(serial) == 12
+    assert concurrent == serial
+    assert [(r["keyword"], r["pageNumber"]) for r in concurrent] == [
+        (job["keyword"], page) for job in JOBS for page in (1, 2)
+    ]
+    # Each response is held for 100ms, so six workers keep several requests open at once.
+    assert 1 < stub_server.max_in_flight <= 6
+
+def test_per_host_limit_caps_in_flight_requests(stub_server) -> None:
+    stub_server.delay = 0.05
+    fetcher = ConcurrentFetcher(
+        lambda url: requests.get(url, timeout=5).text,
+        concurrency=8,
+        per_host_limit=2,
+    )
+    tasks = [
+        PageTask(job_index=i, keyword=f"k{i}", page_number=1, url=f"{stub_server.base_url}?q=k{i}")
+        for i in range(10)
+    ]
+
+    outcomes = list(fetcher.map(tasks))
+
+    assert [o.task.keyword for o in outcomes] == [f"k{i}" for i in range(10)]
+    assert all(o.error is None for o in outcomes)
+    assert stub_server.max_in_flight <= 2
+
+def test_identical_in_flight_urls_share_one_fetch(tmp_path, stub_server, write_run_files) -> None:
+    stub_server.delay = 0.1
+    jobs = [{"keyword": "pizza", "pages": 2}, {"keyword": "pizza", "pages": 2}, {"keyword": "tacos", "pages": 1}]
+    files = write_run_files(jobs)
+
+    summary = run_scraper(
+        config_path=files["config_path"],
+        input_path=files["input_path"],
+        output_format="json",
+        concurrency=4,
+    )
+
+    records = json.loads((tmp_path / "out" / "bing_results.json").read_text(encoding="utf-8"))
+    assert [(r["keyword"], r["pageNumber"]) for r in records] == [
+        ("pizza", 1), ("pizza", 2), ("pizza", 1), ("pizza", 2), ("tacos", 1)
+    ]
+    assert records[0] == records[2]
+    assert len(stub_server.requests) == 3
+    assert summary["metrics"]["counters"]["fetch_coalesced_total"][0]["value"] == 2
+
+def test_dedupe_jobs_collapses_case_and_spacing_variants(tmp_path, stub_server, write_run_files) -> None:
+    jobs = [
+        {"keyword": "NYC pizza", "pages": 1},
+        {"keyword": "tacos", "pages": 1},
+        {"keyword": "nyc  pizza", "pages": 3},
+        {"keyword": "NYC Pizza ", "pages": 2},
+    ]
+    files = write_run_files(jobs, dedupe_jobs=True)
+
+    summary = run_scraper(config_path=files["config_path"], input_path=files["input_path"], output_format="json")
+
+    records = json.loads((tmp_path / "out" / "bing_results.json").read_text(encoding="utf-8"))
+    assert summary["jobs"] == 2
+    assert [(r["keyword"], r["pageNumber"]) for r in records] == [
+        ("NYC pizza", 1), ("NYC pizza", 2), ("NYC pizza", 3), ("tacos", 1)
+    ]
@@ -0,0 +1,166 @@
+import json
+
+import pytest
+
+from main import run_scraper  # type: ignore
+from outputs.delta import DeltaIndex, rank_changes  # type: ignore
+
+def _record(urls, news=(), page_number=1) -> dict:
+    return {
+        "url": "https://www.bing.com/search?q=pizza",
+        "keyword": "pizza",
+        "pageNumber": page_number,
+        "organicResults": [{"title": url, "url": url, "description": ""} for url in urls],
+        "news": [{"headline": headline, "url": "", "source": ""} for headline in news],
+        "wikiResults": None,
+    }
+
+def _observe(index: DeltaIndex, record: dict):
+    delta = index.observe(record)
+    index.commit(record["keyword"], record["pageNumber"])
+    return delta
+
+def test_unchanged_pages_are_dropped_and_changes_are_annotated(tmp_path) -> None:
+    path = str(tmp_path / "index.sqlite3")
+    with DeltaIndex(path) as index:
+        first = _observe(index, _record(["a", "b", "c"]))
+        assert first["changeType"] == "new" and first["rankChanges"] == []
+        assert _observe(index, _record(["a", "b", "c"])) is None
+
+    with DeltaIndex(path) as index:
+        assert _observe(index, _record(["a", "b", "c"], news=["Pizza day"]))["changedSections"] == ["news"]
+        changed = _observe(index, _record(["b", "a", "d"], news=["Pizza day"]))
+        assert changed["changedSections"] == ["organicResults"]
+        assert changed["rankChanges"] == [
+            {"url": "b", "previousRank": 2, "rank": 1},
+            {"url": "a", "previousRank": 1, "rank": 2},
+            {"url": "d", "previousRank": None, "rank": 3},
+            {"url": "c", "previousRank": 3, "rank": None},
+        ]
+        assert index.counts == {"new": 0, "changed": 2, "unchanged": 0}
+
+    assert rank_changes({"a": 1, "b": 2}, {"a": 1, "b": 2}) == []
+
+def _moved_down(rank: int) -> dict:
+    return {"url": f"u{rank}", "previousRank": rank, "rank": rank + 1}
+
+def test_rank_moves_span_the_pages_of_a_keyword(tmp_path) -> None:
+    page_1 = [f"u{rank}" for rank in range(1, 11)]
+    page_2 = [f"u{rank}" for rank in range(11, 21)]
+    with DeltaIndex(str(tmp_path / "index.sqlite3")) as index:
+        _observe(index, _record(page_1))
+        _observe(index, _record(page_2, page_number=2))
+
+    # A new result on top of page 1 pushes u10 onto page 2 and u20 off it.
+    for pages in ([1, 2], [2, 1]):
+        with DeltaIndex(str(tmp_path / "index.sqlite3")) as index:
+            changes = {}
+            for page_number in pages:
+                urls = (["new"] + page_1[:9]) if page_number == 1 else (page_1[9:] + page_2[:9])
+                changes[page_number] = _observe(index, _record(urls, page_number=page_number))["rankChanges"]
+
+        dropped = {"url": "u20", "previousRank": 20, "rank": None}
+        assert changes[1][0] == {"url": "new", "previousRank": None, "rank": 1}
+        assert changes[1][1:10] == [_moved_down(rank) for rank in range(1, 10)]
+        assert changes[2][:10] == [_moved_down(rank) for rank in range(10, 20)]
+        # The page seen last reports what left the keyword.
+        assert changes[pages[-1]][-1] == dropped and dropped not in changes[pages[0]]
+
+        with DeltaIndex(str(tmp_path / "index.sqlite3")) as index:
+            _observe(index, _record(page_1))
+            _observe(index, _record(page_2, page_number=2))
+
+def test_moves_onto_new_pages_and_drops_are_reported(tmp_path) -> None:
+    with DeltaIndex(str(tmp_path / "index.sqlite3")) as index:
+        _observe(index, _record(["a", "b"]))
+        assert _observe(index, _record(["c"], page_number=2))["rankChanges"] == [
+            {"url": "c", "previousRank": None, "rank": 11}
+        ]
+
+    with DeltaIndex(str(tmp_path / "index.sqlite3")) as index:
+        assert _observe(index, _record(["a"]))["rankChanges"] == []
+        # Page 2 itself is unchanged, but it completes the keyword, so it lists what left it.
+        last = _observe(index, _record(["c"], page_number=2))
+        assert last["changedSections"] == []
+        assert last["rankChanges"] == [{"url": "b", "previousRank": 2, "rank": None}]
+
+def test_pages_are_stored_only_once_committed(tmp_path) -> None:
+    path = str(tmp_path / "index.sqlite3")
+    with DeltaIndex(path) as index:
+        _observe(index, _record(["a", "b"]))
+        # Killed after observing a change but before the page was journaled.
+        assert index.observe(_record(["b", "a"]))["changeType"] == "changed"
+
+    with DeltaIndex(path) as index:
+        assert _observe(index, _record(["b", "a"]))["changedSections"] == ["organicResults"]
+        assert index.observe(_record(["b", "a"])) is None
+
+def test_daily_runs_write_only_changed_pages(tmp_path, stub_server, write_run_files) -> None:
+    files = write_run_files([{"keyword": "pizza", "pages": 2}, {"keyword": "tea", "pages": 1}])
+    index = str(tmp_path / "out" / "bing_results.index.sqlite3")
+    delta_path = tmp_path / "out" / "bing_results.delta.jsonl"
+
+    def run() -> dict:
+        return run_scraper(
+            config_path=files["config_path"],
+            input_path=files["input_path"],
+            output_format="jsonl",
+            delta_index=index,
+        )
+
+    summary = run()
+    assert summary["delta"] == {"new": 3, "changed": 0, "unchanged": 0}
+    assert len(delta_path.read_text(encoding="utf-8").splitlines()) == 3
+
+    summary = run()
+    assert summary["delta"] == {"new": 0, "changed": 0, "unchanged": 3}
+    assert summary["records"] == 3
+    assert delta_path.read_text(encoding="utf-8") == ""
+
+    # Page 2 of "pizza" now repeats page 1: its ten results also rank a page lower, and results 11-20 are gone.
+    stub_server.page_limits["pizza"] = (1, "repeat")
+    summary = run()
+    assert summary["delta"] == {"new": 0, "changed": 1, "unchanged": 2}
+    (record,) = [json.loads(line) for line in delta_path.read_text(encoding="utf-8").splitlines()]
+    assert (record["keyword"], record["pageNumber"], record["changeType"]) == ("pizza", 2, "changed")
+    assert "organicResults" in record["changedSections"]
+    moves = [change for change in record["rankChanges"] if change["rank"] is not None]
+    assert [(move["previousRank"], move["rank"]) for move in moves] == [(rank, rank + 10) for rank in range(1, 11)]
+    assert [change["previousRank"] for change in record["rankChanges"][10:]] == list(range(11, 21))
+
+def test_section_runs_compare_only_the_sections_they_parse(tmp_path, stub_server, write_run_files) -> None:
+    jobs = [{"keyword": "pizza", "pages": 2}]
+    index = str(tmp_path / "out" / "bing_results.index.sqlite3")
+
+    def run(**config) -> dict:
+        files = write_run_files(jobs, **config)
+        return run_scraper(
+            config_path=files["config_path"], input_path=files["input_path"], output_format="jsonl", delta_index=index
+        )
+
+    assert run()["delta"] == {"new": 2, "changed": 0, "unchanged": 0}
+    with DeltaIndex(index) as delta:
+        full = delta._db.execute("SELECT sections FROM pages ORDER BY page_number").fetchall()
+
+    assert run(sections=["organic"])["delta"] == {"new": 0, "changed": 0, "unchanged": 2}
+    # The sections the organic-only run skipped keep their full-run fingerprints.
+    with DeltaIndex(index) as delta:
+        assert delta._db.execute("SELECT sections FROM pages ORDER BY page_number").fetchall() == full
+    assert run()["delta"] == {"new": 0, "changed": 0, "unchanged": 2}
+
+    stub_server.page_limits["pizza"] = (1, "repeat")
+    summary = run(sections=["organic"])
+    assert summary["delta"] == {"new": 0, "changed": 1, "unchanged": 1}
+    (record,) = [json.loads(line) for line in (tmp_path / "out" / "bing_results.delta.jsonl").read_text().splitlines()]
+    assert record["changedSections"] == ["organicResults"]
+
+@pytest.mark.parametrize("output_format", ["csv", "xlsx", "all"])
+def test_flat_formats_are_refused_for_delta_runs(tmp_path, write_run_files, output_format) -> None:
+    files = write_run_files([{"keyword": "pizza", "pages": 1}])
+    with pytest.raises(ValueError, match="json or jsonl"):
+        run_scraper(
+            config_path=files["config_path"],
+            input_path=files["input_path"],
+            output_format=output_format,
+            delta_index=str(tmp_path / "index.sqlite3"),
+        )
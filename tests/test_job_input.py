@@ -0,0 +1,69 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import inputs.jobs as jobs_module  # type: ignore
+from inputs.jobs import JobReader  # type: ignore
+from main import run_scraper  # type: ignore
+
+def test_json_lines_and_csv_rows_are_validated_lazily(tmp_path) -> None:
+    jsonl = tmp_path / "jobs.jsonl"
+    jsonl.write_text(
+        '{"keyword": "pizza", "pages": 2}\n'
+        "not json\n"
+        "\n"
+        '{"pages": 3}\n'
+        '{"keyword": "tacos", "pages": "x"}\n'
+        '{"keyword": "ramen"}\n',
+        encoding="utf-8",
+    )
+    reader = JobReader(str(jsonl))
+    assert list(reader) == [{"keyword": "pizza", "pages": 2}, {"keyword": "ramen", "pages": 1}]
+    assert reader.count == 2
+
+    csv_path = tmp_path / "jobs.csv"
+    csv_path.write_text("keyword,pages\nnyc pizza,3\n,2\n\"tacos, al pastor\",\n", encoding="utf-8")
+    assert list(JobReader(str(csv_path))) == [
+        {"keyword": "nyc pizza", "pages": 3},
+        {"keyword": "tacos, al pastor", "pages": 1},
+    ]
+
+    headerless = tmp_path / "bad.csv"
+    headerless.write_text("pizza,1\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(JobReader(str(headerless)))
+
+def test_first_job_is_available_without_reading_the_whole_file(tmp_path, monkeypatch) -> None:
+    big = tmp_path / "big.jsonl"
+    with big.open("w", encoding="utf-8") as f:
+        for i in range(1000):
+            f.write(json.dumps({"keyword": f"keyword {i}", "pages": 1}) + "\n")
+
+    decoded = []
+
+    def loads(line: str) -> dict:
+        decoded.append(line)
+        return json.loads(line)
+
+    monkeypatch.setattr(jobs_module, "json", SimpleNamespace(loads=loads))
+    jobs = iter(JobReader(str(big)))
+
+    assert next(jobs) == {"keyword": "keyword 0", "pages": 1}
+    assert len(decoded) == 1
+    assert next(jobs)["keyword"] == "keyword 1"
+    assert len(decoded) == 2
+
+def test_run_scraper_reads_jsonl_input(tmp_path, stub_server, write_run_files) -> None:
+    files = write_run_files([])
+    input_path = tmp_path / "input.jsonl"
+    input_path.write_text('{"keyword": "gelato", "pages": 2}\n{"keyword": "churros"}\n', encoding="utf-8")
+
+    summary = run_scraper(config_path=files["config_path"], input_path=str(input_path), output_format="json")
+
+    assert summary["jobs"] == 2
+    assert summary["records"] == 3
+
+    (tmp_path / "empty.jsonl").write_text("\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        run_scraper(config_path=files["config_path"], input_path=str(tmp_path / "empty.jsonl"), output_format="json")
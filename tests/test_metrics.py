@@ -0,0 +1,67 @@
+import json
+
+import requests
+
+from main import run_scraper  # type: ignore
+from telemetry.metrics import MetricsServer, RunMetrics  # type: ignore
+
+def _series(snapshot: dict, kind: str, name: str) -> dict:
+    return {
+        tuple(sorted(entry["labels"].items())): entry for entry in snapshot[kind].get(name, [])
+    }
+
+def test_histogram_and_prometheus_rendering() -> None:
+    metrics = RunMetrics()
+    metrics.observe("stage_seconds", 0.004, stage="fetch")
+    metrics.observe("stage_seconds", 0.2, stage="fetch")
+    metrics.inc("fetch_bytes_total", 512)
+
+    fetch = _series(metrics.snapshot(), "histograms", "stage_seconds")[(("stage", "fetch"),)]
+    assert fetch["count"] == 2
+    assert fetch["buckets"]["0.005"] == 1
+    assert fetch["buckets"]["+Inf"] == 2
+
+    text = metrics.to_prometheus()
+    assert "# TYPE bing_scraper_stage_seconds histogram" in text
+    assert 'bing_scraper_stage_seconds_bucket{stage="fetch",le="0.25"} 2' in text
+    assert 'bing_scraper_stage_seconds_count{stage="fetch"} 2' in text
+    assert "bing_scraper_fetch_bytes_total 512" in text
+
+def test_metrics_server_exposes_live_metrics() -> None:
+    metrics = RunMetrics()
+    metrics.inc("pages_fetched_total", 3)
+
+    with MetricsServer(metrics, port=0) as server:
+        body = requests.get(f"http://127.0.0.1:{server.port}/metrics", timeout=5).text
+
+    assert "bing_scraper_pages_fetched_total 3" in body
+
+def test_run_scraper_reports_stage_section_and_fetch_metrics(tmp_path, stub_server, write_run_files) -> None:
+    stub_server.scripted = [(503, {})]
+    files = write_run_files([{"keyword": "gelato", "pages": 2}], max_retries=2, backoff_base=0.01)
+
+    summary = run_scraper(
+        config_path=files["config_path"],
+        input_path=files["input_path"],
+        output_format="all",
+        output_dir=str(tmp_path / "out"),
+    )
+
+    snapshot = summary["metrics"]
+    counters = _series(snapshot, "counters", "pages_parsed_total")
+    assert counters[()]["value"] == 2
+    assert _series(snapshot, "counters", "fetch_retries_total")[()]["value"] == 1
+    assert _series(snapshot, "counters", "fetch_bytes_total")[()]["value"] > 0
+    assert _series(snapshot, "counters", "http_requests_total")[(("status", "503"),)]["value"] == 1
+
+    stages = _series(snapshot, "histograms", "stage_seconds")
+    assert stages[(("stage", "fetch"),)]["count"] == 2
+    assert stages[(("stage", "parse"),)]["count"] == 2
+    assert stages[(("format", "xlsx"), ("stage", "export"))]["count"] == 2
+    assert stages[(("format", "xlsx"), ("stage", "export_close"))]["count"] == 1
+    sections = {labels[0][1] for labels in _series(snapshot, "histograms", "section_seconds")}
+    assert {"tree", "organic", "related", "paa", "images", "videos", "news", "wiki"} <= sections
+    assert summary["pages_per_second"] > 0
+
+    on_disk = json.loads((tmp_path / "out" / "bing_results.metrics.json").read_text(encoding="utf-8"))
+    assert on_disk["counters"]["pages_parsed_total"][0]["value"] == 2
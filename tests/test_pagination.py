@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from fetchers.pagination import PaginationPolicy  # type: ignore
+from fetchers.pool import PageTask  # type: ignore
+from main import run_scraper  # type: ignore
+
+def _task(page: int) -> PageTask:
+    return PageTask(job_index=0, keyword="k", page_number=page, url=f"https://bing.test/?p={page}")
+
+def test_policy_stops_on_repeated_or_empty_pages() -> None:
+    policy = PaginationPolicy(overlap_threshold=0.5)
+    policy.start_job(0, 6)
+
+    assert policy.observe(_task(1), ["a", "b", "c", "d"])
+    assert policy.observe(_task(2), ["c", "e", "f", "g"])
+    assert not policy.is_stopped(0)
+    assert policy.observe(_task(3), ["e", "f", "x", "y"])
+    assert policy.is_stopped(0)
+    assert list(policy.cut_pages(0)) == [4, 5, 6]
+    assert policy.skipped_pages == 3
+    # Pages fetched ahead of the stop are dropped, and were not saved.
+    assert not policy.observe(_task(4), ["z"])
+    policy.discard(_task(5))
+    assert (policy.skipped_pages, policy.dropped_pages) == (1, 2)
+
+    empty = PaginationPolicy()
+    empty.start_job(0, 3)
+    assert empty.observe(_task(1), [])
+    assert empty.skipped_pages == 2
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_run_scraper_stops_exhausted_keywords_early(tmp_path, stub_server, write_run_files, concurrency) -> None:
+    stub_server.page_limits = {"long tail": (2, "repeat"), "rare": (1, "empty")}
+    jobs = [
+        {"keyword": "long tail", "pages": 6},
+        {"keyword": "rare", "pages": 5},
+        {"keyword": "popular", "pages": 3},
+    ]
+    files = write_run_files(jobs, early_stop=True, concurrency=concurrency)
+    out = tmp_path / "out"
+
+    summary = run_scraper(config_path=files["config_path"], input_path=files["input_path"], output_format="json")
+
+    assert summary["records"] == 8
+    # Pages requested ahead of a stop are reported as dropped, not skipped.
+    assert summary["skipped_pages"] + summary["dropped_pages"] == 6
+    assert summary["skipped_pages"] == 14 - len(stub_server.requests)
+    pages = [(r["keyword"], r["pageNumber"]) for r in json.loads((out / "bing_results.json").read_text("utf-8"))]
+    assert pages == [
+        ("long tail", 1), ("long tail", 2), ("long tail", 3),
+        ("rare", 1), ("rare", 2),
+        ("popular", 1), ("popular", 2), ("popular", 3),
+    ]
+    if concurrency == 1:
+        assert len(stub_server.requests) == 8
+        assert summary["dropped_pages"] == 0
+
+    # The cut pages are journaled, so resuming fetches nothing more.
+    fetched = len(stub_server.requests)
+    resumed = run_scraper(
+        config_path=files["config_path"], input_path=files["input_path"], output_format="json", resume=True
+    )
+    assert resumed["resumed_pages"] == 14
+    assert len(stub_server.requests) == fetched
@@ -0,0 +1,111 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SRC_DIR
+from main import run_scraper  # type: ignore
+from outputs.export_csv import export_to_csv  # type: ignore
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from outputs.export_parquet import ParquetWriter, export_to_parquet  # type: ignore  # noqa: E402
+
+RECORDS = [
+    {
+        "keyword": "pizza",
+        "pageNumber": 1,
+        "organicResults": [
+            {"title": "A", "url": "https://a.test", "description": "first"},
+            {"title": "B", "url": "https://b.test", "description": "second"},
+        ],
+        "relatedQueries": [{"text": "pizza near me", "url": "/search?q=pizza+near+me"}],
+        "news": [{"headline": "Pizza news", "url": "https://n.test", "source": "Daily"}],
+        "wikiResults": None,
+    },
+    {"keyword": "tea", "pageNumber": 2, "organicResults": [{"title": "T", "url": "https://t.test", "description": ""}]},
+]
+
+def test_parquet_matches_csv_rows_with_typed_rank_and_page(tmp_path) -> None:
+    export_to_parquet(RECORDS, str(tmp_path / "out.parquet"))
+    export_to_csv(RECORDS, str(tmp_path / "out.csv"))
+
+    table = pq.read_table(str(tmp_path / "out.parquet"))
+    rows = table.to_pylist()
+    with open(tmp_path / "out.csv", newline="", encoding="utf-8") as f:
+        csv_rows = list(csv.DictReader(f))
+
+    assert [{k: v for k, v in row.items() if k != "rank"} for row in rows] == [
+        {**row, "pageNumber": int(row["pageNumber"])} for row in csv_rows
+    ]
+    assert [(row["resultType"], row["rank"]) for row in rows] == [
+        ("organic", 1), ("organic", 2), ("related_query", 1), ("news", 1), ("organic", 1)
+    ]
+    assert str(table.schema.field("pageNumber").type) == "int32"
+
+    metadata = pq.ParquetFile(str(tmp_path / "out.parquet")).metadata.row_group(0)
+    encodings = {metadata.column(i).path_in_schema: metadata.column(i).encodings for i in range(metadata.num_columns)}
+    assert any("DICTIONARY" in e for e in encodings["keyword"])
+    assert not any("DICTIONARY" in e for e in encodings["description"])
+
+def test_rows_are_written_in_row_groups_and_resume_keeps_prefix(tmp_path) -> None:
+    path = tmp_path / "out.parquet"
+    with ParquetWriter(str(path), row_group_size=2) as writer:
+        for record in RECORDS:
+            writer.write(record)
+        kept = writer.position()
+        assert not path.exists()
+        writer.write(RECORDS[1])
+
+    # A group is flushed once 2+ rows are pending after a record: 4 rows, then 2.
+    assert pq.ParquetFile(str(path)).metadata.num_row_groups == 2
+    with ParquetWriter(str(path), resume_from=kept) as writer:
+        writer.write(RECORDS[0])
+    rows = pq.read_table(str(path)).to_pylist()
+    assert len(rows) == kept["rows"] + 4
+    assert [row["keyword"] for row in rows[-5:]] == ["tea", "pizza", "pizza", "pizza", "pizza"]
+
+def test_resume_after_a_kill_ignores_the_previous_file_and_partial(tmp_path) -> None:
+    path = str(tmp_path / "out.parquet")
+    export_to_parquet([dict(RECORDS[1], keyword="old")] * 5, path)
+
+    # A fresh run is killed after journaling one record; the .partial has no footer.
+    script = (
+        "import json, os, sys\n"
+        "from test_parquet_export import RECORDS\n"
+        "from outputs.export_parquet import ParquetWriter\n"
+        "writer = ParquetWriter(sys.argv[1], row_group_size=1)\n"
+        "writer.write(RECORDS[0])\n"
+        "print(json.dumps(writer.position()), flush=True)\n"
+        "writer.write(RECORDS[1])\n"
+        "os.kill(os.getpid(), 9)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([SRC_DIR, os.path.dirname(__file__)])}
+    crashed = subprocess.run([sys.executable, "-c", script, path], capture_output=True, text=True, env=env)
+    assert crashed.returncode == -9
+    journaled = json.loads(crashed.stdout)
+    assert os.path.exists(f"{path}.partial")
+
+    with ParquetWriter(path, resume_from=journaled) as writer:
+        writer.write(RECORDS[1])
+
+    assert [row["keyword"] for row in pq.read_table(path).to_pylist()] == ["pizza"] * 4 + ["tea"]
+    assert not os.path.exists(f"{path}.partial")
+    assert not os.path.exists(f"{path}.rows.jsonl")
+
+    with pytest.raises(RuntimeError):
+        ParquetWriter(path, resume_from={"rows": 6})
+    assert not os.path.exists(f"{path}.partial")
+
+def test_run_scraper_writes_parquet(tmp_path, stub_server, write_run_files) -> None:
+    files = write_run_files([{"keyword": "gelato", "pages": 2}])
+
+    run_scraper(config_path=files["config_path"], input_path=files["input_path"], output_format="parquet")
+
+    table = pq.read_table(str(tmp_path / "out" / "bing_results.parquet"))
+    organic = [row for row in table.to_pylist() if row["resultType"] == "organic"]
+    assert len(organic) == 20
+    assert organic[10]["pageNumber"] == 2 and organic[10]["rank"] == 1
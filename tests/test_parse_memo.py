@@ -0,0 +1,114 @@
+import json
+import sqlite3
+import zlib
+from typing import Any, Dict
+
+from conftest import render_serp
+from extractors.bing_parser import PARSER_VERSION, BingSearchParser  # type: ignore
+from extractors.memo import ParseMemo  # type: ignore
+
+HTML = render_serp("tapas", 1)
+
+def _parse(parser: BingSearchParser, keyword: str, page_number: int = 1) -> Dict[str, Any]:
+    return parser.parse(HTML, keyword, page_number, f"https://www.bing.com/search?q={keyword}")
+
+def test_hit_skips_parsing_and_rewrites_page_fields(monkeypatch) -> None:
+    memo = ParseMemo(PARSER_VERSION)
+    parser = BingSearchParser(memo=memo)
+    first = _parse(parser, "tapas")
+
+    def fail(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("BeautifulSoup should not run on a memo hit")
+
+    monkeypatch.setattr("extractors.bing_parser.BeautifulSoup", fail)
+    second = _parse(parser, "tapas near me", page_number=2)
+
+    assert memo.hits == 1
+    assert list(second) == list(first)
+    assert second["keyword"] == "tapas near me"
+    assert second["pageNumber"] == 2
+    assert second["url"].endswith("q=tapas near me")
+    assert second["organicResults"] == first["organicResults"]
+    # Hits are independent copies.
+    second["organicResults"].clear()
+    assert _parse(parser, "tapas")["organicResults"] == first["organicResults"]
+
+def test_memory_tier_is_lru_bounded() -> None:
+    memo = ParseMemo(PARSER_VERSION, max_entries=2)
+    for name in ("a", "b", "c"):
+        memo.put(name, {"value": name})
+
+    assert memo.get("a") is None
+    assert memo.get("c") == {"value": "c"}
+
+def test_disk_tier_survives_and_version_bump_invalidates(tmp_path) -> None:
+    memo = ParseMemo("1", max_entries=0, directory=str(tmp_path))
+    _parse(BingSearchParser(memo=memo), "tapas")
+    memo.close()
+
+    reopened = ParseMemo("1", directory=str(tmp_path))
+    _parse(BingSearchParser(memo=reopened), "tapas")
+    assert reopened.hits == 1
+    reopened.close()
+
+    bumped = ParseMemo("2", directory=str(tmp_path))
+    _parse(BingSearchParser(memo=bumped), "tapas")
+    assert (bumped.hits, bumped.misses) == (0, 1)
+    bumped.close()
+
+def test_backends_do_not_share_entries() -> None:
+    memo = ParseMemo(PARSER_VERSION)
+    _parse(BingSearchParser(memo=memo), "tapas")
+    _parse(BingSearchParser(backend="lxml-native", memo=memo), "tapas")
+
+    assert memo.hits == 0
+
+def test_disk_errors_are_logged_and_parsing_continues(tmp_path) -> None:
+    memo = ParseMemo(PARSER_VERSION, directory=str(tmp_path))
+    path = str(tmp_path / "parse_memo.sqlite3")
+    memo._db.close()
+    memo._db = sqlite3.connect(path, timeout=0, check_same_thread=False)
+    other = sqlite3.connect(path)
+    other.execute("BEGIN EXCLUSIVE")
+
+    record = _parse(BingSearchParser(memo=memo), "tapas")
+
+    assert record["organicResults"]
+    # Both the lookup and the store hit the lock.
+    assert memo.disk_errors == 2
+    # The memory tier still serves the page.
+    _parse(BingSearchParser(memo=memo), "tapas")
+    assert memo.hits == 1
+    other.rollback()
+    other.close()
+    memo.close()
+
+def test_locked_disk_tier_falls_back_to_memory_on_open(tmp_path) -> None:
+    ParseMemo(PARSER_VERSION, directory=str(tmp_path)).close()
+    other = sqlite3.connect(str(tmp_path / "parse_memo.sqlite3"))
+    other.execute("BEGIN EXCLUSIVE")
+
+    memo = ParseMemo(PARSER_VERSION, directory=str(tmp_path), timeout=0)
+
+    assert memo._db is None and memo.disk_errors == 1
+    _parse(BingSearchParser(memo=memo), "tapas")
+    _parse(BingSearchParser(memo=memo), "tapas")
+    assert memo.hits == 1
+    other.rollback()
+    other.close()
+    memo.close()
+
+def test_disk_tier_evicts_least_recently_used_entries(tmp_path) -> None:
+    clock = iter(range(100)).__next__
+    payloads = {name: {"value": name * 2000} for name in "abc"}
+    entry_size = max(len(zlib.compress(json.dumps(p).encode("utf-8"))) for p in payloads.values())
+    memo = ParseMemo(PARSER_VERSION, max_entries=0, directory=str(tmp_path), max_bytes=2 * entry_size, clock=clock)
+
+    memo.put("a", payloads["a"])
+    memo.put("b", payloads["b"])
+    assert memo.get("a") == payloads["a"]
+    memo.put("c", payloads["c"])
+
+    assert memo.get("b") is None
+    assert memo.get("a") == payloads["a"] and memo.get("c") == payloads["c"]
+    memo.close()
@@ -0,0 +1,67 @@
+import json
+from typing import Iterator, List
+
+import pytest
+
+from conftest import render_serp
+from extractors.parse_pool import ParseStage  # type: ignore
+from fetchers.pool import FetchOutcome, PageTask  # type: ignore
+from main import run_scraper  # type: ignore
+
+def _outcomes(count: int, pulled: List[int]) -> Iterator[FetchOutcome]:
+    for i in range(count):
+        pulled.append(i)
+        task = PageTask(job_index=i, keyword=f"k{i}", page_number=1, url=f"https://www.bing.com/search?q=k{i}")
+        if i == 3:
+            yield FetchOutcome(task=task, error=RuntimeError("fetch failed"))
+        else:
+            yield FetchOutcome(task=task, html=render_serp(f"k{i}", 1))
+
+def test_process_pool_preserves_order_and_matches_inline() -> None:
+    inline = list(ParseStage(workers=0).map(_outcomes(8, [])))
+    pooled = list(ParseStage(workers=2).map(_outcomes(8, [])))
+
+    assert [o.task.keyword for o, _ in pooled] == [f"k{i}" for i in range(8)]
+    assert [r for _, r in pooled] == [r for _, r in inline]
+    assert pooled[3][1] is None
+    assert pooled[0][1].organic_results[0].title == "k0 result 1"
+
+def test_pending_pages_are_bounded() -> None:
+    pulled: List[int] = []
+    stage = ParseStage(workers=2, max_pending=3)
+    results = stage.map(_outcomes(10, pulled))
+
+    next(results)
+    assert len(pulled) == 3
+    next(results)
+    assert len(pulled) == 4
+    results.close()
+
+def test_workers_are_not_forked_from_the_threaded_parent() -> None:
+    executor = ParseStage(workers=1)._new_executor()
+    try:
+        assert executor._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        executor.shutdown()
+
+def test_unknown_backend_fails_before_starting_workers() -> None:
+    with pytest.raises(ValueError):
+        ParseStage("html5lib", workers=2)
+
+def test_run_scraper_with_parse_workers_matches_inline(tmp_path, write_run_files) -> None:
+    files = write_run_files([{"keyword": f"taco {i}", "pages": 2} for i in range(3)])
+
+    for name, workers in (("inline", 0), ("pooled", 2)):
+        run_scraper(
+            config_path=files["config_path"],
+            input_path=files["input_path"],
+            output_format="json",
+            output_dir=str(tmp_path / name),
+            concurrency=3,
+            parse_workers=workers,
+        )
+
+    inline = json.loads((tmp_path / "inline" / "bing_results.json").read_text(encoding="utf-8"))
+    pooled = json.loads((tmp_path / "pooled" / "bing_results.json").read_text(encoding="utf-8"))
+    assert len(pooled) == 6
+    assert pooled == inline
@@ -0,0 +1,44 @@
+from typing import Any, Dict
+
+import pytest
+
+from conftest import render_serp
+from extractors.bing_parser import PARSER_BACKENDS, BingSearchParser  # type: ignore
+from test_bing_scraper import EDGE_CASE_HTML, SAMPLE_HTML
+
+URL = "https://www.bing.com/search?q=test"
+
+FIXTURES = {
+    "sample": SAMPLE_HTML,
+    "edge_cases": EDGE_CASE_HTML,
+    "stub_serp": render_serp("pizza & pasta", 11),
+    "empty": "",
+    "text_rules": """
+      <li class="b_algo">
+        <h2><a href="https://t.example">Title <!-- hidden --> <b>bold</b>
+          <script>var x = 1;</script></a></h2>
+        <p>  spaced   <style>p {}</style> out&amp;about <template>no</template></p>
+      </li>
+      <div class="b_expando"><h3>Q?</h3><p>A.</p><p>Ignored.</p></div>
+    """,
+}
+
+def _parse(html: str, **options: Any) -> Dict[str, Any]:
+    return BingSearchParser(**options).parse(html, "test", 1, URL)
+
+@pytest.mark.parametrize("fixture", sorted(FIXTURES))
+@pytest.mark.parametrize("backend", [b for b in PARSER_BACKENDS if b != "html.parser"])
+def test_backend_matches_html_parser(fixture: str, backend: str) -> None:
+    html = FIXTURES[fixture]
+
+    assert _parse(html, backend=backend) == _parse(html, backend="html.parser")
+
+@pytest.mark.parametrize("fixture", sorted(FIXTURES))
+def test_lxml_single_pass_matches_per_section_selects(fixture: str) -> None:
+    html = FIXTURES[fixture]
+
+    assert _parse(html, backend="lxml") == _parse(html, backend="lxml", single_pass=False)
+
+def test_unknown_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        BingSearchParser(backend="html5lib")
@@ -0,0 +1,100 @@
+from typing import List
+
+import pytest
+
+from fetchers.rate_limit import AdaptiveRateLimiter  # type: ignore
+from fetchers.transport import HttpTransport  # type: ignore
+from main import run_scraper  # type: ignore
+from telemetry.metrics import RunMetrics  # type: ignore
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def test_token_bucket_paces_requests_and_allows_bursts() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(4, clock=clock, sleep=clock.sleep)
+    waits = [limiter.acquire() for _ in range(4)]
+    assert waits == [0.0, 0.25, 0.25, 0.25]
+
+    clock.now += 10
+    bursty = AdaptiveRateLimiter(4, burst=3, clock=clock, sleep=clock.sleep)
+    clock.now += 10
+    assert [bursty.acquire() for _ in range(4)] == [0.0, 0.0, 0.0, 0.25]
+
+def test_aimd_adjusts_rate_within_bounds() -> None:
+    clock = FakeClock()
+    rates: List[float] = []
+    limiter = AdaptiveRateLimiter(
+        8, min_rate=1, max_rate=10, cooldown=1.0, clock=clock, sleep=clock.sleep, on_rate_change=rates.append
+    )
+
+    limiter.on_response(429, 0.1)
+    assert limiter.rate == 4
+    # A burst of throttled responses within the cooldown is one signal.
+    limiter.on_response(503, 0.1)
+    assert limiter.rate == 4
+
+    limiter.on_response(200, 0.1)
+    assert limiter.rate == 4.125
+
+    for _ in range(5):
+        clock.now += 2
+        limiter.on_response(429, 0.1)
+    assert limiter.rate == 1
+    assert rates[:2] == [4, 4.125]
+
+def test_retry_after_pauses_every_request() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(10, clock=clock, sleep=clock.sleep)
+    limiter.on_response(429, 0.1, retry_after=5)
+    assert limiter.acquire() == 5
+    assert limiter.rate == 5
+
+def test_rising_latency_lowers_the_rate() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(10, cooldown=0, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        limiter.on_response(200, 0.05)
+    baseline = limiter.rate
+    for _ in range(10):
+        limiter.on_response(200, 1.0)
+    assert limiter.rate < baseline
+
+def test_limiter_backs_off_from_throttling_server(stub_server) -> None:
+    stub_server.max_rate = 20
+    metrics = RunMetrics()
+    limiter = AdaptiveRateLimiter(80, max_rate=200, cooldown=0.1)
+
+    with HttpTransport("test-agent", backoff_base=0.01, metrics=metrics, rate_limiter=limiter) as transport:
+        for i in range(20):
+            html = transport.fetch_text(f"{stub_server.base_url}?q=k{i}", timeout=5, max_retries=10)
+            assert "b_algo" in html
+
+    assert stub_server.throttled > 0
+    assert limiter.rate < 40
+    assert metrics.gauge_value("request_rate") == limiter.rate
+    assert "bing_scraper_request_rate " in metrics.to_prometheus()
+
+def test_run_scraper_reports_request_rate(tmp_path, stub_server, write_run_files) -> None:
+    files = write_run_files([{"keyword": "ramen", "pages": 2}], rate_limit=5)
+
+    summary = run_scraper(
+        config_path=files["config_path"],
+        input_path=files["input_path"],
+        output_format="json",
+        output_dir=str(tmp_path / "out"),
+    )
+
+    assert summary["records"] == 2
+    assert summary["request_rate"] > 5
+    gauge = summary["metrics"]["gauges"]["request_rate"][0]["value"]
+    assert gauge == pytest.approx(summary["request_rate"], abs=1e-3)
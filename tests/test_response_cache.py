@@ -0,0 +1,98 @@
+import json
+import random
+import zlib
+from typing import List
+
+import pytest
+
+from fetchers.cache import ResponseCache, normalize_url  # type: ignore
+from main import run_scraper  # type: ignore
+
+UA = "test-agent"
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_normalize_url_ignores_param_order_case_and_fragment() -> None:
+    assert normalize_url("HTTPS://www.Bing.com:443/search?q=a&first=11#top") == normalize_url(
+        "https://www.bing.com/search?first=11&q=a"
+    )
+    assert normalize_url("https://www.bing.com/search?q=a") != normalize_url("https://www.bing.com/search?q=b")
+
+def test_hit_miss_ttl_and_user_agent(tmp_path) -> None:
+    clock = FakeClock()
+    cache = ResponseCache(str(tmp_path), ttl=60, clock=clock)
+
+    assert cache.get("https://x.example/?q=1", UA) is None
+    cache.put("https://x.example/?q=1", UA, "<html>café</html>")
+    assert cache.get("https://x.example/?q=1", UA) == "<html>café</html>"
+    assert cache.get("https://x.example/?q=1", "other-agent") is None
+
+    clock.now += 61
+    assert cache.get("https://x.example/?q=1", UA) is None
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.close()
+
+def test_least_recently_used_entries_are_evicted(tmp_path) -> None:
+    clock = FakeClock()
+    pages = {name: random.Random(name).randbytes(1024).hex() for name in "abc"}
+    entry_size = max(len(zlib.compress(page.encode("utf-8"))) for page in pages.values())
+    cache = ResponseCache(str(tmp_path), max_bytes=2 * entry_size, clock=clock)
+
+    for name in ("a", "b"):
+        clock.now += 1
+        cache.put(f"https://x.example/{name}", UA, pages[name])
+    clock.now += 1
+    assert cache.get("https://x.example/a", UA) == pages["a"]
+    clock.now += 1
+    cache.put("https://x.example/c", UA, pages["c"])
+
+    assert cache.get("https://x.example/a", UA) == pages["a"]
+    assert cache.get("https://x.example/b", UA) is None
+    assert cache.get("https://x.example/c", UA) == pages["c"]
+    cache.close()
+
+def test_read_only_serves_hits_without_storing(tmp_path) -> None:
+    with ResponseCache(str(tmp_path)) as seed:
+        seed.put("https://x.example/old", UA, "old")
+
+    with ResponseCache(str(tmp_path), mode="read-only") as cache:
+        assert cache.get("https://x.example/old", UA) == "old"
+        cache.put("https://x.example/new", UA, "new")
+        assert cache.get("https://x.example/new", UA) is None
+
+def test_refresh_ignores_hits_and_overwrites(tmp_path) -> None:
+    with ResponseCache(str(tmp_path)) as seed:
+        seed.put("https://x.example/", UA, "old")
+
+    with ResponseCache(str(tmp_path), mode="refresh") as cache:
+        assert cache.get("https://x.example/", UA) is None
+        cache.put("https://x.example/", UA, "new")
+
+    with ResponseCache(str(tmp_path)) as check:
+        assert check.get("https://x.example/", UA) == "new"
+
+def test_unknown_mode_is_rejected(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        ResponseCache(str(tmp_path), mode="write-only")
+
+def test_rerun_is_served_from_cache(tmp_path, stub_server, write_run_files) -> None:
+    files = write_run_files([{"keyword": "bagels", "pages": 2}])
+    outputs: List[list] = []
+
+    for run in ("first", "second"):
+        run_scraper(
+            config_path=files["config_path"],
+            input_path=files["input_path"],
+            output_format="json",
+            output_dir=str(tmp_path / run),
+            cache_dir=str(tmp_path / "cache"),
+        )
+        outputs.append(json.loads((tmp_path / run / "bing_results.json").read_text(encoding="utf-8")))
+
+    assert len(stub_server.requests) == 2
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,82 @@
+import csv
+import json
+from typing import Any, Dict
+
+import pytest
+from openpyxl import load_workbook
+
+from extractors.bing_parser import PARSER_BACKENDS, BingSearchParser  # type: ignore
+from extractors.memo import ParseMemo  # type: ignore
+from extractors.parse_pool import ParseStage  # type: ignore
+from extractors.records import SECTION_KEYS, parse_sections  # type: ignore
+from fetchers.pool import FetchOutcome, PageTask  # type: ignore
+from main import run_scraper  # type: ignore
+from test_bing_scraper import SAMPLE_HTML
+
+URL = "https://www.bing.com/search?q=test"
+
+def _parse(html: str, **options: Any) -> Dict[str, Any]:
+    return BingSearchParser(**options).parse(html, "test", 1, URL)
+
+@pytest.mark.parametrize("sections", [("organic",), ("news",), ("related", "paa", "wiki")])
+@pytest.mark.parametrize("options", [{"backend": b} for b in PARSER_BACKENDS] + [{"single_pass": False}])
+def test_selected_sections_match_a_full_parse(sections, options) -> None:
+    full = _parse(SAMPLE_HTML, **options)
+    parser = BingSearchParser(sections=",".join(reversed(sections)), **options)
+
+    record = parser.parse(SAMPLE_HTML, "test", 1, URL)
+
+    kept = {"url", "keyword", "pageNumber"} | {SECTION_KEYS[name] for name in sections}
+    assert record == {key: value for key, value in full.items() if key in kept}
+    assert set(parser.last_timings) == {"tree", *sections}
+
+def test_section_names_are_validated_and_ordered() -> None:
+    assert parse_sections("news, organic") == ("organic", "news")
+    assert parse_sections(list(SECTION_KEYS)) is None
+    assert parse_sections("") is None
+    with pytest.raises(ValueError):
+        parse_sections("organic,ads")
+    with pytest.raises(ValueError):
+        BingSearchParser(sections=["organic", "maps"])
+
+def test_memo_entries_are_kept_apart_per_selection() -> None:
+    memo = ParseMemo("test")
+    organic_only = BingSearchParser(memo=memo, sections="organic")
+    full = BingSearchParser(memo=memo)
+
+    assert list(organic_only.parse(SAMPLE_HTML, "test", 1, URL)) == ["url", "keyword", "pageNumber", "organicResults"]
+    assert full.parse(SAMPLE_HTML, "test", 1, URL)["relatedQueries"]
+    assert memo.hits == 0 and memo.misses == 2
+
+    assert list(organic_only.parse(SAMPLE_HTML, "test", 1, URL)) == ["url", "keyword", "pageNumber", "organicResults"]
+    assert set(organic_only.last_timings) == {"memo"}
+
+def test_worker_processes_honour_the_selection() -> None:
+    stage = ParseStage(workers=1, sections="news")
+    task = PageTask(job_index=0, keyword="test", page_number=1, url=URL)
+
+    ((_, record),) = list(stage.map([FetchOutcome(task=task, html=SAMPLE_HTML)]))
+    stage.close()
+
+    assert record.parsed_sections == ("news",)
+    assert set(record.as_dict()) == {"url", "keyword", "pageNumber", "news"}
+
+def test_exports_leave_out_unselected_sections(tmp_path, stub_server, write_run_files) -> None:
+    files = write_run_files([{"keyword": "pizza", "pages": 1}], sections=["organic"])
+
+    summary = run_scraper(config_path=files["config_path"], input_path=files["input_path"], output_format="all")
+
+    out = tmp_path / "out"
+    (record,) = json.loads((out / "bing_results.json").read_text(encoding="utf-8"))
+    assert set(record) == {"url", "keyword", "pageNumber", "organicResults"}
+    with open(out / "bing_results.csv", newline="", encoding="utf-8") as f:
+        assert {row["resultType"] for row in csv.DictReader(f)} == {"organic"}
+    sheet = load_workbook(out / "bing_results.xlsx")["Organic Results"]
+    counts = list(sheet.iter_rows(min_row=2, min_col=6, max_col=10, values_only=True))
+    assert len(counts) == 10 and set(counts) == {(None,) * 5}
+    assert summary["records"] == 1
+
+    files = write_run_files([{"keyword": "pizza", "pages": 1}], sections=["related"])
+    run_scraper(config_path=files["config_path"], input_path=files["input_path"], output_format="xlsx")
+    # No placeholder organic row for pages that never had organic results parsed.
+    assert list(load_workbook(out / "bing_results.xlsx", read_only=True)["Organic Results"].values)[1:] == []
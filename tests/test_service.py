@@ -0,0 +1,76 @@
+import http.client
+import json
+from contextlib import ExitStack
+
+import pytest
+
+from main import open_service  # type: ignore
+from service.api import ScrapeServer  # type: ignore
+
+def _post(conn: http.client.HTTPConnection, payload) -> tuple:
+    conn.request("POST", "/search", body=json.dumps(payload), headers={"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    body = resp.read().decode("utf-8")
+    return resp.status, body
+
+@pytest.mark.parametrize("parse_workers", [0, 1])
+def test_lookups_stream_records_over_warm_connections(stub_server, write_run_files, parse_workers) -> None:
+    files = write_run_files([])
+
+    with ExitStack() as stack:
+        server = open_service(stack, files["config_path"], 0, parse_workers=parse_workers)
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+
+        status, body = _post(conn, {"keyword": "pizza", "pages": 2})
+        assert status == 200
+        records = [json.loads(line) for line in body.splitlines()]
+        assert [(r["keyword"], r["pageNumber"]) for r in records] == [("pizza", 1), ("pizza", 2)]
+        assert records[0]["organicResults"][0]["title"] == "pizza result 1"
+
+        # Same client socket, and the scraper reuses its upstream connection.
+        status, body = _post(conn, [{"keyword": "ramen"}, {"keyword": "tea"}])
+        assert status == 200
+        assert [json.loads(line)["keyword"] for line in body.splitlines()] == ["ramen", "tea"]
+        assert len(stub_server.client_ports) == 1
+
+        status, body = _post(conn, {"queries": [{"pages": 2}]})
+        assert status == 400 and "No valid jobs" in json.loads(body)["error"]
+
+        conn.request("GET", "/healthz")
+        assert json.loads(conn.getresponse().read())["status"] == "ok"
+        conn.request("GET", "/metrics")
+        assert "lookups_total 2" in conn.getresponse().read().decode("utf-8")
+        conn.close()
+
+def test_failed_pages_are_reported_inline(stub_server, write_run_files) -> None:
+    files = write_run_files([], max_retries=1, backoff_base=0.01)
+    stub_server.scripted = [(500, {})]
+
+    with ExitStack() as stack:
+        server = open_service(stack, files["config_path"], 0)
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+        status, body = _post(conn, [{"keyword": "pizza"}, {"keyword": "tea"}])
+
+    records = [json.loads(line) for line in body.splitlines()]
+    assert status == 200
+    assert records[0]["keyword"] == "pizza" and "error" in records[0]
+    assert records[1]["keyword"] == "tea" and "error" not in records[1]
+
+def test_lookup_failures_end_the_stream_with_an_error_line() -> None:
+    def lookup(payload):
+        yield {"keyword": payload["keyword"], "pageNumber": 1}
+        if payload["keyword"] == "pizza":
+            raise RuntimeError("parser exploded")
+
+    with ScrapeServer(lookup, metrics=None, port=0) as server:
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+        status, body = _post(conn, {"keyword": "pizza"})
+        assert status == 200
+        assert [json.loads(line) for line in body.splitlines()] == [
+            {"keyword": "pizza", "pageNumber": 1},
+            {"error": "parser exploded"},
+        ]
+
+        # The response was terminated properly, so the connection stays usable.
+        assert _post(conn, {"keyword": "tea"}) == (200, '{"keyword": "tea", "pageNumber": 1}\n')
+        conn.close()
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from inputs.jobs import parse_shard, select_shard, shard_of  # type: ignore
+from main import main, merge_shard_outputs, run_scraper  # type: ignore
+from outputs.merge import iter_json_array  # type: ignore
+
+JOBS = [
+    {"keyword": "pizza", "pages": 2},
+    {"keyword": "ramen", "pages": 1},
+    {"keyword": "Tacos", "pages": 3},
+    {"keyword": "PIZZA", "pages": 1},
+    {"keyword": "dim sum", "pages": 2},
+    {"keyword": "pho", "pages": 1},
+    {"keyword": "bagels", "pages": 2},
+]
+
+def test_shards_are_stable_disjoint_and_cover_every_job() -> None:
+    keywords = [f"keyword {i}" for i in range(200)]
+    slices = [
+        [job["keyword"] for job in select_shard(({"keyword": k} for k in keywords), index, 4)]
+        for index in range(4)
+    ]
+
+    assert sorted(sum(slices, [])) == sorted(keywords)
+    assert all(40 < len(part) < 60 for part in slices)
+    # Spelling variants that dedupe as one job land on the same shard.
+    assert shard_of("NYC  Pizza", 7) == shard_of("nyc pizza", 7)
+    assert parse_shard("2/3") == (2, 3)
+    for bad in ("3/3", "-1/2", "1", "a/b", "0/0"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+
+@pytest.mark.parametrize("output_format", ["json", "jsonl", "csv"])
+def test_merged_shards_match_a_single_process_run(tmp_path, stub_server, write_run_files, output_format) -> None:
+    files = write_run_files(JOBS, concurrency=3)
+    single_dir = tmp_path / "single"
+    run_scraper(
+        config_path=files["config_path"],
+        input_path=files["input_path"],
+        output_format=output_format,
+        output_dir=str(single_dir),
+    )
+
+    shard_dir = tmp_path / "shards"
+    jobs_per_shard = []
+    for index in range(3):
+        summary = run_scraper(
+            config_path=files["config_path"],
+            input_path=files["input_path"],
+            output_format=output_format,
+            output_dir=str(shard_dir),
+            shard=f"{index}/3",
+        )
+        jobs_per_shard.append(summary["jobs"])
+    assert sum(jobs_per_shard) == len(JOBS)
+
+    summary = merge_shard_outputs(
+        config_path=files["config_path"],
+        input_path=files["input_path"],
+        output_format=output_format,
+        shard_count=3,
+        output_dir=str(shard_dir),
+    )
+
+    assert summary["pages"] == 12
+    merged = (shard_dir / f"bing_results.{output_format}").read_bytes()
+    assert merged == (single_dir / f"bing_results.{output_format}").read_bytes()
+
+def test_merge_from_cli_with_dedupe_and_an_empty_shard(tmp_path, stub_server, write_run_files) -> None:
+    files = write_run_files([{"keyword": "Gelato", "pages": 1}, {"keyword": "gelato ", "pages": 2}])
+    out = str(tmp_path / "out")
+    empty_shard = 1 - shard_of("gelato", 2)
+
+    for index in range(2):
+        summary = run_scraper(
+            config_path=files["config_path"],
+            input_path=files["input_path"],
+            output_format="json",
+            dedupe=True,
+            shard=f"{index}/2",
+        )
+        assert summary["jobs"] == (0 if index == empty_shard else 1)
+
+    main(["-c", files["config_path"], "-i", files["input_path"], "-o", out, "--dedupe-jobs", "--merge-shards", "2"])
+
+    records = list(iter_json_array(str(tmp_path / "out" / "bing_results.json")))
+    assert [(r["keyword"], r["pageNumber"]) for r in records] == [("Gelato", 1), ("Gelato", 2)]
+
+    with pytest.raises(FileNotFoundError):
+        merge_shard_outputs(files["config_path"], files["input_path"], "json", shard_count=3, output_dir=out)
+    with pytest.raises(ValueError):
+        merge_shard_outputs(files["config_path"], files["input_path"], "xlsx", shard_count=2, output_dir=out)
+
+def test_json_arrays_are_read_across_chunk_boundaries(tmp_path, monkeypatch) -> None:
+    import outputs.merge as merge  # type: ignore
+
+    monkeypatch.setattr(merge, "_CHUNK_SIZE", 7)
+    values = [{"keyword": "a, b] [c", "pageNumber": 1}, [1, 2], "x" * 30, None]
+    path = tmp_path / "values.json"
+    path.write_text(json.dumps(values, indent=2), encoding="utf-8")
+
+    assert list(iter_json_array(str(path))) == values
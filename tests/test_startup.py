@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+from typing import Dict
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Cumulative microseconds `import main` may take. It is ~40ms here against
+# ~280ms when every exporter and parser was imported up front.
+IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = ("requests", "bs4", "soupsieve", "lxml", "openpyxl", "pyarrow", "http.server")
+
+def _import_times(statement: str) -> Dict[str, int]:
+    """Runs ``statement`` under -X importtime; returns module -> cumulative microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+def test_cli_import_skips_heavy_modules_and_stays_within_budget() -> None:
+    times = _import_times("import main")
+
+    assert not [name for name in times if name.split(".")[0] in HEAVY_MODULES or name in HEAVY_MODULES]
+    assert times["main"] < IMPORT_BUDGET_US
+
+def test_exporters_load_only_for_selected_formats() -> None:
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from outputs.registry import load_writer; load_writer('json'); print(*sys.modules)",
+        ],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert "outputs.export_json" in loaded
+    assert "outputs.export_xlsx" not in loaded and "openpyxl" not in loaded
+
+    help_run = subprocess.run(
+        [sys.executable, "main.py", "--help"], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    assert "parquet" in help_run.stdout
@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The benchmark package lives at the project root, next to src/.
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.corpus import generate_serp  # noqa: E402
+from extractors.bing_parser import PARSER_BACKENDS, BingSearchParser  # type: ignore  # noqa: E402
+from main import run_scraper  # type: ignore  # noqa: E402
+
+URL = "https://www.bing.com/search?q=pizza"
+
+@pytest.mark.parametrize("sections", [None, "organic", "wiki"])
+def test_landmarks_end_the_stream_without_changing_records(sections) -> None:
+    page = generate_serp(7, "pizza", target_kb=120)
+    document = BingSearchParser(sections=sections).stream_document()
+
+    fed = 0
+    while fed < len(page) and not document.feed(page[fed : fed + 4096]):
+        fed += 4096
+    root = document.close()
+
+    assert document.done and len(document.html) < len(page)
+    for backend in PARSER_BACKENDS:
+        parser = BingSearchParser(backend=backend, sections=sections)
+        streamed = parser.parse_result(document.html, "pizza", 1, URL, document=root).as_dict()
+        assert streamed == parser.parse(page, "pizza", 1, URL)
+
+def test_pages_without_landmarks_are_read_to_the_end() -> None:
+    page = "<html><body><div class='b_algo'>no results list</div></body></html>"
+    document = BingSearchParser(sections="organic").stream_document()
+
+    assert not document.feed(page)
+    document.close()
+    assert document.html == page and not document.done
+
+def test_streamed_runs_skip_the_page_tail(tmp_path, stub_server, write_run_files) -> None:
+    stub_server.trailer = "<script>" + "x" * 50000 + "</script>"
+    jobs = [{"keyword": "pizza", "pages": 2}]
+
+    def run(**config) -> tuple:
+        files = write_run_files(jobs, sections=["organic"], stream_chunk_size=1024, **config)
+        summary = run_scraper(config_path=files["config_path"], input_path=files["input_path"], output_format="jsonl")
+        with open(tmp_path / "out" / "bing_results.jsonl", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        return records, summary["metrics"]["counters"]
+
+    full_records, full_counters = run()
+    # lxml-native parses the tree built while streaming.
+    records, counters = run(stream_fetch=True, cache_dir=str(tmp_path / "cache"), parser_backend="lxml-native")
+
+    assert records == full_records
+    assert records[1]["organicResults"][0]["title"] == "pizza result 11"
+    assert counters["fetch_aborted_total"][0]["value"] == 2
+    assert counters["fetch_bytes_total"][0]["value"] < full_counters["fetch_bytes_total"][0]["value"] / 4
+
+    # Pages cut short are never cached, so a second run fetches them again.
+    requests_before = len(stub_server.requests)
+    run(stream_fetch=True, cache_dir=str(tmp_path / "cache"))
+    assert len(stub_server.requests) == requests_before + 2
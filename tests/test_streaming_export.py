@@ -0,0 +1,94 @@
+import csv
+import json
+from typing import Any, Dict, List
+
+from openpyxl import load_workbook
+
+from main import run_scraper  # type: ignore
+from outputs.export_csv import CsvWriter, export_to_csv  # type: ignore
+from outputs.export_json import JsonArrayWriter  # type: ignore
+from outputs.export_jsonl import JsonLinesWriter  # type: ignore
+from outputs.export_xlsx import XlsxWriter, export_to_xlsx  # type: ignore
+
+RECORDS: List[Dict[str, Any]] = [
+    {"keyword": "café", "pageNumber": 1, "organicResults": [{"title": "A", "url": "u", "description": ""}]},
+    {"keyword": "tea", "pageNumber": 2, "organicResults": [], "wikiResults": None},
+]
+
+def test_json_array_writer_matches_json_dump(tmp_path) -> None:
+    for records in (RECORDS, RECORDS[:1], []):
+        path = tmp_path / "out.json"
+        with JsonArrayWriter(str(path)) as writer:
+            for record in records:
+                writer.write(record)
+
+        assert path.read_text(encoding="utf-8") == json.dumps(records, indent=2, ensure_ascii=False)
+
+def test_jsonl_records_are_on_disk_before_close(tmp_path) -> None:
+    path = tmp_path / "out.jsonl"
+    writer = JsonLinesWriter(str(path))
+    for record in RECORDS:
+        writer.write(record)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+    writer.close()
+
+def test_csv_writer_matches_batch_export(tmp_path) -> None:
+    streamed = tmp_path / "streamed.csv"
+    with CsvWriter(str(streamed)) as writer:
+        for record in RECORDS:
+            writer.write(record)
+    export_to_csv(RECORDS, str(tmp_path / "batch.csv"))
+
+    assert streamed.read_text(encoding="utf-8") == (tmp_path / "batch.csv").read_text(encoding="utf-8")
+    with streamed.open(encoding="utf-8", newline="") as f:
+        assert [row["title"] for row in csv.DictReader(f)] == ["A"]
+
+def test_run_scraper_jsonl_matches_json(tmp_path, write_run_files) -> None:
+    files = write_run_files([{"keyword": "ramen", "pages": 2}, {"keyword": "pho", "pages": 1}])
+
+    for output_format in ("json", "jsonl"):
+        summary = run_scraper(
+            config_path=files["config_path"],
+            input_path=files["input_path"],
+            output_format=output_format,
+            output_dir=str(tmp_path / output_format),
+        )
+        assert summary["records"] == 3
+
+    as_json = json.loads((tmp_path / "json" / "bing_results.json").read_text(encoding="utf-8"))
+    lines = (tmp_path / "jsonl" / "bing_results.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == as_json
+
+def test_xlsx_writer_streams_organic_and_section_sheets(tmp_path) -> None:
+    record = {
+        "keyword": "pizza",
+        "pageNumber": 1,
+        "organicResults": [{"title": "A", "url": "https://a.example", "description": "d"}],
+        "relatedQueries": [],
+        "peopleAlsoAsk": [{"question": "Q?", "answer": "A."}],
+        "images": [],
+        "videos": [{"url": "https://v.example", "title": "V", "views": "1K", "channel": "C", "provider": "P"}],
+        "news": [{"headline": "H", "url": "https://n.example", "source": "S"}],
+    }
+    empty = {"keyword": "empty", "pageNumber": 2, **{key: [] for key in record if key not in ("keyword", "pageNumber")}}
+    path = tmp_path / "out.xlsx"
+    with XlsxWriter(str(path), section_sheets=True) as writer:
+        writer.write(record)
+        writer.write(empty)
+
+    wb = load_workbook(path, read_only=True)
+    assert wb.sheetnames == ["Organic Results", "News", "Videos", "People Also Ask"]
+    organic = list(wb["Organic Results"].values)
+    assert organic[1] == ("pizza", 1, "A", "https://a.example", "d", 0, 1, 0, 1, 1)
+    assert organic[2][:3] == ("empty", 2, None)
+    assert list(wb["News"].values)[1] == ("pizza", 1, "H", "https://n.example", "S")
+    assert list(wb["Videos"].values)[1] == ("pizza", 1, "V", "https://v.example", "1K", "C", "P")
+    assert list(wb["People Also Ask"].values)[1:] == [("pizza", 1, "Q?", "A.")]
+
+def test_xlsx_writer_defaults_to_organic_sheet_only(tmp_path) -> None:
+    path = tmp_path / "out.xlsx"
+    export_to_xlsx(RECORDS, str(path))
+
+    assert load_workbook(path, read_only=True).sheetnames == ["Organic Results"]
@@ -0,0 +1,63 @@
+from typing import List
+
+import pytest
+import requests
+
+from fetchers.transport import HttpTransport, parse_retry_after  # type: ignore
+
+def test_session_reuses_connections(stub_server) -> None:
+    with HttpTransport("test-agent", pool_size=2) as transport:
+        for i in range(5):
+            html = transport.fetch_text(f"{stub_server.base_url}?q=k{i}", timeout=5, max_retries=1)
+            assert "b_algo" in html
+
+    assert len(stub_server.requests) == 5
+    assert len(stub_server.client_ports) == 1
+    assert "gzip" in stub_server.request_headers[0]["Accept-Encoding"]
+    assert stub_server.request_headers[0]["User-Agent"] == "test-agent"
+
+def test_retry_after_is_honoured_on_429(stub_server) -> None:
+    sleeps: List[float] = []
+    stub_server.scripted = [(429, {"Retry-After": "7"}), (503, {})]
+
+    with HttpTransport("test-agent", backoff_base=0.01, backoff_max=30, sleep=sleeps.append) as transport:
+        html = transport.fetch_text(f"{stub_server.base_url}?q=pizza", timeout=5, max_retries=3)
+
+    assert "pizza" in html
+    assert len(stub_server.requests) == 3
+    assert sleeps[0] == 7
+    assert 0 <= sleeps[1] <= 0.02
+
+def test_retry_after_beyond_the_cap_is_not_retried(stub_server) -> None:
+    sleeps: List[float] = []
+    stub_server.scripted = [(429, {"Retry-After": "120"}), (429, {"Retry-After": "3600"})]
+
+    with HttpTransport("test-agent", retry_after_max=600, sleep=sleeps.append) as transport:
+        with pytest.raises(requests.HTTPError):
+            transport.fetch_text(f"{stub_server.base_url}?q=pizza", timeout=5, max_retries=3)
+
+    assert sleeps == [120]
+    assert len(stub_server.requests) == 2
+
+def test_non_retryable_status_fails_fast(stub_server) -> None:
+    sleeps: List[float] = []
+    stub_server.scripted = [(404, {})]
+
+    with HttpTransport("test-agent", sleep=sleeps.append) as transport:
+        with pytest.raises(requests.HTTPError):
+            transport.fetch_text(f"{stub_server.base_url}?q=x", timeout=5, max_retries=3)
+
+    assert len(stub_server.requests) == 1
+    assert sleeps == []
+
+def test_backoff_is_bounded_and_parse_retry_after_handles_dates() -> None:
+    transport = HttpTransport("test-agent", backoff_base=1, backoff_max=4)
+    for attempt in range(1, 8):
+        assert 0 <= transport.backoff_delay(attempt) <= 4
+    # The server's Retry-After wins over the backoff ceiling.
+    assert transport.backoff_delay(1, retry_after=120) == 120
+    transport.close()
+
+    assert parse_retry_after("12") == 12
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
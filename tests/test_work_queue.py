@@ -0,0 +1,134 @@
+import json
+import threading
+
+import inputs.work_queue as work_queue_module  # type: ignore
+from inputs.work_queue import WorkQueue, WorkUnit  # type: ignore
+from main import run_scraper  # type: ignore
+
+JOBS = [{"keyword": "pizza", "pages": 2}, {"keyword": "ramen", "pages": 1}, {"keyword": "tacos", "pages": 3}]
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_units_are_loaded_once_and_leases_expire(tmp_path) -> None:
+    clock = FakeClock()
+    path = str(tmp_path / "queue.sqlite3")
+    with WorkQueue(path, "a", lease_seconds=10, clock=clock) as a, WorkQueue(path, "b", lease_seconds=10, clock=clock) as b:
+        assert a.load(JOBS) == 6
+        assert b.load(JOBS) == 0
+        assert a.job_count() == 3
+
+        assert a.claim(2) == [WorkUnit(0, "pizza", 1), WorkUnit(0, "pizza", 2)]
+        clock.now += 5
+        assert b.claim(10) == [WorkUnit(1, "ramen", 1), WorkUnit(2, "tacos", 1), WorkUnit(2, "tacos", 2), WorkUnit(2, "tacos", 3)]
+        assert b.claim(10) == [] and b.next_expiry() == 5
+
+        # Worker a dies holding its units; b picks them up once the lease ends.
+        clock.now += 5
+        assert b.claim(10) == [WorkUnit(0, "pizza", 1), WorkUnit(0, "pizza", 2)]
+        assert b.reclaimed == 2 and a.held() == 0 and b.held() == 6
+        for job_index, page in [(0, 1), (0, 2), (1, 1), (2, 1), (2, 2)]:
+            b.complete(job_index, page)
+        assert b.counts() == {"done": 5, "leased": 1}
+        assert b.has_open_units()
+
+def test_failed_units_are_retried_until_max_attempts(tmp_path) -> None:
+    with WorkQueue(str(tmp_path / "queue.sqlite3"), "a", max_attempts=2) as queue:
+        queue.load([{"keyword": "pizza", "pages": 1}])
+        queue.fail(*queue.claim(1)[0][::2])
+        assert queue.counts() == {"pending": 1}
+        (unit,) = queue.claim(1)
+        queue.fail(unit.job_index, unit.page_number)
+        assert queue.counts() == {"failed": 1}
+        assert queue.claim(1) == [] and not queue.has_open_units()
+
+def test_late_completion_does_not_override_the_new_lease_holder(tmp_path) -> None:
+    clock = FakeClock()
+    path = str(tmp_path / "queue.sqlite3")
+    with WorkQueue(path, "a", lease_seconds=10, clock=clock) as a, WorkQueue(path, "b", lease_seconds=10, clock=clock) as b:
+        a.load([{"keyword": "pizza", "pages": 1}])
+        (unit,) = a.claim(1)
+        clock.now += 11
+        assert b.claim(1) == [unit]
+
+        assert not a.complete(unit.job_index, unit.page_number)
+        assert b.held() == 1 and b.counts() == {"leased": 1}
+        assert b.complete(unit.job_index, unit.page_number)
+        assert b.counts() == {"done": 1}
+
+def test_loading_commits_in_batches_that_claimers_can_use(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(work_queue_module, "LOAD_BATCH", 2)
+    path = str(tmp_path / "queue.sqlite3")
+    claimed_during_load = []
+
+    with WorkQueue(path, "a") as a, WorkQueue(path, "b") as b:
+
+        def jobs():
+            for i in range(4):
+                yield {"keyword": f"k{i}", "pages": 1}
+                if i == 2:
+                    # a is still loading, but the first batch is already claimable.
+                    claimed_during_load.extend(b.claim(10))
+
+        assert a.load(jobs()) == 4
+        assert claimed_during_load == [WorkUnit(0, "k0", 1), WorkUnit(1, "k1", 1)]
+        # A worker that loads at the same time only adds what is missing.
+        assert b.load({"keyword": f"k{i}", "pages": 2} for i in range(4)) == 0
+        assert a.counts() == {"leased": 2, "pending": 2}
+
+def _worker_pages(out_dir) -> list:
+    pages = []
+    for path in sorted(out_dir.glob("bing_results.worker-*.json")):
+        if path.name.endswith(".metrics.json"):
+            continue
+        pages += [(r["keyword"], r["pageNumber"]) for r in json.loads(path.read_text(encoding="utf-8"))]
+    return pages
+
+def test_workers_share_the_queue_and_reclaim_a_dead_workers_units(tmp_path, stub_server, write_run_files) -> None:
+    stub_server.delay = 0.05
+    files = write_run_files(JOBS, queue_lease=0.5, queue_poll=0.1)
+    queue_path = str(tmp_path / "work.sqlite3")
+
+    # A worker that claimed the first pages and then died.
+    with WorkQueue(queue_path, "ghost", lease_seconds=0.5) as ghost:
+        ghost.load(JOBS)
+        ghost.claim(2)
+
+    summaries = {}
+
+    def worker(worker_id: str) -> None:
+        summaries[worker_id] = run_scraper(
+            config_path=files["config_path"],
+            input_path=files["input_path"],
+            output_format="json",
+            queue_path=queue_path,
+            worker_id=worker_id,
+        )
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    assert sorted(_worker_pages(tmp_path / "out")) == sorted(
+        (job["keyword"], page) for job in JOBS for page in range(1, job["pages"] + 1)
+    )
+    assert sum(summary["records"] for summary in summaries.values()) == 6
+    assert summaries["w0"]["queue"] == {"done": 6}
+    reclaimed = [s["metrics"]["counters"]["queue_units_reclaimed_total"][0]["value"] for s in summaries.values()]
+    assert sum(reclaimed) == 2
+
+    # A late worker finds nothing left to do.
+    late = run_scraper(
+        config_path=files["config_path"],
+        input_path=files["input_path"],
+        output_format="json",
+        queue_path=queue_path,
+        worker_id="late",
+    )
+    assert late["records"] == 0 and late["jobs"] == 3